@@ -0,0 +1 @@
+"""Performance benchmarks for the capture and processing pipeline."""
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Per-frame memory allocation checks for the capture loop."""
+import shutil
+import tempfile
+import tracemalloc
+from ..capture.motion import MotionDetector
+from ..capture.sources import SyntheticSource, VideoFileSource
+from ..config.settings import VIDEO_SETTINGS
+
+def measure_frame_allocations(video_path=None, num_frames=200, warmup=20, record=True):
+    """Measure memory allocated per frame by the monitoring loop.
+    
+    Frames are read into pooled buffers, scored and (optionally) written to
+    a clip, exactly as in MotionDetector.start_monitoring. For each frame
+    after the warm-up, tracemalloc's peak shows the largest transient
+    allocation made while processing it. Resetting the peak per frame
+    needs Python 3.9 or later.
+    
+    Args:
+        video_path (str): Video to use as the camera (None for a synthetic scene)
+        num_frames (int): Number of frames to process
+        warmup (int): Frames to skip while buffers are being set up
+        record (bool): Keep a clip recording during the whole run
+        
+    Returns:
+        dict: Mean and max bytes allocated per frame and net growth
+    """
+    if not hasattr(tracemalloc, "reset_peak"):
+        raise RuntimeError("Measuring per-frame allocations requires Python 3.9 or later")
+        
+    work_dir = tempfile.mkdtemp(prefix="prey_alloc_")
+    
+    try:
+        if video_path is None:
+            camera = SyntheticSource(num_frames=num_frames)
+        else:
+            camera = VideoFileSource(video_path)
+            
+        detector = MotionDetector(output_dir=work_dir, camera=camera)
+        if record:
+            # Trigger on the first scored frame and never stop
+            detector.frame_diff_threshold = -1
+            detector.max_record_seconds = float("inf")
+            
+        camera.open()
+        fps = VIDEO_SETTINGS["fps"]
+        peaks = []
+        
+        tracemalloc.start()
+        try:
+            for i in range(num_frames):
+                if i == warmup:
+                    start_size, _ = tracemalloc.get_traced_memory()
+                    
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                
+                try:
+                    frame = camera.read_pooled(detector.frame_pool)
+                except RuntimeError:
+                    break
+                try:
+                    detector.process_frame(frame, now=i / fps)
+                finally:
+                    frame.release()
+                    
+                if i >= warmup:
+                    _, peak = tracemalloc.get_traced_memory()
+                    peaks.append(peak - before)
+                    
+            end_size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            detector.finish_event()
+            camera.close()
+            
+        if not peaks:
+            raise ValueError("Not enough frames to measure after warm-up")
+            
+        return {
+            "frames": len(peaks),
+            "mean_bytes_per_frame": sum(peaks) / len(peaks),
+            "max_bytes_per_frame": max(peaks),
+            "net_growth_bytes": end_size - start_size,
+            "pool": detector.frame_pool.get_stats(),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
\ No newline at end of file
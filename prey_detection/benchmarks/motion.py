@@ -0,0 +1,168 @@
+"""Motion scoring benchmarks."""
+import time
+import cv2
+import numpy as np
+from ..capture.motion_backends import BACKENDS
+from ..capture.motion_engine import MotionEngine
+from ..capture.sources import SyntheticSource
+from ..config.settings import MOTION_SETTINGS
+
+def load_frames(video_path=None, num_frames=200, width=640, height=480):
+    """Load benchmark frames from a video, or generate a synthetic scene.
+    
+    Args:
+        video_path (str): Video to read frames from (None for synthetic frames)
+        num_frames (int): Maximum number of frames
+        width (int): Synthetic frame width
+        height (int): Synthetic frame height
+        
+    Returns:
+        list: Frames held in memory, so decoding is not part of the timing
+    """
+    if video_path is None:
+        source = SyntheticSource(width, height, num_frames=num_frames, pattern="sweep")
+        with source:
+            return [source.read() for _ in range(num_frames)]
+        
+    return list(iter_video_frames(video_path, num_frames))
+    
+def benchmark_scales(frames, levels=(0, 1, 2, 3), threshold=None):
+    """Measure motion scoring cost at several downscale levels.
+    
+    Args:
+        frames (list): Frames to score
+        levels (tuple): Downscale levels to compare
+        threshold (int): Motion threshold used to count triggers
+        
+    Returns:
+        list: One result dict per level
+    """
+    if threshold is None:
+        threshold = MOTION_SETTINGS["frame_diff_threshold"]
+        
+    results = []
+    for level in levels:
+        engine = MotionEngine(downscale_levels=level)
+        scores = []
+        
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for frame in frames:
+            score, _ = engine.score(frame)
+            scores.append(score)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        
+        results.append({
+            "downscale_levels": level,
+            "work_size": engine.work_size,
+            "cpu_ms_per_frame": 1000.0 * cpu / len(frames),
+            "wall_ms_per_frame": 1000.0 * wall / len(frames),
+            "mean_score": float(np.mean(scores)),
+            "triggers": sum(1 for s in scores if s > threshold),
+        })
+        
+    return results
+    
+def benchmark_backends(video_paths, backends=None, max_frames=None, threshold=None,
+                       downscale_levels=None):
+    """Replay stored clips through each motion backend.
+    
+    Every backend sees the same frames. Only scoring is timed; decoding is
+    excluded.
+    
+    Args:
+        video_paths (list): Clips to replay
+        backends (list): Backend names (default: all)
+        max_frames (int): Maximum frames per clip
+        threshold (int): Motion threshold used to count triggers
+        downscale_levels (int): Downscale level for every backend
+        
+    Returns:
+        list: One result dict per backend
+    """
+    if threshold is None:
+        threshold = MOTION_SETTINGS["frame_diff_threshold"]
+        
+    backends = list(backends or BACKENDS)
+    totals = {name: {"cpu": 0.0, "frames": 0, "over": 0, "triggers": 0} for name in backends}
+    
+    for video_path in video_paths:
+        engines = {name: MotionEngine(downscale_levels=downscale_levels, backend=name)
+                   for name in backends}
+        active = {name: False for name in backends}
+        
+        for frame in iter_video_frames(video_path, max_frames):
+            for name, engine in engines.items():
+                cpu_start = time.process_time()
+                score, _ = engine.score(frame)
+                
+                total = totals[name]
+                total["cpu"] += time.process_time() - cpu_start
+                total["frames"] += 1
+                
+                # A trigger is a rising edge over the threshold
+                over = score > threshold
+                total["over"] += over
+                total["triggers"] += over and not active[name]
+                active[name] = over
+                
+    return [
+        {
+            "backend": name,
+            "frames": t["frames"],
+            "cpu_ms_per_frame": 1000.0 * t["cpu"] / t["frames"] if t["frames"] else 0.0,
+            "frames_over_threshold": t["over"],
+            "triggers": t["triggers"],
+        }
+        for name, t in totals.items()
+    ]
+    
+def iter_video_frames(video_path, max_frames=None):
+    """Yield frames from a video file.
+    
+    Args:
+        video_path (str): Path to the video
+        max_frames (int): Stop after this many frames
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+        
+    try:
+        count = 0
+        while max_frames is None or count < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+            count += 1
+    finally:
+        cap.release()
+        
+def print_backend_results(results):
+    """Print backend comparison results as a table.
+    
+    Args:
+        results (list): Result dicts from benchmark_backends
+    """
+    print(f"{'backend':>16} {'frames':>7} {'cpu ms':>8} {'over thr':>9} {'triggers':>8}")
+    for r in results:
+        print(
+            f"{r['backend']:>16} {r['frames']:>7} {r['cpu_ms_per_frame']:>8.2f} "
+            f"{r['frames_over_threshold']:>9} {r['triggers']:>8}"
+        )
+        
+def print_results(results):
+    """Print benchmark results as a table.
+    
+    Args:
+        results (list): Result dicts from benchmark_scales
+    """
+    print(f"{'levels':>6} {'work size':>10} {'cpu ms':>8} {'wall ms':>8} {'mean score':>11} {'triggers':>8}")
+    for r in results:
+        size = "x".join(str(v) for v in r["work_size"])
+        print(
+            f"{r['downscale_levels']:>6} {size:>10} {r['cpu_ms_per_frame']:>8.2f} "
+            f"{r['wall_ms_per_frame']:>8.2f} {r['mean_score']:>11.0f} {r['triggers']:>8}"
+        )
\ No newline at end of file
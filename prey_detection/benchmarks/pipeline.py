@@ -0,0 +1,317 @@
+"""End-to-end benchmark of the capture → motion → record → extract path."""
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+from ..capture.buffers import FramePool
+from ..capture.motion import MotionDetector
+from ..capture.sources import SyntheticSource, VideoFileSource
+from ..config.settings import BENCHMARK_SETTINGS
+from ..processing.frames import FrameExtractor
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+    
+STAGES = ("camera", "calculate_motion", "write_frame", "frame")
+
+def run_pipeline_benchmark(video_path=None, num_frames=None, warmup=None, record=True,
+                           extract=True, async_encoding=False):
+    """Drive the capture, motion, recording and extraction stages.
+    
+    Every frame is read from the source, scored with
+    MotionDetector.calculate_motion and written with
+    VideoRecorder.write_frame, timing each stage. The recorded clip is then
+    run through FrameExtractor.extract_frames. The synthetic source is
+    seeded, so runs on the same machine see identical input.
+    
+    Args:
+        video_path (str): Video to replay (None for a synthetic scene)
+        num_frames (int): Frames to push through the pipeline
+        warmup (int): Frames left out of the latency stats
+        record (bool): Include the write_frame stage
+        extract (bool): Include frame extraction from the recorded clip
+        async_encoding (bool): Encode on a separate thread
+        
+    Returns:
+        dict: Throughput, per-stage latency percentiles and peak RSS
+    """
+    num_frames = num_frames or BENCHMARK_SETTINGS["frames"]
+    warmup = BENCHMARK_SETTINGS["warmup_frames"] if warmup is None else warmup
+    work_dir = tempfile.mkdtemp(prefix="prey_bench_")
+    
+    try:
+        if video_path is None:
+            source = SyntheticSource(
+                num_frames=num_frames,
+                motion_periods=[(0, num_frames // 3), (2 * num_frames // 3, num_frames)],
+                noise=4
+            )
+        else:
+            source = VideoFileSource(video_path, loop=True)
+            
+        detector = MotionDetector(output_dir=work_dir, camera=source)
+        recorder = detector.recorder
+        recorder.async_encoding = async_encoding
+        if async_encoding:
+            # Queued frames stay borrowed until encoded, as in start_monitoring
+            detector.frame_pool = FramePool(4 + recorder.encoder_queue_size)
+            
+        timings = {stage: [] for stage in STAGES}
+        
+        with source:
+            if record:
+                recorder.start(os.path.join(work_dir, "benchmark.mp4"))
+                
+            started = time.perf_counter()
+            for i in range(num_frames):
+                t0 = time.perf_counter()
+                # Pooled like the monitoring loop; the encoder retains
+                # frames it has not written yet
+                frame = source.read_pooled(detector.frame_pool)
+                t1 = time.perf_counter()
+                try:
+                    detector.calculate_motion(frame.array)
+                    t2 = time.perf_counter()
+                    if record:
+                        recorder.write_frame(frame)
+                    t3 = time.perf_counter()
+                finally:
+                    frame.release()
+                
+                if i >= warmup:
+                    timings["camera"].append(t1 - t0)
+                    timings["calculate_motion"].append(t2 - t1)
+                    if record:
+                        timings["write_frame"].append(t3 - t2)
+                    timings["frame"].append(t3 - t0)
+                    
+            if record:
+                recorder.stop()
+            elapsed = time.perf_counter() - started
+            
+        results = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "machine": _machine_info(),
+            "config": {
+                "source": video_path or "synthetic",
+                "frames": num_frames,
+                "warmup": warmup,
+                "record": record,
+                "extract": extract and record,
+                "async_encoding": async_encoding,
+                "resolution": [source.width, source.height],
+            },
+            "fps": num_frames / elapsed,
+            "stages": {
+                stage: _latency_stats(times) for stage, times in timings.items() if times
+            },
+        }
+        
+        if record:
+            results["encoder"] = recorder.get_encoder_stats()
+            
+        if extract and record:
+            results["extract_frames"] = _benchmark_extraction(recorder.output_file, work_dir)
+            
+        results["peak_rss_mb"] = peak_rss_mb()
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        
+def compare_to_baseline(results, baseline, threshold=None, latency_floor_ms=None):
+    """Find metrics that got worse than the baseline by more than a threshold.
+    
+    Throughput (fps) regresses when it drops; latencies (p95) and peak RSS
+    regress when they grow. Latency changes smaller than
+    ``latency_floor_ms`` are ignored, since sub-millisecond stages are
+    dominated by timer noise.
+    
+    Args:
+        results (dict): Results from run_pipeline_benchmark
+        baseline (dict): Earlier results to compare against
+        threshold (float): Allowed relative change, e.g. 0.15 for 15%
+        latency_floor_ms (float): Smallest latency change that counts
+        
+    Returns:
+        list: One dict per regression (metric, baseline, current, change)
+    """
+    threshold = BENCHMARK_SETTINGS["regression_threshold"] if threshold is None else threshold
+    if latency_floor_ms is None:
+        latency_floor_ms = BENCHMARK_SETTINGS["latency_floor_ms"]
+        
+    checks = [("fps", results.get("fps"), baseline.get("fps"), True)]
+    
+    for stage, stats in results.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(stage)
+        if base:
+            checks.append((f"{stage}.p95_ms", stats["p95_ms"], base["p95_ms"], False))
+            
+    if "extract_frames" in results and "extract_frames" in baseline:
+        checks.append((
+            "extract_frames.fps",
+            results["extract_frames"]["fps"],
+            baseline["extract_frames"]["fps"],
+            True
+        ))
+        
+    checks.append(("peak_rss_mb", results.get("peak_rss_mb"), baseline.get("peak_rss_mb"), False))
+    
+    regressions = []
+    for metric, current, base, higher_is_better in checks:
+        if not current or not base:
+            continue
+            
+        change = (current - base) / base
+        worse = -change if higher_is_better else change
+        
+        if metric.endswith("_ms") and abs(current - base) < latency_floor_ms:
+            continue
+            
+        if worse > threshold:
+            regressions.append({
+                "metric": metric,
+                "baseline": base,
+                "current": current,
+                "change": change,
+            })
+            
+    return regressions
+    
+def load_baseline(path=None):
+    """Load baseline results.
+    
+    Args:
+        path (str): Baseline file (default: BENCHMARK_SETTINGS["baseline_path"])
+        
+    Returns:
+        dict: The baseline, or None if the file doesn't exist
+    """
+    path = path or BENCHMARK_SETTINGS["baseline_path"]
+    if not os.path.exists(path):
+        return None
+        
+    with open(path) as f:
+        return json.load(f)
+        
+def save_baseline(results, path=None):
+    """Save results as the new baseline.
+    
+    Args:
+        results (dict): Results from run_pipeline_benchmark
+        path (str): Baseline file (default: BENCHMARK_SETTINGS["baseline_path"])
+        
+    Returns:
+        str: Path of the saved file
+    """
+    path = path or BENCHMARK_SETTINGS["baseline_path"]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        
+    return path
+    
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unknown)."""
+    if resource is None:
+        return None
+        
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+    
+def print_pipeline_results(results):
+    """Print pipeline benchmark results.
+    
+    Args:
+        results (dict): Results from run_pipeline_benchmark
+    """
+    config = results["config"]
+    width, height = config["resolution"]
+    print(f"Source: {config['source']} ({width}x{height}, {config['frames']} frames)")
+    print(f"Throughput: {results['fps']:.1f} fps")
+    print()
+    print(f"{'stage':>18} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for stage, s in results["stages"].items():
+        print(
+            f"{stage:>18} {s['mean_ms']:>8.2f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} "
+            f"{s['p99_ms']:>8.2f} {s['max_ms']:>8.2f}"
+        )
+        
+    extraction = results.get("extract_frames")
+    if extraction:
+        print()
+        print(
+            f"extract_frames: {extraction['frames']} frames, {extraction['fps']:.1f} fps, "
+            f"{extraction['ms_per_frame']:.2f} ms/frame"
+        )
+        
+    if results.get("peak_rss_mb") is not None:
+        print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB")
+        
+def print_regressions(regressions, threshold=None):
+    """Print baseline regressions.
+    
+    Args:
+        regressions (list): Result of compare_to_baseline
+        threshold (float): Threshold that was applied
+    """
+    threshold = BENCHMARK_SETTINGS["regression_threshold"] if threshold is None else threshold
+    
+    if not regressions:
+        print(f"✅ No regressions beyond {threshold:.0%}")
+        return
+        
+    print(f"❌ {len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for r in regressions:
+        print(f"   {r['metric']}: {r['baseline']:.2f} → {r['current']:.2f} ({r['change']:+.1%})")
+        
+def _benchmark_extraction(video_path, work_dir):
+    """Time FrameExtractor.extract_frames on the recorded clip."""
+    extractor = FrameExtractor(output_dir=work_dir)
+    
+    # The extractor reports progress on stdout
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames, _ = extractor.extract_frames(video_path, os.path.join(work_dir, "frames"))
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "ms_per_frame": elapsed * 1000.0 / frames if frames else 0.0,
+    }
+    
+def _latency_stats(times):
+    """Summarize a list of durations in seconds as milliseconds."""
+    ms = np.array(times) * 1000.0
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max()),
+    }
+    
+def _machine_info():
+    """Describe the machine, so baselines from different hosts can be told apart."""
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
\ No newline at end of file
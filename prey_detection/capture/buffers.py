@@ -0,0 +1,378 @@
+"""Preallocated frame buffers shared between capture and processing."""
+import cv2
+import threading
+import time
+import numpy as np
+
+OVERFLOW_POLICIES = ("drop_oldest", "block")
+
+class FrameRing:
+    """Bounded ring of preallocated frames with one producer and one consumer.
+    
+    The storage is a single contiguous block allocated once, when the frame
+    shape is first known. Frames are addressed by a monotonically increasing
+    sequence number; slot ``seq % capacity`` holds frame ``seq``.
+    """
+    
+    def __init__(self, capacity, overflow="drop_oldest"):
+        """Initialize the ring.
+        
+        Args:
+            capacity (int): Number of frame slots (at least 2)
+            overflow (str): "drop_oldest" to overwrite unread frames when
+                full, or "block" to make the producer wait for the consumer
+        """
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+            
+        self.capacity = capacity
+        self.overflow = overflow
+        self.frames = None
+        
+        self._cond = threading.Condition()
+        self._write_seq = 0
+        self._read_seq = 0
+        self._closed = False
+        
+        # Counters
+        self.grabbed = 0
+        self.delivered = 0
+        self.dropped = 0
+        
+    def allocate(self, shape, dtype=np.uint8):
+        """Allocate storage for frames of the given shape.
+        
+        Args:
+            shape (tuple): Shape of a single frame
+            dtype: Frame data type
+        """
+        self.frames = np.empty((self.capacity,) + tuple(shape), dtype=dtype)
+        
+    @property
+    def nbytes(self):
+        """Size of the preallocated storage in bytes."""
+        return 0 if self.frames is None else self.frames.nbytes
+        
+    def reserve(self):
+        """Reserve the next slot for writing.
+        
+        Applies the overflow policy when the ring is full. The returned slot
+        must be filled and then published with ``commit``.
+        
+        Returns:
+            numpy.ndarray: Slot to write into, or None if the ring was closed
+        """
+        with self._cond:
+            while self._write_seq - self._read_seq >= self.capacity:
+                if self._closed:
+                    return None
+                if self.overflow == "drop_oldest":
+                    self._read_seq += 1
+                    self.dropped += 1
+                else:
+                    self._cond.wait()
+                    
+            if self._closed:
+                return None
+                
+            return self.frames[self._write_seq % self.capacity]
+            
+    def commit(self):
+        """Publish the slot returned by the last ``reserve`` call."""
+        with self._cond:
+            self._write_seq += 1
+            self.grabbed += 1
+            self._cond.notify_all()
+            
+    def push(self, frame):
+        """Copy a frame into the ring.
+        
+        Args:
+            frame: Frame to store
+            
+        Returns:
+            bool: False if the ring was closed
+        """
+        slot = self.reserve()
+        if slot is None:
+            return False
+            
+        np.copyto(slot, frame)
+        self.commit()
+        return True
+        
+    def latest(self, timeout=None, out=None):
+        """Get the newest frame that has not been delivered yet.
+        
+        Older unread frames are skipped and counted as dropped.
+        
+        Args:
+            timeout (float): Seconds to wait for a new frame (None waits forever)
+            out (numpy.ndarray): Optional array to copy the frame into
+            
+        Returns:
+            numpy.ndarray: Copy of the frame, or None on timeout or close
+        """
+        with self._cond:
+            if not self._wait_for_frame(timeout):
+                return None
+                
+            self.dropped += self._write_seq - self._read_seq - 1
+            self._read_seq = self._write_seq
+            return self._deliver(self._write_seq - 1, out)
+            
+    def next(self, timeout=None, out=None):
+        """Get the oldest unread frame, blocking until one is available.
+        
+        Args:
+            timeout (float): Seconds to wait for a frame (None waits forever)
+            out (numpy.ndarray): Optional array to copy the frame into
+            
+        Returns:
+            numpy.ndarray: Copy of the frame, or None on timeout or close
+        """
+        with self._cond:
+            if not self._wait_for_frame(timeout):
+                return None
+                
+            seq = self._read_seq
+            self._read_seq += 1
+            return self._deliver(seq, out)
+            
+    def close(self):
+        """Close the ring and wake up any waiting producer or consumer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            
+    def get_stats(self):
+        """Get ring counters.
+        
+        Returns:
+            dict: Frames grabbed, delivered, dropped and currently buffered
+        """
+        with self._cond:
+            return {
+                "grabbed": self.grabbed,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "buffered": self._write_seq - self._read_seq,
+                "capacity": self.capacity,
+            }
+            
+    def _wait_for_frame(self, timeout):
+        """Wait until an unread frame is available. Caller holds the lock."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while self._write_seq == self._read_seq:
+            if self._closed:
+                return False
+                
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+                
+            self._cond.wait(remaining)
+            
+        return True
+        
+    def _deliver(self, seq, out):
+        """Copy frame ``seq`` out of the ring. Caller holds the lock.
+        
+        The producer may be writing into the next slot at the same time, so
+        the frame is always copied rather than returned as a view.
+        """
+        slot = self.frames[seq % self.capacity]
+        self.delivered += 1
+        
+        # Wake a producer blocked on a full ring
+        self._cond.notify_all()
+        
+        if out is not None:
+            np.copyto(out, slot)
+            return out
+            
+        return slot.copy()
+        
+class PreTriggerBuffer:
+    """Rolling history of the most recent frames, written at the start of a clip.
+    
+    All slots are preallocated as one contiguous block at a fixed resolution.
+    The number of slots is capped by ``max_bytes`` so the buffer never grows
+    past its memory budget, whatever the configured duration.
+    """
+    
+    def __init__(self, seconds, fps, resolution, max_bytes):
+        """Initialize the buffer.
+        
+        Args:
+            seconds (float): Seconds of history to keep
+            fps (float): Expected frame rate
+            resolution (tuple): Stored frame size (width, height)
+            max_bytes (int): Hard cap on the buffer's memory use
+        """
+        width, height = resolution
+        frame_bytes = width * height * 3
+        
+        self.resolution = (width, height)
+        self.capacity = max(0, min(int(round(seconds * fps)), max_bytes // frame_bytes))
+        self.frames = np.empty((self.capacity, height, width, 3), dtype=np.uint8)
+        
+        self._next = 0
+        self._count = 0
+        
+    def __len__(self):
+        """Number of frames currently buffered."""
+        return self._count
+        
+    @property
+    def nbytes(self):
+        """Size of the preallocated storage in bytes."""
+        return self.frames.nbytes
+        
+    def push(self, frame):
+        """Copy a frame into the buffer, overwriting the oldest when full.
+        
+        Frames at a different resolution are resized straight into the slot.
+        
+        Args:
+            frame: Frame to store
+        """
+        if self.capacity == 0:
+            return
+            
+        slot = self.frames[self._next]
+        if frame.shape[1] == self.resolution[0] and frame.shape[0] == self.resolution[1]:
+            np.copyto(slot, frame)
+        else:
+            cv2.resize(frame, self.resolution, dst=slot)
+            
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        
+    def drain(self):
+        """Yield buffered frames from oldest to newest and empty the buffer.
+        
+        The yielded arrays are views into the buffer and are only valid
+        until the next ``push``.
+        """
+        start = (self._next - self._count) % self.capacity if self.capacity else 0
+        count = self._count
+        self.clear()
+        
+        for i in range(count):
+            yield self.frames[(start + i) % self.capacity]
+            
+    def clear(self):
+        """Discard all buffered frames."""
+        self._next = 0
+        self._count = 0
+        
+class PooledFrame:
+    """A reference-counted frame buffer borrowed from a FramePool."""
+    
+    __slots__ = ("array", "_pool", "_refs")
+    
+    def __init__(self, array, pool):
+        self.array = array
+        self._pool = pool
+        self._refs = 0
+        
+    def retain(self):
+        """Add a reference, e.g. before handing the frame to another thread.
+        
+        Returns:
+            PooledFrame: This frame
+        """
+        with self._pool._lock:
+            self._refs += 1
+        return self
+        
+    def release(self):
+        """Drop a reference; the buffer returns to the pool at zero."""
+        with self._pool._lock:
+            self._refs -= 1
+            if self._refs == 0:
+                self._pool._free.append(self)
+            elif self._refs < 0:
+                raise RuntimeError("PooledFrame released more times than retained")
+                
+class FramePool:
+    """Pool of reusable frame buffers shared by capture, motion and recording.
+    
+    Buffers are handed out with a reference count of one. Every consumer
+    that keeps a frame beyond the current loop iteration retains it and
+    releases it when done, and the last release returns the buffer to the
+    pool. If the pool runs dry a new buffer is allocated rather than
+    blocking capture; ``allocated`` shows when the pool is too small.
+    """
+    
+    def __init__(self, size, shape=None, dtype=np.uint8):
+        """Initialize the pool.
+        
+        Args:
+            size (int): Number of buffers to preallocate
+            shape (tuple): Frame shape, or None to configure on first use
+            dtype: Frame data type
+        """
+        self.size = size
+        self.shape = None
+        self.dtype = dtype
+        self.allocated = 0
+        
+        self._lock = threading.Lock()
+        self._free = []
+        
+        if shape is not None:
+            self.configure(shape, dtype)
+            
+    @property
+    def configured(self):
+        """Whether the frame shape is known and buffers are allocated."""
+        return self.shape is not None
+        
+    def configure(self, shape, dtype=np.uint8):
+        """Allocate the pool's buffers for frames of the given shape.
+        
+        Args:
+            shape (tuple): Frame shape
+            dtype: Frame data type
+        """
+        with self._lock:
+            self.shape = tuple(shape)
+            self.dtype = dtype
+            self._free = [self._new_frame() for _ in range(self.size)]
+            
+    def acquire(self):
+        """Borrow a buffer from the pool.
+        
+        Returns:
+            PooledFrame: Frame with a reference count of one
+        """
+        if not self.configured:
+            raise RuntimeError("FramePool is not configured")
+            
+        with self._lock:
+            frame = self._free.pop() if self._free else self._new_frame()
+            frame._refs = 1
+            return frame
+            
+    def get_stats(self):
+        """Get pool counters.
+        
+        Returns:
+            dict: Pool size, free buffers and total buffers allocated
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "free": len(self._free),
+                "allocated": self.allocated,
+            }
+            
+    def _new_frame(self):
+        """Allocate a new buffer. Caller holds the lock."""
+        self.allocated += 1
+        return PooledFrame(np.empty(self.shape, dtype=self.dtype), self)
\ No newline at end of file
@@ -2,14 +2,32 @@
 import cv2
 import os
 import time
-from datetime import datetime
+import threading
+import numpy as np
 from ..config.settings import VIDEO_SETTINGS, CAMERA_SETTINGS, PATHS
+from ..utils.metrics import METRICS
+from .buffers import FrameRing
+from .clock import SYSTEM_CLOCK
+from .sources import FrameSource
 
-class Camera:
+READ_POLICIES = ("latest", "next")
+
+class Camera(FrameSource):
     """Camera capture class for video and image capture."""
     
-    def __init__(self, camera_index=None):
-        """Initialize the camera."""
+    def __init__(self, camera_index=None, threaded=None, buffer_size=None,
+                 overflow=None, read_policy=None, clock=None):
+        """Initialize the camera.
+        
+        Args:
+            camera_index (int): Camera index
+            threaded (bool): Grab frames on a background thread
+            buffer_size (int): Number of preallocated frames in threaded mode
+            overflow (str): "drop_oldest" or "block" when the buffer is full
+            read_policy (str): "latest" or "next" frame for read() in threaded mode
+            clock (SystemClock or SimulatedClock): Clock shared with the
+                detector and recorder using this camera
+        """
         if camera_index is None:
             camera_index = CAMERA_SETTINGS["default_index"]
             
@@ -18,15 +36,21 @@ class Camera:
         self.width = None
         self.height = None
         self.fps = VIDEO_SETTINGS["fps"]
+        self.clock = clock or SYSTEM_CLOCK
         
-    def __enter__(self):
-        """Context manager entry point."""
-        self.open()
-        return self
-        
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit point."""
-        self.close()
+        # Threaded capture settings
+        self.threaded = CAMERA_SETTINGS["threaded"] if threaded is None else threaded
+        self.buffer_size = buffer_size or CAMERA_SETTINGS["buffer_size"]
+        self.overflow = overflow or CAMERA_SETTINGS["overflow"]
+        self.read_policy = read_policy or CAMERA_SETTINGS["read_policy"]
+        if self.read_policy not in READ_POLICIES:
+            raise ValueError(f"read_policy must be one of {READ_POLICIES}")
+            
+        self._ring = None
+        self._grab_thread = None
+        self._grab_error = None
+        self._frames_read = 0
+        self._dropped_reported = 0
         
     def open(self):
         """Open the camera."""
@@ -39,61 +63,96 @@ class Camera:
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         
+        if self.threaded:
+            self._start_grabber()
+            
         return self
         
     def close(self):
-        """Close the camera."""
+        """Close the camera.
+        
+        If the grabber is still stuck in a read, the capture is left open
+        rather than released under it.
+        """
+        if not self._stop_grabber():
+            print(f"⚠️  Camera {self.camera_index} grabber did not stop; not releasing the capture")
+            return
+            
         if self.cap and self.cap.isOpened():
             self.cap.release()
             
-    def read(self):
-        """Read a frame from the camera."""
-        if not self.cap or not self.cap.isOpened():
+    def is_open(self):
+        """Whether the camera is open."""
+        return self.cap is not None and self.cap.isOpened()
+        
+    def read(self, out=None):
+        """Read a frame from the camera.
+        
+        In threaded mode the frame comes from the grabber's ring buffer,
+        using the camera's read policy.
+        
+        Args:
+            out (numpy.ndarray): Optional preallocated array to read into
+            
+        Returns:
+            numpy.ndarray: The frame (``out`` when given)
+        """
+        if not self.is_open():
             raise RuntimeError("Camera is not open")
             
-        ret, frame = self.cap.read()
-        
+        started = time.perf_counter() if METRICS.enabled else None
+        ret, frame = self._read_frame(out)
+        if started is not None:
+            self._record_read(started, ret)
+            
         if not ret:
+            if self._grab_error is not None:
+                raise RuntimeError(f"Could not read frame from camera: {self._grab_error}")
             raise RuntimeError("Could not read frame from camera")
             
         return frame
         
-    def read_continuous(self, callback=None, window_name=None, exit_key='q'):
-        """Read frames continuously until exit_key is pressed.
+    def read_latest(self, timeout=None):
+        """Read the newest frame grabbed by the background thread.
+        
+        Frames grabbed since the last read are skipped and counted as dropped.
         
         Args:
-            callback (callable): Function to call with each frame
-            window_name (str): Window name for display
-            exit_key (str): Key to exit the loop
+            timeout (float): Seconds to wait for a new frame
+            
+        Returns:
+            numpy.ndarray: The frame
         """
-        if not self.cap or not self.cap.isOpened():
-            raise RuntimeError("Camera is not open")
+        return self._read_threaded(self._require_ring().latest, timeout)
+        
+    def read_next(self, timeout=None):
+        """Read the oldest buffered frame, blocking until one is available.
+        
+        Args:
+            timeout (float): Seconds to wait for a frame
             
-        try:
-            while True:
-                ret, frame = self.cap.read()
-                
-                if not ret:
-                    print("Error: Could not read frame")
-                    break
-                    
-                if callback:
-                    result = callback(frame)
-                    # If callback returns False, break the loop
-                    if result is False:
-                        break
-                
-                if window_name:
-                    cv2.imshow(window_name, frame)
-                    
-                    # Check for key press
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord(exit_key):
-                        break
-        finally:
-            if window_name:
-                cv2.destroyWindow(window_name)
-                
+        Returns:
+            numpy.ndarray: The frame
+        """
+        return self._read_threaded(self._require_ring().next, timeout)
+        
+    def get_stats(self):
+        """Get capture counters.
+        
+        Returns:
+            dict: Frames grabbed, delivered, dropped and currently buffered
+        """
+        if self._ring is not None:
+            return self._ring.get_stats()
+            
+        return {
+            "grabbed": self._frames_read,
+            "delivered": self._frames_read,
+            "dropped": 0,
+            "buffered": 0,
+            "capacity": 0,
+        }
+        
     def get_properties(self):
         """Get camera properties."""
         return {
@@ -101,6 +160,7 @@ class Camera:
             "width": self.width,
             "height": self.height,
             "fps": self.fps,
+            "threaded": self.threaded,
         }
         
     def capture_image(self, output_path=None):
@@ -112,10 +172,10 @@ class Camera:
         Returns:
             tuple: (frame, path) - The captured frame and path where saved
         """
-        if not self.cap or not self.cap.isOpened():
+        if not self.is_open():
             raise RuntimeError("Camera is not open")
             
-        ret, frame = self.cap.read()
+        ret, frame = self._read_frame()
         
         if not ret:
             raise RuntimeError("Could not read frame from camera")
@@ -127,6 +187,110 @@ class Camera:
             
         return frame, output_path
         
+    def _read_frame(self, out=None):
+        """Read a frame using the synchronous or threaded path.
+        
+        Args:
+            out (numpy.ndarray): Optional preallocated array to read into
+            
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read
+        """
+        if self._ring is None:
+            ret, frame = self.cap.read(out)
+            if ret:
+                self._frames_read += 1
+                # OpenCV reallocates if the array doesn't match the frame
+                if out is not None and frame is not out:
+                    np.copyto(out, frame)
+                    frame = out
+            return ret, frame
+            
+        if self.read_policy == "latest":
+            frame = self._ring.latest(out=out)
+        else:
+            frame = self._ring.next(out=out)
+            
+        return frame is not None, frame
+        
+    def _read_threaded(self, getter, timeout):
+        """Get a frame from the ring and raise if none arrived."""
+        frame = getter(timeout)
+        
+        if frame is None:
+            if self._grab_error is not None:
+                raise RuntimeError(f"Could not read frame from camera: {self._grab_error}")
+            raise RuntimeError("Could not read frame from camera")
+            
+        return frame
+        
+    def _require_ring(self):
+        """Return the frame ring, raising if threaded capture is not running."""
+        if self._ring is None:
+            raise RuntimeError("Camera is not open in threaded mode")
+        return self._ring
+        
+    def _start_grabber(self):
+        """Start the background grabber thread."""
+        # The first frame is read here so the ring can be sized for it
+        ret, frame = self.cap.read()
+        if not ret:
+            raise RuntimeError("Could not read frame from camera")
+            
+        self._grab_error = None
+        self._ring = FrameRing(self.buffer_size, overflow=self.overflow)
+        self._ring.allocate(frame.shape, frame.dtype)
+        self._ring.push(frame)
+        
+        self._grab_thread = threading.Thread(
+            target=self._grab_loop,
+            name=f"camera-{self.camera_index}-grabber",
+            daemon=True
+        )
+        self._grab_thread.start()
+        
+    def _stop_grabber(self):
+        """Stop the background grabber thread.
+        
+        Returns:
+            bool: False if the thread is still running after the timeout
+        """
+        if self._ring is None:
+            return True
+            
+        self._ring.close()
+        if self._grab_thread is not None:
+            self._grab_thread.join(timeout=2.0)
+            if self._grab_thread.is_alive():
+                return False
+            self._grab_thread = None
+        return True
+            
+    def _grab_loop(self):
+        """Grab frames into the ring until the camera is closed."""
+        ring = self._ring
+        
+        try:
+            while True:
+                slot = ring.reserve()
+                if slot is None:
+                    break
+                    
+                # Decode straight into the preallocated slot
+                ret, frame = self.cap.read(slot)
+                if not ret:
+                    self._grab_error = "grab failed"
+                    break
+                    
+                if frame is not slot:
+                    slot[...] = frame
+                    
+                ring.commit()
+        except Exception as e:
+            self._grab_error = str(e)
+        finally:
+            ring.close()
+            
     @staticmethod
     def list_cameras(max_cameras=5):
         """List available cameras.
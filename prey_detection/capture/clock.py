@@ -0,0 +1,92 @@
+"""Clocks for the capture package: real time, or simulated for replays."""
+import threading
+import time
+from datetime import datetime
+
+class SystemClock:
+    """The real wall clock."""
+    
+    def time(self):
+        """Seconds since the epoch."""
+        return time.time()
+        
+    def monotonic(self):
+        """Seconds on a clock that never goes backwards."""
+        return time.monotonic()
+        
+    def sleep(self, seconds):
+        """Block for a number of seconds."""
+        time.sleep(seconds)
+        
+    def now(self):
+        """Current local date and time."""
+        return datetime.now()
+        
+class SimulatedClock:
+    """A clock that only moves when told to.
+    
+    ``sleep`` returns immediately and advances the clock instead, so a
+    frame source paced in realtime on a simulated clock delivers frames as
+    fast as they can be decoded while the clock follows the frame
+    timestamps. Replays then run at full speed and produce the same event
+    timeline every time.
+    """
+    
+    def __init__(self, start=0.0):
+        """Initialize the clock.
+        
+        Args:
+            start (float or datetime): Starting time, as seconds since the
+                epoch or a datetime
+        """
+        if isinstance(start, datetime):
+            start = start.timestamp()
+            
+        self._now = float(start)
+        self._lock = threading.Lock()
+        
+    def time(self):
+        """Simulated seconds since the epoch."""
+        return self._now
+        
+    def monotonic(self):
+        """Simulated seconds; the same as time()."""
+        return self._now
+        
+    def sleep(self, seconds):
+        """Advance the clock instead of blocking."""
+        if seconds > 0:
+            self.advance(seconds)
+            
+    def now(self):
+        """Simulated local date and time."""
+        return datetime.fromtimestamp(self._now)
+        
+    def advance(self, seconds):
+        """Move the clock forward.
+        
+        Args:
+            seconds (float): Seconds to advance (must not be negative)
+        """
+        if seconds < 0:
+            raise ValueError("A clock cannot go backwards")
+            
+        with self._lock:
+            self._now += seconds
+            
+    def set(self, timestamp):
+        """Move the clock forward to a point in time.
+        
+        Args:
+            timestamp (float or datetime): New time, not earlier than now
+        """
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+            
+        with self._lock:
+            if timestamp < self._now:
+                raise ValueError("A clock cannot go backwards")
+            self._now = float(timestamp)
+            
+# Shared default clock
+SYSTEM_CLOCK = SystemClock()
\ No newline at end of file
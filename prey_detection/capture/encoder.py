@@ -0,0 +1,355 @@
+"""Asynchronous video encoding."""
+import cv2
+import queue
+import threading
+import time
+from collections import deque
+import numpy as np
+from .buffers import PooledFrame
+
+OVERFLOW_POLICIES = ("block", "drop", "degrade")
+
+# Sentinel that tells the encoder thread to finish
+_STOP = object()
+
+class _Rotate:
+    """Queue item that switches the encoder to a new writer."""
+    
+    __slots__ = ("open_writer",)
+    
+    def __init__(self, open_writer):
+        self.open_writer = open_writer
+        
+class EncoderPool:
+    """Worker threads shared by the AsyncEncoders of several cameras.
+    
+    The number of workers caps how many clips are encoded at once. Each
+    encoder is served by at most one worker at a time, so frames stay in
+    order within a clip.
+    """
+    
+    def __init__(self, workers=2, batch_size=8):
+        """Initialize the pool and start its workers.
+        
+        Args:
+            workers (int): Number of encoder threads
+            batch_size (int): Frames encoded per turn before yielding to
+                other encoders
+        """
+        self.workers = workers
+        self.batch_size = batch_size
+        
+        self.closed = False
+        
+        self._ready = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"encoder-pool-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+            
+    def close(self):
+        """Stop the workers once all scheduled work is done.
+        
+        Encoders still open afterwards no longer accept frames and encode
+        their remaining queue on the thread that closes them.
+        """
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.closed = True
+        
+    def _schedule(self, encoder):
+        """Queue an encoder that has frames waiting."""
+        self._ready.put(encoder)
+        
+    def _run(self):
+        """Worker main loop."""
+        while True:
+            encoder = self._ready.get()
+            if encoder is None:
+                break
+            encoder._drain(self.batch_size)
+            
+class AsyncEncoder:
+    """Encode frames on a dedicated thread fed by a bounded queue.
+    
+    OpenCV releases the GIL while resizing and encoding, so a thread is
+    enough to take the encoder off the capture loop. With an EncoderPool the
+    frames are encoded by the pool's shared workers instead.
+    """
+    
+    def __init__(self, writer, resolution, queue_size=32, overflow="block", max_stride=8,
+                 pool=None):
+        """Initialize the encoder and start its thread.
+        
+        Args:
+            writer (cv2.VideoWriter): Open video writer, released on close
+            resolution (tuple): Output resolution (width, height)
+            queue_size (int): Maximum number of frames waiting to be encoded
+            overflow (str): What to do when the queue is full: "block" the
+                caller, "drop" the frame, or "degrade" by keeping only every
+                Nth frame until the encoder catches up
+            max_stride (int): Largest frame stride used by "degrade"
+            pool (EncoderPool): Shared workers to use instead of a dedicated thread
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+            
+        self.writer = writer
+        self.resolution = tuple(resolution)
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.max_stride = max_stride
+        
+        # Frames need a free slot; control items (rotations, stop) don't,
+        # so queueing them never blocks the producer
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._resize_buffer = None
+        self._stride = 1
+        self._submit_index = 0
+        self._closed = False
+        self._error = None
+        self._finished = threading.Event()
+        
+        self.pool = pool
+        self._scheduled = False
+        self._schedule_lock = threading.Lock()
+        
+        # Stats
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.max_depth = 0
+        self._encode_times = deque(maxlen=256)
+        self._latencies = deque(maxlen=256)
+        
+        self._thread = None
+        if pool is None:
+            self._thread = threading.Thread(target=self._run, name="video-encoder", daemon=True)
+            self._thread.start()
+            
+    def submit(self, frame):
+        """Queue a frame for encoding.
+        
+        The frame is not copied, so the caller must not modify it afterwards.
+        A PooledFrame is retained until it has been encoded.
+        
+        Args:
+            frame: The frame to encode (numpy.ndarray or PooledFrame)
+            
+        Returns:
+            bool: True if the frame was queued, False if it was dropped
+        """
+        if self._closed:
+            raise RuntimeError("Encoder is closed")
+        if self._error is not None:
+            raise RuntimeError(f"Encoder failed: {self._error}")
+        if self.pool is not None and self.pool.closed:
+            raise RuntimeError("Encoder pool is closed")
+            
+        self.submitted += 1
+        
+        if self.overflow == "degrade":
+            self._update_stride()
+            self._submit_index += 1
+            if (self._submit_index - 1) % self._stride:
+                self.dropped += 1
+                return False
+                
+        pooled = frame if isinstance(frame, PooledFrame) else None
+        if pooled is not None:
+            pooled.retain()
+            frame = pooled.array
+            
+        item = (frame, time.perf_counter(), pooled)
+        
+        if not self._slots.acquire(blocking=self.overflow == "block"):
+            if pooled is not None:
+                pooled.release()
+            self.dropped += 1
+            return False
+        self._queue.put(item)
+        
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        self._schedule()
+        return True
+        
+    def rotate(self, open_writer):
+        """Switch to a new writer once the frames queued so far are encoded.
+        
+        The old writer is released and the new one opened on the encoder
+        thread, so the caller never waits for a file to be finalized.
+        The switch does not take a frame slot and is queued even when the
+        queue is full.
+        
+        Args:
+            open_writer (callable): Returns the new, open cv2.VideoWriter
+        """
+        if self._closed:
+            raise RuntimeError("Encoder is closed")
+            
+        self._queue.put(_Rotate(open_writer))
+        self._schedule()
+        
+    def close(self):
+        """Encode everything still queued, then release the writer.
+        
+        Returns:
+            dict: Final encoder stats
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            if self.pool is not None and self.pool.closed:
+                # No workers left to wait for
+                self._drain_inline()
+            else:
+                self._schedule()
+            self._finished.wait()
+            if self._thread is not None:
+                self._thread.join()
+            self.writer.release()
+            
+        return self.get_stats()
+        
+    def get_stats(self):
+        """Get queue depth and latency stats.
+        
+        Returns:
+            dict: Frame counters, queue depth, and encode/latency times in ms
+        """
+        encode_times = np.array(self._encode_times) * 1000.0
+        latencies = np.array(self._latencies) * 1000.0
+        
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "queue_size": self.queue_size,
+            "stride": self._stride,
+            "encode_ms_mean": float(encode_times.mean()) if len(encode_times) else 0.0,
+            "encode_ms_p95": float(np.percentile(encode_times, 95)) if len(encode_times) else 0.0,
+            "latency_ms_mean": float(latencies.mean()) if len(latencies) else 0.0,
+            "latency_ms_max": float(latencies.max()) if len(latencies) else 0.0,
+        }
+        
+    def _update_stride(self):
+        """Adjust the degrade stride from the current queue depth."""
+        depth = self._queue.qsize()
+        
+        if depth >= self.queue_size * 3 // 4:
+            self._stride = min(self._stride * 2, self.max_stride)
+        elif depth <= self.queue_size // 4:
+            self._stride = max(self._stride // 2, 1)
+            
+    def _schedule(self):
+        """Hand this encoder to the pool if it isn't already waiting there."""
+        if self.pool is None:
+            return
+            
+        with self._schedule_lock:
+            if not self._scheduled:
+                self._scheduled = True
+                self.pool._schedule(self)
+                
+    def _drain(self, max_items):
+        """Encode up to max_items queued frames on a pool worker."""
+        for _ in range(max_items):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+                
+            if item is _STOP:
+                self._finished.set()
+                break
+                
+            self._handle(item)
+            
+        # Reschedule if frames arrived while this worker was busy
+        with self._schedule_lock:
+            self._scheduled = False
+            if not self._queue.empty() and not self._finished.is_set():
+                self._scheduled = True
+                self.pool._schedule(self)
+                
+    def _drain_inline(self):
+        """Encode everything up to the stop marker on the calling thread."""
+        while True:
+            item = self._queue.get_nowait()
+            if item is _STOP:
+                self._finished.set()
+                break
+                
+            self._handle(item)
+            
+    def _run(self):
+        """Encoder thread main loop."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._finished.set()
+                break
+                
+            self._handle(item)
+            
+    def _handle(self, item):
+        """Process one queued item: a frame or a writer switch."""
+        if isinstance(item, _Rotate):
+            self._switch_writer(item.open_writer)
+        else:
+            self._slots.release()
+            self._encode(item)
+            
+    def _switch_writer(self, open_writer):
+        """Release the current writer and continue with a new one."""
+        if self._error is not None:
+            return
+            
+        try:
+            self.writer.release()
+            self.writer = open_writer()
+            self.rotations += 1
+        except Exception as e:
+            self._error = str(e)
+            
+    def _encode(self, item):
+        """Resize and write one queued frame."""
+        frame, submitted_at, pooled = item
+        
+        # After a failure keep draining so producers never block forever
+        if self._error is not None:
+            if pooled is not None:
+                pooled.release()
+            return
+            
+        started = time.perf_counter()
+        
+        try:
+            if frame.shape[1] != self.resolution[0] or frame.shape[0] != self.resolution[1]:
+                if self._resize_buffer is None:
+                    self._resize_buffer = np.empty(
+                        (self.resolution[1], self.resolution[0]) + frame.shape[2:], dtype=frame.dtype
+                    )
+                frame = cv2.resize(frame, self.resolution, dst=self._resize_buffer)
+            self.writer.write(frame)
+        except Exception as e:
+            self._error = str(e)
+            return
+        finally:
+            if pooled is not None:
+                pooled.release()
+                
+        finished = time.perf_counter()
+        self._encode_times.append(finished - started)
+        self._latencies.append(finished - submitted_at)
+        self.written += 1
\ No newline at end of file
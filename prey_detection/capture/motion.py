@@ -2,68 +2,131 @@
 import cv2
 import os
 import time
-from datetime import datetime
 from ..config.settings import MOTION_SETTINGS, PATHS
+from ..utils.metrics import METRICS
+from .buffers import FramePool, PooledFrame, PreTriggerBuffer
 from .camera import Camera
+from .clock import SYSTEM_CLOCK
+from .motion_engine import MotionEngine
 from .recorder import VideoRecorder
 
+# Event states
+IDLE = "idle"
+RECORDING = "recording"
+COOLDOWN = "cooldown"
+
+# Histogram buckets for motion scores, in changed pixels
+SCORE_BUCKETS = (1000, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000)
+
+_SCORE_SECONDS = METRICS.histogram("motion_score_seconds", "Time to score motion on a frame")
+_SCORES = METRICS.histogram("motion_score", "Motion scores in changed pixels", buckets=SCORE_BUCKETS)
+_TRIGGERS = METRICS.counter("motion_triggers_total", "Motion events started")
+
 class MotionDetector:
     """Motion detection class for motion-triggered recording."""
     
-    def __init__(self, output_dir=None, camera=None):
+    def __init__(self, output_dir=None, camera=None, encoder_pool=None, clock=None):
         """Initialize the motion detector.
         
         Args:
             output_dir (str): Directory to save motion videos
-            camera (Camera): Camera instance to use
+            camera (Camera): Camera or other frame source (see sources.py)
+            encoder_pool (EncoderPool): Shared encoder workers for the recorder
+            clock (SystemClock or SimulatedClock): Clock for frame timestamps
+                and file names (default: the camera's clock)
         """
         self.output_dir = output_dir or PATHS["motion_videos_dir"]
         os.makedirs(self.output_dir, exist_ok=True)
         
         self.camera = camera or Camera()
-        if not isinstance(self.camera, Camera):
-            raise TypeError("camera must be an instance of Camera")
-            
+        if not callable(getattr(self.camera, "read_pooled", None)):
+            raise TypeError("camera must be a Camera or another frame source")
+        self._camera_label = str(self.camera.get_properties()["index"])
+        self.clock = clock or getattr(self.camera, "clock", None) or SYSTEM_CLOCK
+        
         self.recorder = VideoRecorder(
             output_dir=self.output_dir,
-            camera=self.camera
+            camera=self.camera,
+            encoder_pool=encoder_pool,
+            clock=self.clock
         )
         
+        # Frames from just before a trigger, flushed into each clip
+        self.pre_trigger = PreTriggerBuffer(
+            seconds=MOTION_SETTINGS["pre_trigger_seconds"],
+            fps=self.recorder.fps,
+            resolution=self.recorder.resolution,
+            max_bytes=int(MOTION_SETTINGS["pre_trigger_max_mb"] * 1024 * 1024)
+        )
+        self.recorder.pre_trigger_buffer = self.pre_trigger
+        
+        # Reusable capture buffers; frames queued for encoding stay borrowed
+        pool_size = 4
+        if self.recorder.async_encoding:
+            pool_size += self.recorder.encoder_queue_size
+        self.frame_pool = FramePool(pool_size)
+        
         # Motion settings
         self.record_seconds = MOTION_SETTINGS["record_seconds"]
+        self.max_record_seconds = MOTION_SETTINGS["max_record_seconds"]
+        self.post_roll_seconds = MOTION_SETTINGS["post_roll_seconds"]
         self.frame_diff_threshold = MOTION_SETTINGS["frame_diff_threshold"]
         self.motion_check_interval = MOTION_SETTINGS["motion_check_interval"]
-        self.blur_size = MOTION_SETTINGS["blur_size"]
-        self.threshold_value = MOTION_SETTINGS["threshold_value"]
+        
+        # Scoring runs on a downscaled, ROI-masked image
+        self.engine = MotionEngine()
         
         # Internal state
-        self.prev_gray = None
         self.running = False
+        self.frame_consumers = []
+        self.state = IDLE
+        self.event_count = 0
+        self.event_log = None  # Set to a list to collect finished events
+        self._last_check = float("-inf")
+        self._last_frame_time = None
+        self._event_start = None
+        self._event_end = None
+        self._cooldown_end = None
         
-    def calculate_motion(self, frame):
-        """Calculate motion score between current frame and previous frame.
+    def score_motion(self, frame, with_boxes=False):
+        """Score motion without any visualization work.
+        
+        This is the headless fast path: no frame copies and no drawing.
         
         Args:
             frame: Current frame
+            with_boxes (bool): Also find bounding boxes of the motion areas,
+                if the score is above the motion threshold
             
         Returns:
-            tuple: (motion_score, visualization_frame)
+            tuple: (motion_score, boxes) - boxes is a list of (x, y, w, h) in
+                frame coordinates, or None if not requested
         """
-        # Convert to grayscale and blur
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, self.blur_size, 0)
-        
-        # Initialize prev_gray if not set
-        if self.prev_gray is None:
-            self.prev_gray = gray
-            return 0, frame
+        started = time.perf_counter() if METRICS.enabled else None
+        motion_score, thresh = self.engine.score(frame)
+        if started is not None:
+            self._record_score(started, motion_score)
+            
+        if not with_boxes:
+            return motion_score, None
             
-        # Calculate frame difference
-        frame_delta = cv2.absdiff(self.prev_gray, gray)
-        thresh = cv2.threshold(frame_delta, self.threshold_value, 255, cv2.THRESH_BINARY)[1]
-        motion_score = cv2.countNonZero(thresh)
+        # Contours are only worth finding when there is motion to show
+        if thresh is None or motion_score <= self.frame_diff_threshold:
+            return motion_score, []
+            
+        return motion_score, self._find_motion_boxes(thresh)
+        
+    def draw_motion_overlay(self, frame, motion_score, boxes=None):
+        """Draw the motion score and motion areas on a copy of the frame.
         
-        # Create visualization frame
+        Args:
+            frame: Frame to annotate (left unchanged)
+            motion_score (int): Score from score_motion
+            boxes (list): Motion areas as (x, y, w, h)
+            
+        Returns:
+            numpy.ndarray: Visualization frame
+        """
         vis_frame = frame.copy()
         
         # Add motion score text
@@ -77,27 +140,67 @@ class MotionDetector:
             2
         )
         
-        # Show motion detection visualization if significant motion
+        # Highlight motion areas
+        for (x, y, w, h) in boxes or []:
+            cv2.rectangle(vis_frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+            
+        return vis_frame
+        
+    def calculate_motion(self, frame):
+        """Calculate motion score between current frame and previous frame.
+        
+        Args:
+            frame: Current frame
+            
+        Returns:
+            tuple: (motion_score, visualization_frame)
+        """
+        started = time.perf_counter() if METRICS.enabled else None
+        motion_score, thresh = self.engine.score(frame)
+        if started is not None:
+            self._record_score(started, motion_score)
+            
+        # First frame only initializes the engine
+        if thresh is None:
+            return 0, frame
+            
+        # Show motion areas only if significant motion
+        boxes = None
         if motion_score > self.frame_diff_threshold:
-            # Highlight motion areas
-            contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            for contour in contours:
-                if cv2.contourArea(contour) > 50:  # Filter small noise
-                    (x, y, w, h) = cv2.boundingRect(contour)
-                    cv2.rectangle(vis_frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+            boxes = self._find_motion_boxes(thresh)
+            
+        return motion_score, self.draw_motion_overlay(frame, motion_score, boxes)
         
-        # Update previous frame
-        self.prev_gray = gray
+    def add_frame_consumer(self, callback):
+        """Attach a consumer of visualization frames, e.g. a stream.
         
-        return motion_score, vis_frame
+        While any consumer is attached, every processed frame is annotated
+        and passed to ``callback(vis_frame)``. The frame may be a reused
+        capture buffer, so consumers that keep it must copy it.
+        
+        Args:
+            callback (callable): Function to call with each visualization frame
+        """
+        self.frame_consumers.append(callback)
+        
+    def remove_frame_consumer(self, callback):
+        """Detach a consumer added with add_frame_consumer.
+        
+        Args:
+            callback (callable): The consumer to remove
+        """
+        self.frame_consumers.remove(callback)
         
     def start_monitoring(self, show_preview=True):
         """Start monitoring for motion.
         
+        Every frame goes through the event state machine, so motion keeps
+        being scored while a clip is recording.
+        
         Args:
             show_preview (bool): Show preview window
         """
-        if not self.camera.cap or not self.camera.cap.isOpened():
+        if not self.camera.is_open():
             self.camera.open()
             
         self.running = True
@@ -105,50 +208,182 @@ class MotionDetector:
         
         print("🎥 Monitoring for motion...")
         print(f"Motion threshold: {self.frame_diff_threshold}")
-        print(f"Record duration: {self.record_seconds} seconds")
+        print(f"Record duration: {self.record_seconds} seconds (max {self.max_record_seconds})")
         print("Press 'q' to quit")
         
         try:
             while self.running:
-                # Read frame
-                frame = self.camera.read()
-                
-                # Calculate motion
-                motion_score, vis_frame = self.calculate_motion(frame)
+                # Read into a pooled buffer instead of a new array
+                frame = self.camera.read_pooled(self.frame_pool)
                 
+                # Score motion and advance the event state
+                try:
+                    motion_score, vis_frame = self.process_frame(frame, visualize=show_preview)
+                finally:
+                    frame.release()
+                    
                 # Show preview
                 if show_preview:
                     cv2.imshow(window_name, vis_frame)
                     if cv2.waitKey(1) & 0xFF == ord('q'):
                         break
                         
-                # Check for motion
-                if motion_score > self.frame_diff_threshold:
-                    print(f"📸 Motion detected! Score: {motion_score}")
-                    self._record_motion_event()
-                    
-                # Wait between checks
-                time.sleep(self.motion_check_interval)
-                
         except KeyboardInterrupt:
             print("\n👋 Exiting on keyboard interrupt.")
         finally:
             self.running = False
+            self.finish_event()
             if show_preview:
                 cv2.destroyWindow(window_name)
                 
-    def _record_motion_event(self):
-        """Record a motion event."""
+    def process_frame(self, frame, now=None, visualize=False, check_motion=True):
+        """Run one step of the event state machine.
+        
+        While idle the frame goes into the pre-trigger buffer; during an
+        event it is written to the current clip. Motion inside an event
+        extends it, up to max_record_seconds.
+        
+        Visualization only runs when requested or when a frame consumer is
+        attached; otherwise the frame is just scored.
+        
+        Args:
+            frame: Current frame (numpy.ndarray or PooledFrame)
+            now (float): Frame timestamp in seconds (defaults to the clock's time)
+            visualize (bool): Build an annotated visualization frame
+            check_motion (bool): Allow motion scoring on this frame; when False
+                the frame is only buffered or recorded
+            
+        Returns:
+            tuple: (motion_score, visualization_frame) - score is None if
+                motion was not checked on this frame, and the visualization
+                frame is None when not visualizing
+        """
+        if now is None:
+            now = self.clock.time()
+        self._last_frame_time = now
+        
+        # The recorder gets the pooled frame so it can retain it
+        image = frame.array if isinstance(frame, PooledFrame) else frame
+        
+        if self.state == IDLE:
+            self.pre_trigger.push(image)
+        else:
+            self.recorder.write_frame(frame)
+            
+        visualize = visualize or bool(self.frame_consumers)
+        motion_score = None
+        boxes = None
+        
+        if check_motion and now - self._last_check >= self.motion_check_interval:
+            self._last_check = now
+            motion_score, boxes = self.score_motion(image, with_boxes=visualize)
+            
+            if motion_score > self.frame_diff_threshold:
+                self._on_motion(motion_score, now)
+                
+        self._advance(now)
+        
+        vis_frame = None
+        if visualize:
+            vis_frame = image
+            if motion_score is not None:
+                vis_frame = self.draw_motion_overlay(image, motion_score, boxes)
+            for consumer in self.frame_consumers:
+                consumer(vis_frame)
+        
+        return motion_score, vis_frame
+        
+    def _on_motion(self, motion_score, now):
+        """Start a new event or extend the current one."""
+        if self.state == IDLE:
+            print(f"📸 Motion detected! Score: {motion_score}")
+            self._start_event(now)
+            return
+            
+        # Extend the clip, but never past the maximum length
+        self._event_end = min(
+            max(self._event_end, now + self.record_seconds),
+            self._event_start + self.max_record_seconds
+        )
+        if self.state == COOLDOWN and now < self._event_end:
+            self.state = RECORDING
+            
+    def _advance(self, now):
+        """Move through recording → cooldown → idle as deadlines pass."""
+        if self.state == IDLE:
+            return
+            
+        if now - self._event_start >= self.max_record_seconds:
+            self._finish_event()
+        elif self.state == RECORDING and now >= self._event_end:
+            # Post-roll: keep recording a little longer after the last motion
+            self.state = COOLDOWN
+            self._cooldown_end = min(
+                now + self.post_roll_seconds,
+                self._event_start + self.max_record_seconds
+            )
+        elif self.state == COOLDOWN and now >= self._cooldown_end:
+            self._finish_event()
+            
+    def _start_event(self, now):
+        """Open a new clip; the pre-trigger frames are written first."""
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self.clock.now().strftime("%Y%m%d_%H%M%S")
         output_file = os.path.join(self.output_dir, f"motion_{timestamp}.mp4")
         
-        print(f"📸 Recording for {self.record_seconds} seconds → {output_file}")
+        output_file = self.recorder.start(output_file)
+        self.state = RECORDING
+        self._event_start = now
+        self._event_end = now + self.record_seconds
+        _TRIGGERS.inc(camera=self._camera_label)
         
-        # Record for specified duration
-        self.recorder.record_duration(self.record_seconds)
+        print(f"📸 Recording → {output_file}")
         
-        print("✅ Motion recording complete.")
+    def _finish_event(self):
+        """Close the current clip and return to idle."""
+        output_file, frame_count = self.recorder.stop()
+        self.state = IDLE
+        self.event_count += 1
+        
+        if self.event_log is not None:
+            self.event_log.append({
+                "file": output_file,
+                "start": self._event_start,
+                "end": self._last_frame_time,
+                "frames": frame_count,
+            })
+        
+        print(f"✅ Motion recording complete: {frame_count} frames → {output_file}")
+        
+    def _record_score(self, started, motion_score):
+        """Update the scoring metrics after a score that began at ``started``."""
+        _SCORE_SECONDS.observe(time.perf_counter() - started, camera=self._camera_label)
+        _SCORES.observe(motion_score, camera=self._camera_label)
+        
+    def _find_motion_boxes(self, thresh):
+        """Find bounding boxes of motion areas in a motion mask."""
+        min_area = 50 / self.engine.scale  # Filter small noise
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        return [
+            self.engine.to_frame_coords(cv2.boundingRect(contour))
+            for contour in contours
+            if cv2.contourArea(contour) > min_area
+        ]
+        
+    def finish_event(self):
+        """Close the clip of the current event, if one is being recorded.
+        
+        For callers that drive process_frame themselves, when the frames
+        stop or jump, e.g. at the end of a replay or when a camera fails.
+        
+        Returns:
+            bool: True if an event was finished
+        """
+        if self.state == IDLE:
+            return False
+        self._finish_event()
+        return True
         
     def stop(self):
         """Stop monitoring."""
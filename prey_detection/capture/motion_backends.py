@@ -0,0 +1,212 @@
+"""Background models that turn a grayscale image into a binary motion mask."""
+import cv2
+import numpy as np
+
+class MotionBackend:
+    """Base class for motion backends.
+    
+    A backend receives the engine's blurred, downscaled grayscale image and
+    returns a binary (0/255) mask of moving pixels. The engine reuses its
+    buffers, so an image is only valid until the call after next, and the
+    returned mask may be a scratch buffer overwritten by the next call.
+    """
+    
+    name = None
+    
+    def apply(self, gray):
+        """Update the background model and get the motion mask.
+        
+        Args:
+            gray: Working grayscale image
+            
+        Returns:
+            numpy.ndarray: Binary motion mask, or None while the model warms up
+        """
+        raise NotImplementedError
+        
+    def reset(self):
+        """Discard the background model."""
+        
+class FrameDiffBackend(MotionBackend):
+    """Difference against the previous frame."""
+    
+    name = "frame_diff"
+    
+    def __init__(self, threshold_value=25):
+        """Initialize the backend.
+        
+        Args:
+            threshold_value (int): Per-pixel difference threshold
+        """
+        self.threshold_value = threshold_value
+        self.prev_gray = None
+        self._delta = None
+        
+    def apply(self, gray):
+        """Difference the image against the previous one."""
+        if self.prev_gray is None or self.prev_gray.shape != gray.shape:
+            self.prev_gray = gray
+            self._delta = np.empty_like(gray)
+            return None
+            
+        cv2.absdiff(self.prev_gray, gray, dst=self._delta)
+        self.prev_gray = gray
+        
+        cv2.threshold(self._delta, self.threshold_value, 255, cv2.THRESH_BINARY, dst=self._delta)
+        return self._delta
+        
+    def reset(self):
+        """Forget the previous frame."""
+        self.prev_gray = None
+        
+class RunningAverageBackend(MotionBackend):
+    """Difference against an exponential running average of past frames.
+    
+    Slow movers keep standing out against the average, and a brief flicker
+    is absorbed into it instead of triggering on its own.
+    """
+    
+    name = "running_average"
+    
+    def __init__(self, threshold_value=25, alpha=0.05):
+        """Initialize the backend.
+        
+        Args:
+            threshold_value (int): Per-pixel difference threshold
+            alpha (float): Weight of the newest frame in the average
+        """
+        self.threshold_value = threshold_value
+        self.alpha = alpha
+        self.average = None
+        self._background = None
+        self._delta = None
+        
+    def apply(self, gray):
+        """Difference the image against the running average, then update it."""
+        if self.average is None or self.average.shape != gray.shape:
+            self.average = gray.astype(np.float32)
+            self._background = np.empty_like(gray)
+            self._delta = np.empty_like(gray)
+            return None
+            
+        cv2.convertScaleAbs(self.average, dst=self._background)
+        cv2.absdiff(gray, self._background, dst=self._delta)
+        cv2.accumulateWeighted(gray, self.average, self.alpha)
+        
+        cv2.threshold(self._delta, self.threshold_value, 255, cv2.THRESH_BINARY, dst=self._delta)
+        return self._delta
+        
+    def reset(self):
+        """Forget the running average."""
+        self.average = None
+        
+class _SubtractorBackend(MotionBackend):
+    """Wrapper around an OpenCV BackgroundSubtractor."""
+    
+    def __init__(self, learning_rate=-1):
+        """Initialize the backend.
+        
+        Args:
+            learning_rate (float): Model learning rate (-1 lets OpenCV choose)
+        """
+        self.learning_rate = learning_rate
+        self.subtractor = None
+        self._foreground = None
+        
+    def apply(self, gray):
+        """Feed the image to the subtractor and get its foreground mask."""
+        if self.subtractor is None or self._foreground.shape != gray.shape:
+            self.subtractor = self._create()
+            self._foreground = np.empty_like(gray)
+            self.subtractor.apply(gray, self._foreground, self.learning_rate)
+            return None
+            
+        self.subtractor.apply(gray, self._foreground, self.learning_rate)
+        
+        # Shadows are marked 127; only count definite foreground
+        cv2.threshold(self._foreground, 200, 255, cv2.THRESH_BINARY, dst=self._foreground)
+        return self._foreground
+        
+    def reset(self):
+        """Discard the background model."""
+        self.subtractor = None
+        
+    def _create(self):
+        raise NotImplementedError
+        
+class MOG2Backend(_SubtractorBackend):
+    """OpenCV MOG2 Gaussian-mixture background subtraction."""
+    
+    name = "mog2"
+    
+    def __init__(self, history=500, var_threshold=16, detect_shadows=True, learning_rate=-1):
+        """Initialize the backend.
+        
+        Args:
+            history (int): Number of frames in the background model
+            var_threshold (float): Mahalanobis distance threshold
+            detect_shadows (bool): Mark shadows so they are not counted
+            learning_rate (float): Model learning rate (-1 lets OpenCV choose)
+        """
+        super().__init__(learning_rate)
+        self.history = history
+        self.var_threshold = var_threshold
+        self.detect_shadows = detect_shadows
+        
+    def _create(self):
+        return cv2.createBackgroundSubtractorMOG2(
+            history=self.history,
+            varThreshold=self.var_threshold,
+            detectShadows=self.detect_shadows
+        )
+        
+class KNNBackend(_SubtractorBackend):
+    """OpenCV k-nearest-neighbours background subtraction."""
+    
+    name = "knn"
+    
+    def __init__(self, history=500, dist2_threshold=400.0, detect_shadows=True, learning_rate=-1):
+        """Initialize the backend.
+        
+        Args:
+            history (int): Number of frames in the background model
+            dist2_threshold (float): Squared distance threshold
+            detect_shadows (bool): Mark shadows so they are not counted
+            learning_rate (float): Model learning rate (-1 lets OpenCV choose)
+        """
+        super().__init__(learning_rate)
+        self.history = history
+        self.dist2_threshold = dist2_threshold
+        self.detect_shadows = detect_shadows
+        
+    def _create(self):
+        return cv2.createBackgroundSubtractorKNN(
+            history=self.history,
+            dist2Threshold=self.dist2_threshold,
+            detectShadows=self.detect_shadows
+        )
+        
+BACKENDS = {
+    backend.name: backend
+    for backend in (FrameDiffBackend, RunningAverageBackend, MOG2Backend, KNNBackend)
+}
+
+def create_backend(name, threshold_value=25, **options):
+    """Create a motion backend by name.
+    
+    Args:
+        name (str): One of BACKENDS
+        threshold_value (int): Per-pixel threshold, for backends that use one
+        **options: Backend-specific options
+        
+    Returns:
+        MotionBackend: The backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown motion backend '{name}', expected one of {sorted(BACKENDS)}")
+        
+    backend_class = BACKENDS[name]
+    if backend_class in (FrameDiffBackend, RunningAverageBackend):
+        options.setdefault("threshold_value", threshold_value)
+        
+    return backend_class(**options)
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""Motion scoring on downscaled, masked frames."""
+import cv2
+import numpy as np
+from ..config.settings import MOTION_SETTINGS
+from .motion_backends import MotionBackend, create_backend
+
+class MotionEngine:
+    """Score motion between consecutive frames at a reduced resolution.
+    
+    Frames are converted to grayscale and reduced with ``downscale_levels``
+    pyramid steps (each halves width and height) before blurring and
+    being handed to a motion backend. Scores are scaled back to
+    full-resolution pixel counts, so ``frame_diff_threshold`` means the same
+    thing at every level.
+    
+    All intermediate images are preallocated and reused through ``dst``
+    outputs. The working image alternates between two buffers, so the one
+    returned by the previous call stays valid for the backend.
+    """
+    
+    def __init__(self, downscale_levels=None, blur_size=None, threshold_value=None,
+                 roi_polygons=None, exclude_polygons=None, backend=None, backend_options=None):
+        """Initialize the engine.
+        
+        Args:
+            downscale_levels (int): Number of pyrDown steps (0 = full resolution)
+            blur_size (tuple): Gaussian kernel size at full resolution
+            threshold_value (int): Per-pixel difference threshold
+            roi_polygons (list): Polygons (lists of (x, y) points in
+                full-resolution pixels) to watch; empty watches the whole frame
+            exclude_polygons (list): Polygons to ignore, e.g. a flickering window
+            backend (str or MotionBackend): Background model, by name or instance
+            backend_options (dict): Options for a backend given by name
+        """
+        if downscale_levels is None:
+            downscale_levels = MOTION_SETTINGS["downscale_levels"]
+        if downscale_levels < 0:
+            raise ValueError("downscale_levels must be >= 0")
+            
+        self.downscale_levels = downscale_levels
+        self.blur_size = tuple(blur_size or MOTION_SETTINGS["blur_size"])
+        self.threshold_value = (MOTION_SETTINGS["threshold_value"]
+                                if threshold_value is None else threshold_value)
+        self.roi_polygons = MOTION_SETTINGS["roi_polygons"] if roi_polygons is None else roi_polygons
+        self.exclude_polygons = (MOTION_SETTINGS["exclude_polygons"]
+                                 if exclude_polygons is None else exclude_polygons)
+                                 
+        # The pyramid already smooths, so the blur kernel shrinks with it
+        self.work_blur_size = tuple(
+            max(3, (k >> downscale_levels) | 1) for k in self.blur_size
+        )
+        
+        if backend is None:
+            backend = MOTION_SETTINGS["backend"]
+            if backend_options is None:
+                backend_options = MOTION_SETTINGS["backend_options"]
+        if not isinstance(backend, MotionBackend):
+            backend = create_backend(backend, self.threshold_value, **(backend_options or {}))
+        self.backend = backend
+        
+        self.mask = None
+        self.frame_size = None
+        self.work_size = None
+        self.scale = 1.0
+        
+        # Scratch images, allocated when the frame size is known
+        self._gray = None
+        self._pyramid = []
+        self._work = []
+        self._flip = 0
+        
+    def reset(self):
+        """Discard the backend's background model."""
+        self.backend.reset()
+        
+    def prepare(self, frame):
+        """Convert a frame to the blurred, downscaled grayscale working image.
+        
+        Args:
+            frame: BGR frame at full resolution
+            
+        Returns:
+            numpy.ndarray: Working image, valid until the next-but-one call
+        """
+        if self.frame_size != (frame.shape[1], frame.shape[0]):
+            self._configure(frame.shape[1], frame.shape[0])
+            
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        
+        src = self._gray
+        for level in self._pyramid:
+            cv2.pyrDown(src, dst=level)
+            src = level
+            
+        gray = self._work[self._flip]
+        self._flip ^= 1
+        cv2.GaussianBlur(src, self.work_blur_size, 0, dst=gray)
+        
+        return gray
+        
+    def score(self, frame):
+        """Calculate the motion score against the background model.
+        
+        Args:
+            frame: BGR frame at full resolution
+            
+        Returns:
+            tuple: (motion_score, thresh) - score in full-resolution pixels and
+                the binary motion mask at working resolution (None while the
+                backend is warming up). The mask is a scratch buffer that is
+                overwritten by the next call.
+        """
+        gray = self.prepare(frame)
+        
+        thresh = self.backend.apply(gray)
+        if thresh is None:
+            return 0, None
+            
+        if self.mask is not None:
+            cv2.bitwise_and(thresh, self.mask, dst=thresh)
+            
+        return int(cv2.countNonZero(thresh) * self.scale), thresh
+        
+    def to_frame_coords(self, rect):
+        """Scale a rectangle from working to full-resolution coordinates.
+        
+        Args:
+            rect (tuple): (x, y, w, h) at working resolution
+            
+        Returns:
+            tuple: (x, y, w, h) at full resolution
+        """
+        fx = self.frame_size[0] / self.work_size[0]
+        fy = self.frame_size[1] / self.work_size[1]
+        x, y, w, h = rect
+        return int(x * fx), int(y * fy), int(w * fx), int(h * fy)
+        
+    def _configure(self, width, height):
+        """Set up scratch images, score scale and ROI mask for a new frame size."""
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        
+        # pyrDown rounds odd sizes up
+        self._pyramid = []
+        work_width, work_height = width, height
+        for _ in range(self.downscale_levels):
+            work_width, work_height = (work_width + 1) // 2, (work_height + 1) // 2
+            self._pyramid.append(np.empty((work_height, work_width), dtype=np.uint8))
+            
+        self._work = [np.empty((work_height, work_width), dtype=np.uint8) for _ in range(2)]
+        
+        self.frame_size = (width, height)
+        self.work_size = (work_width, work_height)
+        self.scale = (width * height) / float(work_width * work_height)
+        self.mask = self._build_mask()
+        self.backend.reset()
+        
+    def _build_mask(self):
+        """Rasterize the ROI and exclusion polygons at working resolution."""
+        if not self.roi_polygons and not self.exclude_polygons:
+            return None
+            
+        fx = self.work_size[0] / self.frame_size[0]
+        fy = self.work_size[1] / self.frame_size[1]
+        
+        def scaled(polygons):
+            return [
+                np.round(np.asarray(p, dtype=np.float32) * (fx, fy)).astype(np.int32)
+                for p in polygons
+            ]
+            
+        width, height = self.work_size
+        if self.roi_polygons:
+            mask = np.zeros((height, width), dtype=np.uint8)
+            cv2.fillPoly(mask, scaled(self.roi_polygons), 255)
+        else:
+            mask = np.full((height, width), 255, dtype=np.uint8)
+            
+        if self.exclude_polygons:
+            cv2.fillPoly(mask, scaled(self.exclude_polygons), 0)
+            
+        return mask
\ No newline at end of file
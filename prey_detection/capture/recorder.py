@@ -4,41 +4,88 @@ import os
 import time
 import signal
 import sys
-from datetime import datetime
+import threading
+import numpy as np
 from ..config.settings import VIDEO_SETTINGS, PATHS
+from ..utils.metrics import METRICS
+from .buffers import PooledFrame
 from .camera import Camera
+from .clock import SYSTEM_CLOCK
+from .encoder import AsyncEncoder
+
+_WRITE_SECONDS = METRICS.histogram("recorder_write_seconds", "Time to write or queue a frame")
+_FRAMES = METRICS.counter("recorder_frames_total", "Frames written to clips")
+_DROPPED = METRICS.counter("recorder_frames_dropped_total", "Frames dropped by the encoder queue")
+_BYTES = METRICS.counter("recorder_bytes_written_total", "Bytes of finished clips")
+_CLIPS = METRICS.counter("recorder_clips_total", "Clips finished")
 
 class VideoRecorder:
     """Video recorder class for recording video from a camera."""
     
-    def __init__(self, output_dir=None, camera=None, resolution=None):
+    def __init__(self, output_dir=None, camera=None, resolution=None, pre_trigger_buffer=None,
+                 async_encoding=None, encoder_pool=None, clock=None, segment_seconds=None,
+                 segment_max_mb=None):
         """Initialize the recorder.
         
         Args:
             output_dir (str): Directory to save videos
-            camera (Camera): Camera instance to use
+            camera (Camera): Camera or other frame source (see sources.py)
             resolution (tuple): Resolution (width, height)
+            pre_trigger_buffer (PreTriggerBuffer): Frames to write at the start of each clip
+            async_encoding (bool): Encode frames on a separate thread
+            encoder_pool (EncoderPool): Shared encoder workers (implies async encoding)
+            clock (SystemClock or SimulatedClock): Clock for durations and file
+                names (default: the camera's clock)
+            segment_seconds (float): Split recordings into files of this many
+                seconds of video
+            segment_max_mb (float): Split recordings once a file reaches this size
         """
         self.output_dir = output_dir or PATHS["cat_videos_dir"]
         os.makedirs(self.output_dir, exist_ok=True)
         
         self.camera = camera or Camera()
-        if not isinstance(self.camera, Camera):
-            raise TypeError("camera must be an instance of Camera")
-            
+        if not callable(getattr(self.camera, "read_pooled", None)):
+            raise TypeError("camera must be a Camera or another frame source")
+        self._camera_label = str(self.camera.get_properties()["index"])
+        self.clock = clock or getattr(self.camera, "clock", None) or SYSTEM_CLOCK
+        
         self.resolution = resolution or VIDEO_SETTINGS["resolution"]
         self.fps = VIDEO_SETTINGS["fps"]
         self.codec = VIDEO_SETTINGS["codec"]
         self.extension = VIDEO_SETTINGS["extension"]
+        self.pre_trigger_buffer = pre_trigger_buffer
+        
+        # Asynchronous encoder settings
+        if async_encoding is None:
+            async_encoding = VIDEO_SETTINGS["async_encoding"] or encoder_pool is not None
+        self.async_encoding = async_encoding
+        self.encoder_pool = encoder_pool
+        self.encoder_queue_size = VIDEO_SETTINGS["encoder_queue_size"]
+        self.encoder_overflow = VIDEO_SETTINGS["encoder_overflow"]
+        
+        # Segmented recording settings
+        if segment_seconds is None:
+            segment_seconds = VIDEO_SETTINGS["segment_seconds"]
+        if segment_max_mb is None:
+            segment_max_mb = VIDEO_SETTINGS["segment_max_mb"]
+        self.segment_seconds = segment_seconds
+        self.segment_max_mb = segment_max_mb
+        self.segments = []
+        self._segment_frames = 0
+        self._base_file = None
+        self._release_threads = []
         
         self.output_file = None
         self.writer = None
+        self.encoder = None
+        self.encoder_stats = None
+        self._resize_buffer = None
         self.recording = False
         self.frame_count = 0
         
     def __enter__(self):
         """Context manager entry."""
-        if not self.camera.cap:
+        if not self.camera.is_open():
             self.camera.open()
         return self
         
@@ -59,30 +106,46 @@ class VideoRecorder:
             raise RuntimeError("Already recording")
             
         if not output_file:
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            timestamp = self.clock.now().strftime("%Y-%m-%d_%H-%M-%S")
             output_file = os.path.join(self.output_dir, f"video_{timestamp}{self.extension}")
             
+        # Segments are named <name>_0000<ext>, <name>_0001<ext>, ...
+        self.segments = []
+        self._segment_frames = 0
+        self._base_file = output_file
+        if self.segmented:
+            output_file = self._segment_path(0)
+        self.segments.append(output_file)
         self.output_file = output_file
         
         # Create the video writer
-        fourcc = cv2.VideoWriter_fourcc(*self.codec)
-        self.writer = cv2.VideoWriter(
-            self.output_file, 
-            fourcc, 
-            self.fps, 
-            self.resolution
-        )
+        self.writer = self._open_writer(self.output_file)
         
+        if self.async_encoding:
+            self.encoder = AsyncEncoder(
+                self.writer,
+                self.resolution,
+                queue_size=self.encoder_queue_size,
+                overflow=self.encoder_overflow,
+                pool=self.encoder_pool
+            )
+            
         self.recording = True
         self.frame_count = 0
         
+        # Write the frames leading up to the event first. The buffer reuses
+        # its slots, so queued frames must be copies.
+        if self.pre_trigger_buffer is not None:
+            for frame in self.pre_trigger_buffer.drain():
+                self.write_frame(frame.copy() if self.encoder else frame)
+                
         return self.output_file
         
     def write_frame(self, frame):
         """Write a frame to the video.
         
         Args:
-            frame: The frame to write
+            frame: The frame to write (numpy.ndarray or PooledFrame)
             
         Returns:
             int: Current frame count
@@ -90,56 +153,189 @@ class VideoRecorder:
         if not self.recording:
             raise RuntimeError("Not recording")
             
-        # Resize if necessary
+        started = time.perf_counter() if METRICS.enabled else None
+        
+        if self.segmented and self._segment_full():
+            self._rotate()
+            
+        # Resizing and encoding happen on the encoder thread
+        if self.encoder is not None:
+            queued = self.encoder.submit(frame)
+            if queued:
+                self.frame_count += 1
+                self._segment_frames += 1
+            if started is not None:
+                self._record_write(started, queued)
+            return self.frame_count
+            
+        if isinstance(frame, PooledFrame):
+            frame = frame.array
+            
+        # Resize if necessary, reusing one output buffer
         if frame.shape[1] != self.resolution[0] or frame.shape[0] != self.resolution[1]:
-            frame = cv2.resize(frame, self.resolution)
+            if self._resize_buffer is None:
+                self._resize_buffer = np.empty(
+                    (self.resolution[1], self.resolution[0]) + frame.shape[2:], dtype=frame.dtype
+                )
+            frame = cv2.resize(frame, self.resolution, dst=self._resize_buffer)
             
         self.writer.write(frame)
         self.frame_count += 1
+        self._segment_frames += 1
         
+        if started is not None:
+            self._record_write(started, True)
+            
         return self.frame_count
         
     def stop(self):
         """Stop recording.
         
         Returns:
-            tuple: (output_file, frame_count)
+            tuple: (output_file, frame_count) - for segmented recordings the
+                first segment and the frames in all segments (see ``segments``)
         """
         if not self.recording:
             return None, 0
             
         self.recording = False
-        if self.writer:
+        if self.encoder:
+            # Flushes queued frames and releases the writer
+            self.encoder_stats = self.encoder.close()
+            self.encoder = None
+            self.writer = None
+        elif self.writer:
             self.writer.release()
             self.writer = None
             
-        return self.output_file, self.frame_count
+        # Wait for earlier segments to be finalized
+        for thread in self._release_threads:
+            thread.join()
+        self._release_threads = []
         
-    def record_duration(self, duration, show_preview=True):
+        if METRICS.enabled:
+            _CLIPS.inc(camera=self._camera_label)
+            size = sum(os.path.getsize(path) for path in self.segments if os.path.exists(path))
+            _BYTES.inc(size, camera=self._camera_label)
+            
+        return self.segments[0], self.frame_count
+        
+    @property
+    def segmented(self):
+        """Whether recordings are split into several files."""
+        return bool(self.segment_seconds or self.segment_max_mb)
+        
+    def _open_writer(self, path):
+        """Create a video writer for one file.
+        
+        The directory is created again if needed, since retention may
+        have removed it while it was empty.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+        fourcc = cv2.VideoWriter_fourcc(*self.codec)
+        writer = cv2.VideoWriter(path, fourcc, self.fps, self.resolution)
+        if not writer.isOpened():
+            raise RuntimeError(f"Could not open video writer: {path}")
+        return writer
+        
+    def _segment_path(self, index):
+        """Path of segment ``index`` of the current recording."""
+        stem, ext = os.path.splitext(self._base_file)
+        return f"{stem}_{index:04d}{ext or self.extension}"
+        
+    def _segment_full(self):
+        """Check whether the current segment has reached its length or size."""
+        if not self._segment_frames:
+            return False
+            
+        # Duration is counted in frames, so it follows the video, not the clock
+        if self.segment_seconds and self._segment_frames >= self.segment_seconds * self.fps:
+            return True
+            
+        # Checking the size is a syscall; do it about once a second
+        if self.segment_max_mb and self._segment_frames % max(int(self.fps), 1) == 0:
+            try:
+                size = os.path.getsize(self.output_file)
+            except OSError:
+                return False
+            return size >= self.segment_max_mb * 1024 * 1024
+            
+        return False
+        
+    def _rotate(self):
+        """Continue the recording in a new segment file.
+        
+        No frame is dropped. With async encoding the switch is queued
+        behind the frames already submitted and happens on the encoder
+        thread; otherwise the new file is opened here and the old one is
+        finalized on a background thread, so the capture loop never waits
+        for the muxer to flush.
+        """
+        path = self._segment_path(len(self.segments))
+        self.segments.append(path)
+        self.output_file = path
+        self._segment_frames = 0
+        
+        if self.encoder is not None:
+            self.encoder.rotate(lambda: self._open_writer(path))
+            return
+            
+        old_writer = self.writer
+        self.writer = self._open_writer(path)
+        
+        thread = threading.Thread(target=old_writer.release, daemon=True)
+        thread.start()
+        self._release_threads = [t for t in self._release_threads if t.is_alive()]
+        self._release_threads.append(thread)
+        
+    def _record_write(self, started, written):
+        """Update the write metrics after a write that began at ``started``."""
+        _WRITE_SECONDS.observe(time.perf_counter() - started, camera=self._camera_label)
+        if written:
+            _FRAMES.inc(camera=self._camera_label)
+        else:
+            _DROPPED.inc(camera=self._camera_label)
+            
+    def get_encoder_stats(self):
+        """Get stats for the asynchronous encoder.
+        
+        Returns:
+            dict: Live stats while recording, otherwise those of the last
+                recording (None if async encoding was never used)
+        """
+        if self.encoder is not None:
+            return self.encoder.get_stats()
+        return self.encoder_stats
+        
+    def record_duration(self, duration, show_preview=True, output_file=None):
         """Record for a specific duration.
         
         Args:
             duration (float): Duration in seconds
             show_preview (bool): Show preview window
+            output_file (str): Path to save the video
             
         Returns:
             tuple: (output_file, frame_count)
         """
-        if not self.camera.cap or not self.camera.cap.isOpened():
+        if not self.camera.is_open():
             self.camera.open()
             
-        self.start()
+        self.start(output_file)
         
-        start_time = time.time()
+        start_time = self.clock.time()
         preview_name = "Recording" if show_preview else None
         
-        while time.time() - start_time < duration:
+        while self.clock.time() - start_time < duration:
             frame = self.camera.read()
             
             # Add recording indicator
             cv2.putText(
                 frame, 
-                f"REC {self.frame_count} | {int(time.time() - start_time)}s", 
+                f"REC {self.frame_count} | {int(self.clock.time() - start_time)}s", 
                 (10, 30), 
                 cv2.FONT_HERSHEY_SIMPLEX, 
                 0.7, 
@@ -168,7 +364,7 @@ class VideoRecorder:
         Returns:
             tuple: (output_file, frame_count)
         """
-        if not self.camera.cap or not self.camera.cap.isOpened():
+        if not self.camera.is_open():
             self.camera.open()
             
         recording = False
@@ -238,7 +434,7 @@ class VideoRecorder:
                 # Take screenshot
                 screenshot_dir = os.path.join(self.output_dir, "screenshots")
                 os.makedirs(screenshot_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                timestamp = self.clock.now().strftime("%Y-%m-%d_%H-%M-%S")
                 screenshot_path = os.path.join(screenshot_dir, f"screenshot_{timestamp}.jpg")
                 cv2.imwrite(screenshot_path, self.camera.read())
                 print(f"Screenshot saved: {screenshot_path}")
@@ -257,7 +453,7 @@ class VideoRecorder:
             return key_handler(key)
             
         try:
-            print(f"Camera: {self.camera.camera_index}")
+            print(f"Camera: {self.camera.get_properties()['index']}")
             print(f"Resolution: {self.resolution[0]}x{self.resolution[1]}")
             print(f"FPS: {self.fps}")
             print("\nCommands:")
@@ -0,0 +1,406 @@
+"""Frame sources that can stand in for a Camera."""
+import cv2
+import os
+import time
+import numpy as np
+from ..config.settings import VIDEO_SETTINGS
+from ..utils.metrics import METRICS
+from ..utils.scenes import SCENE_PATTERNS, draw_test_scene
+from .clock import SYSTEM_CLOCK
+
+_READ_SECONDS = METRICS.histogram("camera_read_seconds", "Time to read a frame")
+_FRAMES = METRICS.counter("camera_frames_total", "Frames read")
+_DROPPED = METRICS.counter("camera_frames_dropped_total", "Frames grabbed but never read")
+
+class FrameSource:
+    """Base class for anything that delivers frames like a Camera.
+    
+    Subclasses implement ``open``, ``close``, ``is_open`` and
+    ``_next_frame``. Sources that are not live can be paced to their frame
+    rate with ``realtime``, or read as fast as possible. Pacing uses the
+    source's clock, so a realtime source on a SimulatedClock runs at full
+    speed while the clock follows the frame timestamps.
+    """
+    
+    threaded = False
+    
+    def __init__(self, realtime=False, clock=None):
+        """Initialize the source.
+        
+        Args:
+            realtime (bool): Deliver frames at the source's frame rate
+            clock (SystemClock or SimulatedClock): Clock for pacing
+        """
+        self.realtime = realtime
+        self.clock = clock or SYSTEM_CLOCK
+        self.width = None
+        self.height = None
+        self.fps = VIDEO_SETTINGS["fps"]
+        
+        self._frames_read = 0
+        self._started = None
+        self._dropped_reported = 0
+        
+    def __enter__(self):
+        """Context manager entry point."""
+        self.open()
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
+        
+    def open(self):
+        """Open the source."""
+        raise NotImplementedError
+        
+    def close(self):
+        """Close the source."""
+        raise NotImplementedError
+        
+    def is_open(self):
+        """Whether the source is open."""
+        raise NotImplementedError
+        
+    def read(self, out=None):
+        """Read the next frame.
+        
+        Args:
+            out (numpy.ndarray): Optional preallocated array to read into
+            
+        Returns:
+            numpy.ndarray: The frame (``out`` when given)
+        """
+        if not self.is_open():
+            raise RuntimeError("Source is not open")
+            
+        started = time.perf_counter() if METRICS.enabled else None
+        ret, frame = self._read_frame(out)
+        if started is not None:
+            self._record_read(started, ret)
+            
+        if not ret:
+            raise RuntimeError("No more frames in source")
+            
+        return frame
+        
+    def read_pooled(self, pool):
+        """Read a frame into a buffer borrowed from a frame pool.
+        
+        The pool is configured from the first frame if needed.
+        
+        Args:
+            pool (FramePool): Pool to borrow the buffer from
+            
+        Returns:
+            PooledFrame: The frame; release it when done
+        """
+        if not pool.configured:
+            frame = self.read()
+            pool.configure(frame.shape, frame.dtype)
+            pooled = pool.acquire()
+            np.copyto(pooled.array, frame)
+            return pooled
+            
+        pooled = pool.acquire()
+        try:
+            self.read(out=pooled.array)
+        except Exception:
+            pooled.release()
+            raise
+            
+        return pooled
+        
+    def read_continuous(self, callback=None, window_name=None, exit_key='q'):
+        """Read frames continuously until exit_key is pressed.
+        
+        Args:
+            callback (callable): Function to call with each frame
+            window_name (str): Window name for display
+            exit_key (str): Key to exit the loop
+        """
+        if not self.is_open():
+            raise RuntimeError("Source is not open")
+            
+        try:
+            while True:
+                ret, frame = self._read_frame()
+                
+                if not ret:
+                    print("Error: Could not read frame")
+                    break
+                    
+                if callback:
+                    result = callback(frame)
+                    # If callback returns False, break the loop
+                    if result is False:
+                        break
+                        
+                if window_name:
+                    cv2.imshow(window_name, frame)
+                    
+                    # Check for key press
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == ord(exit_key):
+                        break
+        finally:
+            if window_name:
+                cv2.destroyWindow(window_name)
+                
+    def get_properties(self):
+        """Get source properties."""
+        return {
+            "index": None,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "threaded": self.threaded,
+        }
+        
+    def get_stats(self):
+        """Get read counters.
+        
+        Returns:
+            dict: Same keys as Camera.get_stats
+        """
+        return {
+            "grabbed": self._frames_read,
+            "delivered": self._frames_read,
+            "dropped": 0,
+            "buffered": 0,
+            "capacity": 0,
+        }
+        
+    def _read_frame(self, out=None):
+        """Read the next frame, pacing it in realtime mode.
+        
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read
+        """
+        if self.realtime:
+            self._wait_for_frame()
+            
+        ret, frame = self._next_frame(out)
+        if ret:
+            self._frames_read += 1
+            
+        return ret, frame
+        
+    def _record_read(self, started, ret):
+        """Update the read metrics after a read that began at ``started``."""
+        camera = str(self.get_properties()["index"])
+        _READ_SECONDS.observe(time.perf_counter() - started, camera=camera)
+        if ret:
+            _FRAMES.inc(camera=camera)
+            
+        dropped = self.get_stats()["dropped"]
+        if dropped > self._dropped_reported:
+            _DROPPED.inc(dropped - self._dropped_reported, camera=camera)
+            self._dropped_reported = dropped
+            
+    def _wait_for_frame(self):
+        """Sleep until the next frame is due."""
+        now = self.clock.monotonic()
+        if self._started is None:
+            self._started = now
+            
+        delay = self._started + self._frames_read / self.fps - now
+        if delay > 0:
+            self.clock.sleep(delay)
+            
+    def _reset_counters(self):
+        """Restart frame counting and pacing."""
+        self._frames_read = 0
+        self._started = None
+        
+    def _next_frame(self, out):
+        """Produce the next frame. Returns (ret, frame)."""
+        raise NotImplementedError
+        
+class VideoFileSource(FrameSource):
+    """Replay a video file as if it were a camera."""
+    
+    def __init__(self, path, realtime=False, loop=False, clock=None):
+        """Initialize the source.
+        
+        Args:
+            path (str): Path to the video file
+            realtime (bool): Play at the file's frame rate instead of as
+                fast as frames can be decoded
+            loop (bool): Start over at the end of the file
+            clock (SystemClock or SimulatedClock): Clock for realtime pacing
+        """
+        super().__init__(realtime, clock)
+        self.path = path
+        self.loop = loop
+        self.cap = None
+        self.frame_count = 0
+        self.loops = 0
+        self._position = 0
+        
+    def open(self):
+        """Open the video file."""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Video file not found: {self.path}")
+            
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video: {self.path}")
+            
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or VIDEO_SETTINGS["fps"]
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        self.loops = 0
+        self._position = 0
+        self._reset_counters()
+        return self
+        
+    def close(self):
+        """Close the video file."""
+        if self.cap and self.cap.isOpened():
+            self.cap.release()
+            
+    def is_open(self):
+        """Whether the video file is open."""
+        return self.cap is not None and self.cap.isOpened()
+        
+    def get_properties(self):
+        """Get source properties."""
+        properties = super().get_properties()
+        properties["index"] = self.path
+        properties["frame_count"] = self.frame_count
+        return properties
+        
+    def _next_frame(self, out):
+        """Decode the next frame, rewinding at the end when looping."""
+        ret, frame = self.cap.read(out)
+        
+        # Only rewind if the last pass produced frames, so an unreadable
+        # file can't loop forever
+        if not ret and self.loop and self._position > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            self._position = 0
+            ret, frame = self.cap.read(out)
+            
+        if not ret:
+            return False, None
+            
+        self._position += 1
+        
+        # OpenCV reallocates if the array doesn't match the frame
+        if out is not None and frame is not out:
+            np.copyto(out, frame)
+            frame = out
+            
+        return True, frame
+        
+class SyntheticSource(FrameSource):
+    """Generate a moving-shapes test scene without any camera or file.
+    
+    Frames are drawn straight into the caller's buffer, so reading costs
+    no decoding and no allocation. ``motion_periods`` makes the shapes
+    move only during given frame ranges, which gives motion detection
+    quiet stretches to settle and clear events to trigger on.
+    """
+    
+    def __init__(self, width=None, height=None, fps=None, num_frames=None, pattern="orbit",
+                 motion_periods=None, noise=0, realtime=False, seed=0, clock=None):
+        """Initialize the source.
+        
+        Args:
+            width (int): Frame width (default: VIDEO_SETTINGS resolution)
+            height (int): Frame height (default: VIDEO_SETTINGS resolution)
+            fps (float): Frame rate used for realtime pacing and properties
+            num_frames (int): Frames to produce before the source runs dry
+                (None for no end)
+            pattern (str): Scene pattern, one of SCENE_PATTERNS
+            motion_periods (list): (start, end) frame ranges during which the
+                shapes move; None keeps them moving all the time
+            noise (int): Amplitude of random per-pixel sensor noise
+            realtime (bool): Deliver frames at ``fps``
+            seed (int): Seed for the noise generator
+            clock (SystemClock or SimulatedClock): Clock for realtime pacing
+        """
+        super().__init__(realtime, clock)
+        if pattern not in SCENE_PATTERNS:
+            raise ValueError(f"pattern must be one of {SCENE_PATTERNS}")
+            
+        default_width, default_height = VIDEO_SETTINGS["resolution"]
+        self.width = width or default_width
+        self.height = height or default_height
+        self.fps = fps or VIDEO_SETTINGS["fps"]
+        self.num_frames = num_frames
+        self.pattern = pattern
+        self.motion_periods = motion_periods
+        self.noise = noise
+        self.seed = seed
+        
+        self._open = False
+        self._index = 0
+        self._scene_index = 0
+        self._noise = None
+        
+    def open(self):
+        """Start generating frames from the beginning."""
+        self._open = True
+        self._index = 0
+        self._scene_index = 0
+        self._reset_counters()
+        
+        if self.noise:
+            cv2.setRNGSeed(self.seed)
+            self._noise = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            
+        return self
+        
+    def close(self):
+        """Stop generating frames."""
+        self._open = False
+        
+    def is_open(self):
+        """Whether the source is open."""
+        return self._open
+        
+    def get_properties(self):
+        """Get source properties."""
+        properties = super().get_properties()
+        properties["index"] = "synthetic"
+        properties["frame_count"] = self.num_frames
+        return properties
+        
+    def is_moving(self, index):
+        """Whether the shapes move on a given frame.
+        
+        Args:
+            index (int): Frame number
+            
+        Returns:
+            bool: True inside a motion period (or when there are none)
+        """
+        if self.motion_periods is None:
+            return True
+        return any(start <= index < end for start, end in self.motion_periods)
+        
+    def _next_frame(self, out):
+        """Draw the next frame of the scene."""
+        if self.num_frames is not None and self._index >= self.num_frames:
+            return False, None
+            
+        if out is None:
+            out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            
+        if self._index > 0 and self.is_moving(self._index):
+            self._scene_index += 1
+        self._index += 1
+        
+        period = self.num_frames or 200
+        draw_test_scene(out, self._scene_index, period, self.pattern)
+        
+        if self._noise is not None:
+            cv2.randu(self._noise, 0, self.noise)
+            cv2.add(out, self._noise, dst=out)
+            
+        return True, out
\ No newline at end of file
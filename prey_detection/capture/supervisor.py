@@ -0,0 +1,406 @@
+"""Run several camera → motion detector pipelines in one process."""
+import json
+import os
+import threading
+import time
+from ..config.settings import PATHS, SUPERVISOR_SETTINGS
+from .camera import Camera
+from .clock import SYSTEM_CLOCK
+from .encoder import EncoderPool
+from .motion import MotionDetector
+from .motion_engine import MotionEngine
+from .sources import SyntheticSource, VideoFileSource
+
+# Per-camera motion settings that map onto MotionDetector attributes
+DETECTOR_KEYS = (
+    "frame_diff_threshold",
+    "record_seconds",
+    "max_record_seconds",
+    "post_roll_seconds",
+    "motion_check_interval",
+)
+
+# Per-camera motion settings passed to the MotionEngine
+ENGINE_KEYS = (
+    "downscale_levels",
+    "blur_size",
+    "threshold_value",
+    "roi_polygons",
+    "exclude_polygons",
+    "backend",
+    "backend_options",
+)
+
+def load_config(path=None):
+    """Load a supervisor config file.
+    
+    The file is JSON, or YAML when it ends in .yaml/.yml and PyYAML is
+    installed. It holds global settings plus a ``cameras`` list, e.g.::
+    
+        {
+            "encoder_workers": 2,
+            "max_motion_fps": 30,
+            "cameras": [
+                {"name": "cat_door", "source": {"type": "camera", "index": 0},
+                 "motion": {"frame_diff_threshold": 80000}},
+                {"name": "garden", "source": {"type": "file", "path": "garden.mp4"}}
+            ]
+        }
+        
+    Args:
+        path (str): Config file (default: SUPERVISOR_SETTINGS["config_path"])
+        
+    Returns:
+        dict: The config
+    """
+    path = path or SUPERVISOR_SETTINGS["config_path"]
+    
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+            
+    if not config.get("cameras"):
+        raise ValueError(f"No cameras configured in {path}")
+        
+    names = [camera.get("name") for camera in config["cameras"]]
+    if None in names or len(set(names)) != len(names):
+        raise ValueError("Every camera needs a unique name")
+        
+    return config
+    
+def create_source(source, clock=None):
+    """Create a frame source from its config.
+    
+    Args:
+        source (dict): {"type": "camera", "index": 0},
+            {"type": "file", "path": "clip.mp4"} or {"type": "synthetic"};
+            a bare int or string is treated as a camera index or file path.
+            File sources play in realtime and loop unless "realtime" or
+            "loop" is false; other keys are passed to SyntheticSource
+        clock (SystemClock or SimulatedClock): Clock for the source
+            
+    Returns:
+        Camera or FrameSource: The source (not opened yet)
+    """
+    if isinstance(source, int):
+        source = {"type": "camera", "index": source}
+    elif isinstance(source, str):
+        source = {"type": "file", "path": source}
+        
+    options = dict(source)
+    source_type = options.pop("type", "camera")
+    
+    if source_type == "camera":
+        return Camera(camera_index=options.get("index"), threaded=options.get("threaded", True),
+                      clock=clock)
+    if source_type == "file":
+        return VideoFileSource(
+            options["path"],
+            realtime=options.get("realtime", True),
+            loop=options.get("loop", True),
+            clock=clock
+        )
+    if source_type == "synthetic":
+        options.setdefault("realtime", True)
+        return SyntheticSource(clock=clock, **options)
+                      
+    raise ValueError(f"Unknown source type '{source_type}'")
+    
+class FrameBudget:
+    """Token bucket that limits motion checks per second across all cameras."""
+    
+    def __init__(self, max_fps, clock=None):
+        """Initialize the budget.
+        
+        Args:
+            max_fps (float): Motion checks per second for all cameras
+                together (0 or None for no limit)
+            clock (SystemClock or SimulatedClock): Clock for refilling tokens
+        """
+        self.max_fps = max_fps or 0
+        self.clock = clock or SYSTEM_CLOCK
+        self._tokens = float(self.max_fps)
+        self._updated = self.clock.monotonic()
+        self._lock = threading.Lock()
+        
+    def try_acquire(self):
+        """Take one token if available.
+        
+        Returns:
+            bool: True if the caller may run a motion check
+        """
+        if self.max_fps <= 0:
+            return True
+            
+        with self._lock:
+            now = self.clock.monotonic()
+            self._tokens = min(self.max_fps, self._tokens + (now - self._updated) * self.max_fps)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+                
+            return False
+            
+class CameraPipeline:
+    """One camera and motion detector running on their own thread.
+    
+    The camera grabs frames on its own background thread; this pipeline's
+    thread scores them and feeds the recorder. When the source fails, the
+    pipeline restarts it with exponential backoff.
+    """
+    
+    def __init__(self, name, config, encoder_pool=None, budget=None,
+                 initial_backoff=None, max_backoff=None, clock=None):
+        """Initialize the pipeline.
+        
+        Args:
+            name (str): Camera name, used for the output directory
+            config (dict): Camera config (source, motion, output_dir)
+            encoder_pool (EncoderPool): Shared encoder workers
+            budget (FrameBudget): Shared motion check budget
+            initial_backoff (float): First restart delay in seconds
+            max_backoff (float): Longest restart delay in seconds
+            clock (SystemClock or SimulatedClock): Clock for the source, the
+                detector and timing restarts
+        """
+        self.name = name
+        self.config = config
+        self.encoder_pool = encoder_pool
+        self.clock = clock or SYSTEM_CLOCK
+        self.budget = budget or FrameBudget(0)
+        self.initial_backoff = initial_backoff or SUPERVISOR_SETTINGS["restart_initial_delay"]
+        self.max_backoff = max_backoff or SUPERVISOR_SETTINGS["restart_max_delay"]
+        self.output_dir = config.get("output_dir") or os.path.join(PATHS["motion_videos_dir"], name)
+        
+        self.detector = None
+        self.status = "stopped"
+        self.restarts = 0
+        self.last_error = None
+        self.frames = 0
+        self.skipped_checks = 0
+        
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        """Start the pipeline thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}", daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """Ask the pipeline to stop after the current frame."""
+        self._stop.set()
+        
+    def join(self, timeout=None):
+        """Wait for the pipeline thread to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            
+    def is_alive(self):
+        """Whether the pipeline thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+        
+    def get_status(self):
+        """Get the pipeline's status.
+        
+        Returns:
+            dict: State, counters and last error
+        """
+        status = {
+            "name": self.name,
+            "status": self.status,
+            "frames": self.frames,
+            "skipped_checks": self.skipped_checks,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+        }
+        if self.detector is not None:
+            status["events"] = self.detector.event_count
+            status["camera"] = self.detector.camera.get_stats()
+            
+        return status
+        
+    def _run(self):
+        """Run the pipeline, restarting it with backoff when it fails."""
+        failures = 0
+        
+        while not self._stop.is_set():
+            started = self.clock.monotonic()
+            try:
+                self.status = "running"
+                self._run_once()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️  Camera {self.name} failed: {e}")
+                
+            if self._stop.is_set():
+                break
+                
+            # A pipeline that ran for a while starts over with a short delay
+            if self.clock.monotonic() - started > self.max_backoff:
+                failures = 0
+            failures += 1
+            
+            delay = min(self.initial_backoff * 2 ** (failures - 1), self.max_backoff)
+            self.status = "restarting"
+            self.restarts += 1
+            self._stop.wait(delay)
+            
+        self.status = "stopped"
+        
+    def _run_once(self):
+        """Open the source and process frames until it fails or we stop."""
+        camera = create_source(self.config.get("source", 0), clock=self.clock)
+        detector = MotionDetector(
+            output_dir=self.output_dir,
+            camera=camera,
+            encoder_pool=self.encoder_pool
+        )
+        self._configure_detector(detector)
+        self.detector = detector
+        
+        camera.open()
+        try:
+            while not self._stop.is_set():
+                frame = camera.read_pooled(detector.frame_pool)
+                try:
+                    check_motion = self.budget.try_acquire()
+                    if not check_motion:
+                        self.skipped_checks += 1
+                    detector.process_frame(frame, check_motion=check_motion)
+                finally:
+                    frame.release()
+                self.frames += 1
+        finally:
+            detector.finish_event()
+            camera.close()
+            
+    def _configure_detector(self, detector):
+        """Apply per-camera motion settings to a detector."""
+        motion = self.config.get("motion", {})
+        
+        for key in DETECTOR_KEYS:
+            if key in motion:
+                setattr(detector, key, motion[key])
+                
+        engine_options = {key: motion[key] for key in ENGINE_KEYS if key in motion}
+        if engine_options:
+            detector.engine = MotionEngine(**engine_options)
+            
+class CameraSupervisor:
+    """Run a pipeline per configured camera with shared encoders and budget."""
+    
+    def __init__(self, config, clock=None):
+        """Initialize the supervisor.
+        
+        Args:
+            config (dict): Config as returned by load_config
+            clock (SystemClock or SimulatedClock): Clock shared by all pipelines
+        """
+        self.config = config
+        self.clock = clock or SYSTEM_CLOCK
+        self.encoder_pool = EncoderPool(
+            workers=config.get("encoder_workers", SUPERVISOR_SETTINGS["encoder_workers"])
+        )
+        self.budget = FrameBudget(
+            config.get("max_motion_fps", SUPERVISOR_SETTINGS["max_motion_fps"]),
+            clock=self.clock
+        )
+        
+        backoff = config.get("restart_backoff", {})
+        self.pipelines = [
+            CameraPipeline(
+                camera["name"],
+                camera,
+                encoder_pool=self.encoder_pool,
+                budget=self.budget,
+                initial_backoff=backoff.get("initial"),
+                max_backoff=backoff.get("max"),
+                clock=self.clock
+            )
+            for camera in config["cameras"]
+        ]
+        
+    @classmethod
+    def from_file(cls, path=None):
+        """Create a supervisor from a config file.
+        
+        Args:
+            path (str): Config file path
+            
+        Returns:
+            CameraSupervisor: The supervisor
+        """
+        return cls(load_config(path))
+        
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+        
+    def start(self):
+        """Start all pipelines."""
+        for pipeline in self.pipelines:
+            pipeline.start()
+            
+    def stop(self, timeout=5.0):
+        """Stop all pipelines and the shared encoders.
+        
+        The encoder pool is left running if a pipeline is still alive
+        after the timeout, since that pipeline's clip may still be queued.
+        
+        Args:
+            timeout (float): Seconds to wait for each pipeline
+        """
+        for pipeline in self.pipelines:
+            pipeline.stop()
+        for pipeline in self.pipelines:
+            pipeline.join(timeout)
+            
+        alive = [pipeline.name for pipeline in self.pipelines if pipeline.is_alive()]
+        if alive:
+            print(f"⚠️  Cameras still stopping, encoders left running: {', '.join(alive)}")
+            return
+            
+        self.encoder_pool.close()
+        
+    def get_status(self):
+        """Get the status of every pipeline.
+        
+        Returns:
+            list: One status dict per camera
+        """
+        return [pipeline.get_status() for pipeline in self.pipelines]
+        
+    def run(self, duration=None, status_interval=10.0):
+        """Run until interrupted or for a fixed duration, printing status.
+        
+        Args:
+            duration (float): Seconds to run (None runs until Ctrl-C)
+            status_interval (float): Seconds between status lines
+        """
+        self.start()
+        started = time.monotonic()
+        
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                time.sleep(min(status_interval, duration or status_interval))
+                for status in self.get_status():
+                    print(
+                        f"{status['name']}: {status['status']} | frames {status['frames']} | "
+                        f"events {status.get('events', 0)} | restarts {status['restarts']}"
+                    )
+        except KeyboardInterrupt:
+            print("\n👋 Exiting on keyboard interrupt.")
+        finally:
+            self.stop()
\ No newline at end of file
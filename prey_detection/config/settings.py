@@ -11,6 +11,11 @@ VIDEO_SETTINGS = {
     "extension": ".mp4",
     "fps": 20.0,
     "resolution": (640, 480),
+    "async_encoding": False,      # Encode on a separate thread
+    "encoder_queue_size": 32,     # Frames waiting to be encoded
+    "encoder_overflow": "block",  # "block", "drop" or "degrade" when the queue is full
+    "segment_seconds": None,      # Start a new file every N seconds (None: one file)
+    "segment_max_mb": None,       # Start a new file once a segment reaches N MB
 }
 
 # File paths
@@ -26,14 +31,23 @@ PATHS = {
 # Create directories if they don't exist
 for path in PATHS.values():
     os.makedirs(path, exist_ok=True)
-
+    
 # Motion detection settings
 MOTION_SETTINGS = {
-    "record_seconds": 15,
+    "record_seconds": 15,           # Clip keeps recording this long after the last motion
+    "max_record_seconds": 120,      # Hard limit on the length of one clip
+    "post_roll_seconds": 3,         # Extra footage after the last motion before closing
     "frame_diff_threshold": 100000,
-    "motion_check_interval": 1,
+    "motion_check_interval": 0,     # Seconds between motion checks (0 = every frame)
     "blur_size": (21, 21),
     "threshold_value": 25,
+    "backend": "frame_diff",        # "frame_diff", "running_average", "mog2" or "knn"
+    "backend_options": {},          # Extra options for the backend, e.g. {"alpha": 0.05}
+    "downscale_levels": 1,          # pyrDown steps before scoring (each halves the size)
+    "roi_polygons": [],             # Polygons to watch, in full-resolution pixels
+    "exclude_polygons": [],         # Polygons to ignore, e.g. a flickering window
+    "pre_trigger_seconds": 3,       # Seconds of footage kept from before a trigger
+    "pre_trigger_max_mb": 64,       # Hard memory cap for the pre-trigger buffer
 }
 
 # Detection model settings
@@ -46,4 +60,113 @@ MODEL_SETTINGS = {
 # Camera settings
 CAMERA_SETTINGS = {
     "default_index": 0,
+    "threaded": False,          # Grab frames on a background thread
+    "buffer_size": 4,           # Preallocated frames in the capture ring
+    "overflow": "drop_oldest",  # "drop_oldest" or "block" when the ring is full
+    "read_policy": "latest",    # "latest" or "next" frame for Camera.read()
+}
+
+# Multi-camera supervisor settings
+SUPERVISOR_SETTINGS = {
+    "config_path": os.path.join(BASE_DIR, "cameras.json"),
+    "encoder_workers": 2,           # Encoder threads shared by all cameras
+    "max_motion_fps": 0,            # Motion checks per second across all cameras (0 = no limit)
+    "restart_initial_delay": 1.0,   # Seconds before restarting a failed camera
+    "restart_max_delay": 60.0,      # Longest delay between restarts
+}
+
+# Benchmark settings
+BENCHMARK_SETTINGS = {
+    "baseline_path": os.path.join(BASE_DIR, "benchmarks", "pipeline_baseline.json"),
+    "frames": 300,                  # Frames pushed through the pipeline benchmark
+    "warmup_frames": 10,            # Frames left out of the latency stats
+    "regression_threshold": 0.15,   # Allowed slowdown against the baseline (0.15 = 15%)
+    "latency_floor_ms": 0.5,        # Ignore latency changes smaller than this
+}
+
+# Metrics settings
+METRICS_SETTINGS = {
+    "enabled": False,               # Record metrics (exporters turn this on)
+    "http_host": "0.0.0.0",
+    "http_port": None,              # Port for the Prometheus endpoint (None = off)
+    "snapshot_path": None,          # JSON snapshot file (None = off)
+    "snapshot_interval": 10.0,      # Seconds between JSON snapshots
+}
+
+# Retention settings. Each policy applies to one PATHS directory; limits
+# left at None are not enforced.
+RETENTION_SETTINGS = {
+    "interval": 300.0,              # Seconds between background sweeps
+    "min_age_seconds": 60,          # Never delete files modified more recently
+    # Files retention may delete; anything else is left alone
+    "patterns": ["*.mp4", "*.avi", "*.jpg", "*.png", "*.webp", "*.tar", "*.idx"],
+    "policies": {
+        "motion_videos_dir": {"max_age_days": 30, "max_mb": None},
+        "videos_dir": {"max_age_days": None, "max_mb": None},
+        "frames_dir": {"max_age_days": None, "max_mb": None},
+    },
+}
+
+# Video catalog settings
+CATALOG_SETTINGS = {
+    "db_path": os.path.join(BASE_DIR, "videos", "catalog.sqlite"),
+    "scan_workers": 4,              # Threads probing new or changed videos
+    "patterns": ["*.mp4", "*.avi", "*.mov"],
+}
+
+# File watcher settings
+WATCHER_SETTINGS = {
+    "directories": ["motion_videos_dir"],  # PATHS keys or directories to watch
+    "patterns": ["*.mp4", "*.avi", "*.mov"],
+    "settle_seconds": 2.0,          # Quiet time before a closed file counts as finished
+    "poll_interval": 5.0,           # Seconds between scans without inotify
+    "backend": "auto",              # "auto", "inotify" or "poll"
+}
+
+# Video organizing settings
+ORGANIZE_SETTINGS = {
+    "mode": "copy",                 # "copy", "move", "hardlink" or "reflink"
+    "dedupe": True,                 # Skip videos whose content is already organized
+    "workers": 4,                   # Files hashed and transferred in parallel
+    "hash_chunk_mb": 1,             # Read size when hashing
+    "manifest_name": ".organize_manifest.json",
+}
+
+# Frame extraction settings
+EXTRACTION_SETTINGS = {
+    "workers": 0,                   # Processes for batch extraction (0 = one per CPU core)
+    "min_segment_frames": 500,      # Shortest segment when splitting one video across workers
+    "seek_min_interval": 50,        # Seek instead of decoding when the next kept frame is this far ahead
+    "image_format": "jpg",          # "jpg", "png" or "webp"
+    "jpeg_quality": 95,             # 0-100
+    "png_compression": 3,           # 0-9
+    "webp_quality": 90,             # 0-100
+    "writer_threads": 2,            # Threads encoding images (0 = encode in the decode loop)
+    "writer_queue_size": 16,        # Decoded frames allowed to wait for encoding
+    "output_format": "files",       # "files" (one image per frame) or "shards" (tar shards)
+    "shard_max_mb": 256,            # Start a new shard before one grows past this size
+    "shard_max_frames": 10000,      # ... or holds this many frames
+    "motion_threshold": None,       # Motion score for motion-gated extraction (None = frame_diff_threshold)
+    "motion_pre_seconds": 1.0,      # Also keep frames this long before motion
+    "motion_post_seconds": 1.0,     # ... and this long after it
+    "motion_cache_dir": os.path.join(PATHS["frames_dir"], ".motion"),
+}
+
+# Training frame store settings
+FRAME_STORE_SETTINGS = {
+    "size": None,                   # (width, height) of stored frames (None = MODEL_SETTINGS["input_size"])
+    "resize": "stretch",            # "stretch" or "letterbox" (keep the aspect ratio and pad)
+    "pad_value": 114,               # Gray level of the letterbox padding
+    "workers": 4,                   # Threads decoding images while building and gathering batches
+    "batch_size": 32,               # Frames per batch
+    "prefetch": 4,                  # Batches gathered ahead of the training loop
+}
+
+# Frame filter settings
+FILTER_SETTINGS = {
+    "dedupe": True,                 # Drop near-duplicates of the last kept frame
+    "max_distance": 2,              # Differing dHash bits (of hash_size**2) still counted as a duplicate; raise for noisy cameras
+    "hash_size": 16,                # dHash grid size; at 8 a small animal can change no bits at all
+    "blur_threshold": None,         # Drop frames with a lower Laplacian variance (None = keep all)
+    "work_width": 320,              # Width frames are shrunk to before checking
 }
\ No newline at end of file
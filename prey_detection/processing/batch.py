@@ -0,0 +1,406 @@
+"""Frame extraction from many videos on a process pool."""
+import contextlib
+import cv2
+import functools
+import glob
+import io
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from ..config.settings import EXTRACTION_SETTINGS, PATHS
+from .frames import FrameExtractor, seek_frame
+from .shards import SHARD_EXTENSION, ShardReader
+
+def collect_videos(sources=None, catalog=None, **query):
+    """Resolve videos from paths, glob patterns and a catalog query.
+    
+    Args:
+        sources (list): Video paths or glob patterns
+        catalog (VideoCatalog): Catalog to query
+        **query: Filters for VideoCatalog.query (e.g. camera, start, end,
+            min_duration); only used with a catalog
+            
+    Returns:
+        list: Unique video paths, in the order they were found
+    """
+    videos = []
+    for source in sources or []:
+        if _is_pattern(source):
+            videos.extend(sorted(glob.glob(source, recursive=True)))
+        else:
+            videos.append(source)
+            
+    if catalog is not None:
+        videos.extend(entry["path"] for entry in catalog.query(**query))
+        
+    # Drop duplicates, keeping the first occurrence
+    seen = set()
+    unique = []
+    for video in videos:
+        key = os.path.abspath(video)
+        if key not in seen:
+            seen.add(key)
+            unique.append(video)
+            
+    return unique
+    
+def extract_batch(video_paths, output_dir=None, workers=None, frame_interval=1,
+                  start_time=None, end_time=None, max_frames=None, sample_fps=None,
+                  image_format=None, quality=None, output_format=None, frame_filter=None,
+                  verbose=True):
+    """Extract frames from many videos in parallel.
+    
+    Each video is extracted by FrameExtractor.extract_frames in its own
+    worker process, into ``<output_dir>/<video>_frames``. A video that fails
+    is reported and skipped without affecting the others. The largest
+    videos are started first so the workers finish at about the same time.
+    
+    Args:
+        video_paths (list): Videos to extract
+        output_dir (str): Base directory for the frame folders
+        workers (int): Worker processes (default: EXTRACTION_SETTINGS["workers"],
+            0 for one per CPU core)
+        frame_interval (int): Extract every Nth frame
+        start_time (float): Start time in seconds
+        end_time (float): End time in seconds
+        max_frames (int): Maximum number of frames per video
+        sample_fps (float): Extract this many frames per second of video
+            instead of every Nth frame
+        image_format (str): "jpg", "png" or "webp"
+        quality (int): JPEG/WebP quality or PNG compression level
+        output_format (str): "files" or "shards"
+        frame_filter (FrameFilter): Filter settings; each video is checked
+            by its own copy
+        verbose (bool): Print a progress line per video
+        
+    Returns:
+        dict: Summary with videos, succeeded, failed (list of dicts with
+            path and error), frames, bytes, frames dropped by the filter
+            per reason, seconds and fps, plus a result per video
+    """
+    output_dir = output_dir or PATHS["frames_dir"]
+    workers = EXTRACTION_SETTINGS["workers"] if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    
+    jobs = []
+    for video, frames_dir in zip(video_paths, _frame_dirs(video_paths, output_dir)):
+        try:
+            size = os.path.getsize(video)
+        except OSError:
+            size = 0
+        jobs.append((size, video, frames_dir))
+    jobs.sort(key=lambda job: job[0], reverse=True)
+    
+    summary = {
+        "videos": len(jobs),
+        "succeeded": 0,
+        "failed": [],
+        "frames": 0,
+        "bytes": 0,
+        "dropped": Counter(),
+        "workers": workers,
+        "results": [],
+    }
+    options = (frame_interval, start_time, end_time, max_frames, sample_fps, image_format, quality,
+               output_format, frame_filter)
+    
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_in_worker, _extract_video, video, frames_dir, *options): video
+            for _, video, frames_dir in jobs
+        }
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            video = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. a crash in a decoder)
+                result = {"path": video, "frames": 0, "bytes": 0, "dropped": {}, "seconds": 0.0,
+                          "error": str(e)}
+                
+            summary["results"].append(result)
+            summary["frames"] += result["frames"]
+            summary["bytes"] += result["bytes"]
+            summary["dropped"].update(result["dropped"])
+            
+            if result["error"] is None:
+                summary["succeeded"] += 1
+            else:
+                summary["failed"].append({"path": video, "error": result["error"]})
+                
+            if verbose:
+                _print_progress(done, len(jobs), result, summary, time.perf_counter() - started)
+                
+    summary["seconds"] = time.perf_counter() - started
+    summary["fps"] = summary["frames"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+    return summary
+    
+def extract_video_parallel(video_path, output_dir=None, workers=None, frame_interval=1,
+                           start_time=None, end_time=None, max_frames=None, sample_fps=None,
+                           image_format=None, quality=None, output_format=None,
+                           frame_filter=None):
+    """Extract frames from one video, splitting it into segments across processes.
+    
+    Each worker seeks to the start of its segment and decodes only that
+    segment. Seeking lands on the preceding keyframe and decodes forward,
+    so every segment starts on the exact frame (see seek_frame). Segment
+    boundaries fall on the frame interval, and frames keep their position
+    in the video as their index, so the saved files are the same as from
+    FrameExtractor.extract_frames. With shard output, each segment writes
+    its own shards.
+    
+    A frame filter starts afresh in each segment, so the first frame of
+    a segment is never dropped as a duplicate, and ``max_frames`` limits
+    the frames checked rather than the frames saved.
+    
+    Args:
+        video_path (str): Path to the video file
+        output_dir (str): Directory to save frames (if None, uses video filename)
+        workers (int): Worker processes (default: EXTRACTION_SETTINGS["workers"],
+            0 for one per CPU core)
+        frame_interval (int): Extract every Nth frame
+        start_time (float): Start time in seconds
+        end_time (float): End time in seconds
+        max_frames (int): Maximum number of frames to extract
+        sample_fps (float): Extract this many frames per second of video
+            instead of every Nth frame
+        image_format (str): "jpg", "png" or "webp"
+        quality (int): JPEG/WebP quality or PNG compression level
+        output_format (str): "files" or "shards"
+        frame_filter (FrameFilter): Drops near-duplicate and blurry frames
+        
+    Returns:
+        tuple: (num_frames, output_dir) - Number of frames extracted and output dir
+    """
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+    if output_dir is None:
+        output_dir = os.path.join(PATHS["frames_dir"], f"{Path(video_path).stem}_frames")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    workers = EXTRACTION_SETTINGS["workers"] if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    
+    # Same frames as a serial extraction
+    if sample_fps:
+        if fps <= 0:
+            raise ValueError(f"Video has no frame rate to sample by: {video_path}")
+        frame_interval = fps / sample_fps
+        
+    start_frame = int(start_time * fps) if start_time is not None else 0
+    end_frame = total_frames
+    if end_time is not None:
+        end_frame = min(int(end_time * fps), total_frames)
+    if max_frames is not None:
+        end_frame = min(end_frame, start_frame + round((max_frames - 1) * frame_interval) + 1)
+        
+    segments = _segments(start_frame, end_frame, max(1, int(frame_interval)), workers)
+    jobs = [
+        (video_path, output_dir, first, end, start_frame, frame_interval, image_format, quality,
+         output_format, frame_filter)
+        for first, end in segments
+    ]
+    
+    print(f"Video: {video_path}")
+    print(f"Extracting frames {start_frame} to {end_frame} in {len(segments)} segments")
+    
+    if len(jobs) == 1:
+        results = [_extract_segment(*jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(functools.partial(_in_worker, _extract_segment), *zip(*jobs)))
+            
+    saved_count = sum(result["saved"] for result in results)
+    print(f"Extraction complete: {saved_count} frames saved to {output_dir}")
+    
+    if frame_filter is not None:
+        dropped = sum((Counter(result["dropped"]) for result in results), Counter())
+        print(f"Filter: dropped {dropped['duplicate']} duplicates and {dropped['blurry']} blurry frames")
+    return saved_count, output_dir
+    
+def compare_frame_dirs(expected_dir, actual_dir):
+    """Compare two directories of extracted frames image by image.
+    
+    Directories holding tar shards are compared by the images inside
+    them, so the shard layout itself may differ.
+    
+    Args:
+        expected_dir (str): Frames from a reference extraction
+        actual_dir (str): Frames to check
+        
+    Returns:
+        dict: Lists of missing, extra and different file names (all
+            empty when the directories match)
+    """
+    with _open_frames(expected_dir) as expected, _open_frames(actual_dir) as actual:
+        different = [
+            name for name in sorted(expected.keys() & actual.keys())
+            if expected[name]() != actual[name]()
+        ]
+        
+    return {
+        "missing": sorted(expected.keys() - actual.keys()),
+        "extra": sorted(actual.keys() - expected.keys()),
+        "different": different,
+    }
+    
+def print_batch_summary(summary):
+    """Print the summary returned by extract_batch.
+    
+    Args:
+        summary (dict): Result of extract_batch
+    """
+    print(
+        f"\n✅ {summary['succeeded']}/{summary['videos']} videos, {summary['frames']} frames, "
+        f"{summary['bytes'] / (1024 * 1024):.1f} MB in {summary['seconds']:.1f}s "
+        f"({summary['fps']:.1f} frames/s, {summary['workers']} workers)"
+    )
+    
+    if summary["dropped"]:
+        reasons = ", ".join(f"{count} {reason}" for reason, count in sorted(summary["dropped"].items()))
+        print(f"🧹 Filter dropped {reasons} frames")
+    
+    if summary["failed"]:
+        print(f"❌ {len(summary['failed'])} failed:")
+        for failure in summary["failed"]:
+            print(f"   {failure['path']}: {failure['error']}")
+            
+@contextlib.contextmanager
+def _open_frames(frames_dir):
+    """Map each image name in a frame folder to a function returning its bytes."""
+    names = os.listdir(frames_dir)
+    if not any(name.endswith(SHARD_EXTENSION) for name in names):
+        yield {name: functools.partial(_read_file, os.path.join(frames_dir, name)) for name in names}
+        return
+        
+    with ShardReader(frames_dir) as reader:
+        yield {name: functools.partial(reader.read, name) for name in reader.names()}
+        
+def _read_file(path):
+    """Contents of a file."""
+    with open(path, "rb") as f:
+        return f.read()
+        
+def _is_pattern(source):
+    """Whether a source contains glob wildcards."""
+    return any(char in source for char in "*?[")
+    
+def _in_worker(func, *args):
+    """Run a job in a worker process, keeping OpenCV on one core.
+    
+    The pool provides the parallelism. Set per job rather than with an
+    executor initializer, which needs Python 3.7.
+    """
+    cv2.setNumThreads(1)
+    return func(*args)
+    
+def _extract_video(video_path, frames_dir, frame_interval, start_time, end_time, max_frames,
+                   sample_fps, image_format, quality, output_format, frame_filter):
+    """Extract one video in a worker process and describe the result."""
+    started = time.perf_counter()
+    result = {"path": video_path, "output_dir": frames_dir, "frames": 0, "bytes": 0, "dropped": {},
+              "error": None}
+    
+    extractor = FrameExtractor(
+        os.path.dirname(frames_dir), image_format, quality, output_format=output_format,
+        frame_filter=frame_filter
+    )
+    dropped_before = _dropped(frame_filter)
+    try:
+        # The extractor reports progress on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            result["frames"], _ = extractor.extract_frames(
+                video_path, frames_dir, frame_interval, start_time, end_time, max_frames,
+                sample_fps
+            )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        
+    result["bytes"] = extractor.bytes_written
+    result["dropped"] = _dropped(frame_filter, dropped_before)
+    result["seconds"] = time.perf_counter() - started
+    return result
+    
+def _segments(start_frame, end_frame, frame_interval, workers):
+    """Split [start_frame, end_frame) into up to ``workers`` interval-aligned segments."""
+    frames = max(0, end_frame - start_frame)
+    count = max(1, min(workers, frames // EXTRACTION_SETTINGS["min_segment_frames"]))
+    
+    # Round the length up to whole intervals
+    length = -(-frames // count)
+    length = -(-length // frame_interval) * frame_interval or frame_interval
+    
+    return [
+        (first, min(first + length, end_frame))
+        for first in range(start_frame, max(end_frame, start_frame + 1), length)
+    ]
+    
+def _extract_segment(video_path, output_dir, first_frame, end_frame, start_frame, frame_interval,
+                     image_format, quality, output_format, frame_filter):
+    """Extract one segment of a video in a worker process."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+        
+    dropped_before = _dropped(frame_filter)
+    try:
+        seek_frame(cap, first_frame)
+        extractor = FrameExtractor(
+            output_dir, image_format, quality, output_format=output_format,
+            frame_filter=frame_filter
+        )
+        read, saved = extractor._extract_span(
+            cap, output_dir, first_frame, end_frame, start_frame, frame_interval, progress=False
+        )
+    finally:
+        cap.release()
+        
+    return {"first": first_frame, "end": end_frame, "read": read, "saved": saved,
+            "bytes": extractor.bytes_written, "dropped": _dropped(frame_filter, dropped_before)}
+    
+def _dropped(frame_filter, before=None):
+    """Frames a filter dropped per reason, counted since ``before``.
+    
+    A filter arrives in a worker with the counts it had in the parent
+    (and in-process runs reuse it), so results report only the difference.
+    """
+    if frame_filter is None:
+        return {}
+    before = before or {}
+    return {reason: count - before.get(reason, 0) for reason, count in frame_filter.dropped.items()}
+    
+def _frame_dirs(video_paths, output_dir):
+    """Frame folder per video; videos with the same name get their parent's name too."""
+    stems = [Path(video).stem for video in video_paths]
+    counts = Counter(stems)
+    
+    dirs = []
+    for video, stem in zip(video_paths, stems):
+        if counts[stem] > 1:
+            stem = f"{Path(video).parent.name}_{stem}"
+        dirs.append(os.path.join(output_dir, f"{stem}_frames"))
+    return dirs
+    
+def _print_progress(done, total, result, summary, elapsed):
+    """Print one progress line."""
+    name = os.path.basename(result["path"])
+    rate = summary["frames"] / elapsed if elapsed > 0 else 0.0
+    
+    if result["error"] is None:
+        status = f"✅ {name}: {result['frames']} frames in {result['seconds']:.1f}s"
+    else:
+        status = f"❌ {name}: {result['error']}"
+        
+    print(f"[{done}/{total}] {status} ({summary['frames']} frames, {rate:.1f} frames/s overall)")
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Drop near-duplicate and blurry frames during extraction."""
+import cv2
+import numpy as np
+import time
+from ..config.settings import FILTER_SETTINGS
+
+class FrameFilter:
+    """Decide per frame whether it is worth saving.
+    
+    Two cheap checks run on a downscaled grayscale copy of each frame:
+    
+    - Near-duplicates: the difference hash (dHash) of the frame is
+      compared with that of the last kept frame; frames within
+      ``max_distance`` differing bits are dropped. A cat sitting still
+      then yields one frame instead of thousands.
+    - Blur: frames whose Laplacian variance is below ``blur_threshold``
+      are dropped. The variance depends on the image size, so the
+      threshold applies at ``work_width``.
+      
+    The filter is stateful: feed it the frames of one video in order and
+    call ``reset`` before the next video.
+    """
+    
+    def __init__(self, dedupe=None, max_distance=None, blur_threshold=None, hash_size=None,
+                 work_width=None):
+        """Initialize the filter.
+        
+        Args:
+            dedupe (bool): Drop near-duplicates of the last kept frame
+            max_distance (int): Largest dHash distance (in bits) still
+                counted as a duplicate
+            blur_threshold (float): Drop frames with a lower Laplacian
+                variance (None to keep blurry frames)
+            hash_size (int): dHash grid size (hash_size**2 bits)
+            work_width (int): Width the frames are downscaled to first
+        """
+        self.dedupe = FILTER_SETTINGS["dedupe"] if dedupe is None else dedupe
+        self.max_distance = FILTER_SETTINGS["max_distance"] if max_distance is None else max_distance
+        self.blur_threshold = (
+            FILTER_SETTINGS["blur_threshold"] if blur_threshold is None else blur_threshold
+        )
+        self.hash_size = hash_size or FILTER_SETTINGS["hash_size"]
+        self.work_width = work_width or FILTER_SETTINGS["work_width"]
+        
+        self._last_hash = None
+        
+        # Stats
+        self.checked = 0
+        self.kept = 0
+        self.dropped = {"duplicate": 0, "blurry": 0}
+        self.seconds = 0.0
+        
+    def reset(self):
+        """Forget the last kept frame, e.g. before the next video."""
+        self._last_hash = None
+        
+    def check(self, frame):
+        """Check one frame.
+        
+        Args:
+            frame (numpy.ndarray): BGR frame
+            
+        Returns:
+            str: None to keep the frame, otherwise the reason it is
+                dropped ("duplicate" or "blurry")
+        """
+        started = time.perf_counter()
+        self.checked += 1
+        
+        # Shrink before converting, so the full frame is only read once
+        height, width = frame.shape[:2]
+        if width > self.work_width:
+            size = (self.work_width, max(1, round(height * self.work_width / width)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        
+        reason = None
+        frame_hash = None
+        if self.dedupe:
+            frame_hash = self.dhash(gray)
+            if (self._last_hash is not None
+                    and np.count_nonzero(frame_hash != self._last_hash) <= self.max_distance):
+                reason = "duplicate"
+                
+        if reason is None and self.blur_threshold is not None:
+            if self.sharpness(gray) < self.blur_threshold:
+                reason = "blurry"
+                
+        if reason is None:
+            self.kept += 1
+            self._last_hash = frame_hash
+        else:
+            self.dropped[reason] += 1
+            
+        self.seconds += time.perf_counter() - started
+        return reason
+        
+    def keep(self, frame):
+        """Check one frame and tell whether to save it.
+        
+        Args:
+            frame (numpy.ndarray): BGR frame
+            
+        Returns:
+            bool: True to keep the frame
+        """
+        return self.check(frame) is None
+        
+    def dhash(self, gray):
+        """Difference hash of a grayscale image.
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image
+            
+        Returns:
+            numpy.ndarray: hash_size x hash_size booleans, True where a
+                pixel of the shrunken image is brighter than its right
+                neighbour
+        """
+        # Area averaging is slow for odd ratios, so sample a grid 8x finer
+        # first and average whole 8x8 blocks of it
+        size = (self.hash_size + 1, self.hash_size)
+        fine = cv2.resize(gray, (size[0] * 8, size[1] * 8), interpolation=cv2.INTER_LINEAR)
+        small = cv2.resize(fine, size, interpolation=cv2.INTER_AREA)
+        return small[:, :-1] > small[:, 1:]
+        
+    @staticmethod
+    def sharpness(gray):
+        """Variance of the Laplacian; low values mean a blurry image.
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image
+            
+        Returns:
+            float: Laplacian variance
+        """
+        _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+        return float(stddev[0, 0]) ** 2
+        
+    def get_stats(self):
+        """Get filter stats.
+        
+        Returns:
+            dict: Frames checked, kept, dropped per reason, and the time
+                spent checking
+        """
+        return {
+            "checked": self.checked,
+            "kept": self.kept,
+            "dropped": dict(self.dropped),
+            "seconds": self.seconds,
+        }
\ No newline at end of file
@@ -0,0 +1,379 @@
+"""Memory-mapped store of preprocessed frames for model training."""
+import collections
+import cv2
+import json
+import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import EXTRACTION_SETTINGS, FRAME_STORE_SETTINGS, MODEL_SETTINGS
+from .frames import seek_frame
+from .shards import SHARD_EXTENSION, ShardReader
+
+DATA_FILE = "frames.u8"
+INDEX_FILE = "index.json"
+RESIZE_MODES = ("stretch", "letterbox")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+class FrameStoreBuilder:
+    """Write preprocessed frames into a frame store.
+    
+    A store is a directory with a raw ``frames.u8`` file of fixed-size
+    uint8 BGR frames, one after the other, and an ``index.json`` with the
+    frame shape and one entry (source, key, label, original size) per
+    frame. Frames are resized once, when they are added, so reading them
+    back needs no decoding. The index is written when the builder is
+    closed; frames added after the last close are dropped the next time
+    the store is opened for building, so an interrupted build leaves the
+    previous contents intact. Opening an existing store appends to it.
+    """
+    
+    def __init__(self, path, size=None, resize=None, workers=None):
+        """Create or open a store for adding frames.
+        
+        Args:
+            path (str): Store directory
+            size (tuple): (width, height) of stored frames (default:
+                FRAME_STORE_SETTINGS["size"] or MODEL_SETTINGS["input_size"])
+            resize (str): "stretch" or "letterbox"
+            workers (int): Threads decoding and resizing images
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        
+        index = _load_index(path)
+        if index is None:
+            width, height = size or FRAME_STORE_SETTINGS["size"] or MODEL_SETTINGS["input_size"]
+            index = {
+                "shape": [height, width, 3],
+                "dtype": "uint8",
+                "resize": resize or FRAME_STORE_SETTINGS["resize"],
+                "frames": [],
+            }
+        elif size is not None and list(size) != index["shape"][1::-1]:
+            raise ValueError(f"Store {path} holds {index['shape'][1]}x{index['shape'][0]} frames")
+        elif resize is not None and resize != index["resize"]:
+            raise ValueError(f"Store {path} uses {index['resize']} resizing")
+            
+        if index["resize"] not in RESIZE_MODES:
+            raise ValueError(f"Unknown resize mode: {index['resize']}")
+            
+        self.index = index
+        self.shape = tuple(index["shape"])
+        self.resize = index["resize"]
+        self.workers = workers or FRAME_STORE_SETTINGS["workers"]
+        self.frame_bytes = int(np.prod(self.shape))
+        self.added = 0
+        self.skipped = 0
+        
+        # Drop frames written after the index was last saved
+        data_path = os.path.join(path, DATA_FILE)
+        with open(data_path, "ab") as f:
+            f.truncate(len(index["frames"]) * self.frame_bytes)
+        self._data = open(data_path, "ab")
+        
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+        
+    def __len__(self):
+        """Number of frames in the store, including those added so far."""
+        return len(self.index["frames"])
+        
+    def add(self, frame, source=None, key=None, label=None):
+        """Preprocess and append one frame.
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame of any size
+            source (str): Video or folder the frame came from
+            key (str): Name of the frame within its source
+            label (str): Class label
+        """
+        self._append(self.preprocess(frame), _entry(frame, source, key, label))
+        
+    def add_video(self, video_path, frame_interval=1, sample_fps=None, max_frames=None, label=None):
+        """Append frames from a video, decoding each one only once.
+        
+        Args:
+            video_path (str): Path to the video
+            frame_interval (float): Keep every Nth frame
+            sample_fps (float): Keep this many frames per second of video
+                instead of every Nth frame
+            max_frames (int): Maximum number of frames to add
+            label (str): Class label for all frames
+            
+        Returns:
+            int: Number of frames added
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+            
+        if sample_fps:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            if fps <= 0:
+                raise ValueError(f"Video has no frame rate to sample by: {video_path}")
+            frame_interval = fps / sample_fps
+            
+        seek_min_interval = EXTRACTION_SETTINGS["seek_min_interval"]
+        position = 0
+        added = 0
+        k = 0
+        
+        try:
+            while max_frames is None or added < max_frames:
+                target = round(k * frame_interval)
+                
+                # Skipped frames are only grabbed, not converted
+                if seek_min_interval and target - position >= seek_min_interval:
+                    seek_frame(cap, target)
+                    position = target
+                while position < target and cap.grab():
+                    position += 1
+                if position < target or not cap.grab():
+                    break
+                position += 1
+                
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                    
+                self.add(frame, video_path, f"frame_{target:06d}", label)
+                added += 1
+                k += 1
+        finally:
+            cap.release()
+            
+        return added
+        
+    def add_images(self, frames_dir, label=None):
+        """Append the images in a frame folder (image files or tar shards).
+        
+        Images are decoded and resized on ``workers`` threads.
+        
+        Args:
+            frames_dir (str): Folder written by FrameExtractor
+            label (str): Class label for all frames
+            
+        Returns:
+            int: Number of frames added
+        """
+        names = sorted(os.listdir(frames_dir))
+        if any(name.endswith(SHARD_EXTENSION) for name in names):
+            reader = ShardReader(frames_dir)
+            images = ((os.path.splitext(name)[0], data) for name, data in reader)
+        else:
+            images = (
+                (os.path.splitext(name)[0], os.path.join(frames_dir, name)) for name in names
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            
+        added = 0
+        with ThreadPoolExecutor(self.workers) as pool:
+            for key, frame, processed in _ordered_map(pool, self._load, images, self.workers * 4):
+                if processed is None:
+                    print(f"⚠️  Could not decode {key} in {frames_dir}")
+                    self.skipped += 1
+                    continue
+                self._append(processed, _entry(frame, frames_dir, key, label))
+                added += 1
+                
+        return added
+        
+    def preprocess(self, frame):
+        """Resize a frame to the store's frame shape.
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+            
+        Returns:
+            numpy.ndarray: Frame of the store's shape
+        """
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+            
+        height, width = self.shape[:2]
+        h, w = frame.shape[:2]
+        
+        if self.resize == "stretch":
+            return cv2.resize(frame, (width, height), interpolation=_interpolation(w, width))
+            
+        # Letterbox: keep the aspect ratio and pad the rest
+        scale = min(width / w, height / h)
+        new_w = max(1, min(width, round(w * scale)))
+        new_h = max(1, min(height, round(h * scale)))
+        top = (height - new_h) // 2
+        left = (width - new_w) // 2
+        
+        out = np.full(self.shape, FRAME_STORE_SETTINGS["pad_value"], dtype=np.uint8)
+        out[top:top + new_h, left:left + new_w] = cv2.resize(
+            frame, (new_w, new_h), interpolation=_interpolation(w, new_w)
+        )
+        return out
+        
+    def close(self):
+        """Flush the frames and save the index."""
+        if self._data is None:
+            return
+        self._data.close()
+        self._data = None
+        _save_index(self.path, self.index)
+        
+    def _load(self, item):
+        """Decode and preprocess one image on a worker thread."""
+        key, image = item
+        if isinstance(image, str):
+            frame = cv2.imread(image, cv2.IMREAD_COLOR)
+        else:
+            frame = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return key, None, None
+        return key, frame, self.preprocess(frame)
+        
+    def _append(self, processed, entry):
+        """Write one preprocessed frame and its index entry."""
+        self._data.write(memoryview(np.ascontiguousarray(processed)).cast("B"))
+        self.index["frames"].append(entry)
+        self.added += 1
+        
+class FrameStore:
+    """Random access to the frames of a frame store.
+    
+    The frames are a read-only memory map, so ``store[i]`` is a view into
+    the page cache and ``gather`` only copies bytes; nothing is decoded.
+    """
+    
+    def __init__(self, path):
+        """Open a store.
+        
+        Args:
+            path (str): Store directory written by FrameStoreBuilder
+        """
+        index = _load_index(path)
+        if index is None:
+            raise FileNotFoundError(f"No frame store at {path}")
+            
+        self.path = path
+        self.shape = tuple(index["shape"])
+        self.resize = index["resize"]
+        self.entries = index["frames"]
+        
+        shape = (len(self.entries),) + self.shape
+        if self.entries:
+            self.frames = np.memmap(os.path.join(path, DATA_FILE), dtype=np.uint8, mode="r", shape=shape)
+        else:
+            self.frames = np.empty(shape, dtype=np.uint8)
+            
+    def __len__(self):
+        """Number of frames."""
+        return len(self.entries)
+        
+    def __getitem__(self, i):
+        """Frame ``i`` as a read-only view."""
+        return self.frames[i]
+        
+    def meta(self, i):
+        """Index entry of frame ``i``.
+        
+        Returns:
+            dict: source, key, label, width and height (of the original)
+        """
+        return self.entries[i]
+        
+    def labels(self):
+        """Label of every frame, in order."""
+        return [entry["label"] for entry in self.entries]
+        
+    def gather(self, indices, out=None):
+        """Copy frames into one batch array.
+        
+        Args:
+            indices (list): Frame numbers
+            out (numpy.ndarray): Batch array to fill, shaped
+                (len(indices),) + frame shape
+                
+        Returns:
+            numpy.ndarray: The batch
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if out is None:
+            out = np.empty((len(indices),) + self.shape, dtype=np.uint8)
+        np.take(self.frames, indices, axis=0, out=out)
+        return out
+        
+    def batches(self, batch_size=None, shuffle=False, seed=None, drop_last=False, indices=None,
+                workers=None, prefetch=None):
+        """Iterate over batches, gathered ahead on worker threads.
+        
+        Up to ``prefetch`` batches are gathered while the caller works on
+        the current one, so reading overlaps with the training step.
+        
+        Args:
+            batch_size (int): Frames per batch
+            shuffle (bool): Visit the frames in random order
+            seed (int): Seed for the shuffle
+            drop_last (bool): Leave out a final, smaller batch
+            indices (list): Frames to visit (default: all)
+            workers (int): Gathering threads
+            prefetch (int): Batches gathered ahead
+            
+        Yields:
+            tuple: (indices, batch) - frame numbers and their frames
+        """
+        batch_size = batch_size or FRAME_STORE_SETTINGS["batch_size"]
+        workers = workers or FRAME_STORE_SETTINGS["workers"]
+        prefetch = prefetch or FRAME_STORE_SETTINGS["prefetch"]
+        
+        order = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.intp)
+        if shuffle:
+            order = np.random.default_rng(seed).permutation(order)
+            
+        chunks = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        if drop_last and chunks and len(chunks[-1]) < batch_size:
+            chunks.pop()
+            
+        with ThreadPoolExecutor(workers, thread_name_prefix="frame-store") as pool:
+            yield from _ordered_map(pool, lambda chunk: (chunk, self.gather(chunk)), chunks, prefetch)
+            
+def _ordered_map(pool, fn, items, window):
+    """Like pool.map, but with at most ``window`` calls submitted ahead."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+        
+def _entry(frame, source, key, label):
+    """Index entry of a frame."""
+    return {
+        "source": source,
+        "key": key,
+        "label": label,
+        "width": frame.shape[1],
+        "height": frame.shape[0],
+    }
+    
+def _interpolation(old_width, new_width):
+    """Area averaging when shrinking, bilinear when enlarging."""
+    return cv2.INTER_AREA if new_width < old_width else cv2.INTER_LINEAR
+    
+def _load_index(path):
+    """Load a store's index (None if there is no store yet)."""
+    index_path = os.path.join(path, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path) as f:
+        return json.load(f)
+        
+def _save_index(path, index):
+    """Write a store's index atomically."""
+    index_path = os.path.join(path, INDEX_FILE)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
\ No newline at end of file
@@ -1,27 +1,91 @@
 """Frame extraction and processing utilities."""
 import cv2
+import itertools
+import math
 import os
+import time
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from ..config.settings import PATHS
+from ..config.settings import EXTRACTION_SETTINGS, PATHS
+from ..utils.metrics import METRICS
+from ..utils.scenes import draw_test_scene
+from .motion_timeline import motion_timeline
+from .shards import ShardWriter
+from .writers import DirectorySink, ImageWriter
 
+_FRAMES_READ = METRICS.counter("extractor_frames_read_total", "Frames decoded for extraction")
+_FRAMES_SAVED = METRICS.counter("extractor_frames_saved_total", "Frames saved as images")
+_VIDEO_SECONDS = METRICS.histogram(
+    "extractor_video_seconds", "Time to extract one video",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+
+OUTPUT_FORMATS = ("files", "shards")
+
+def seek_frame(cap, frame_index):
+    """Position a capture so the next frame it returns is ``frame_index``.
+    
+    OpenCV's FFmpeg backend seeks to the preceding keyframe and decodes
+    forward, so the position is exact. The capture cannot confirm this
+    (it reports back the requested position), so exactness rests on the
+    backend. Indices past the end leave the capture at the end.
+    
+    Args:
+        cap (cv2.VideoCapture): Open capture
+        frame_index (int): Frame to seek to
+    """
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if frame_count > 0:
+        frame_index = min(frame_index, frame_count)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, max(frame_index, 0))
+            
 class FrameExtractor:
     """Extract frames from videos for analysis and model training."""
     
-    def __init__(self, output_dir=None):
+    def __init__(self, output_dir=None, image_format=None, quality=None, writer_threads=None,
+                 output_format=None, frame_filter=None):
         """Initialize the frame extractor.
         
         Args:
             output_dir (str): Base directory to save extracted frames
+            image_format (str): "jpg", "png" or "webp"
+            quality (int): JPEG/WebP quality or PNG compression level
+            writer_threads (int): Threads encoding images (0 to encode in
+                the decode loop)
+            output_format (str): "files" to save one image per frame, or
+                "shards" to pack them into tar shards (see ShardWriter)
+            frame_filter (FrameFilter): Drops near-duplicate and blurry
+                frames before they are saved
         """
         self.output_dir = output_dir or PATHS["frames_dir"]
         os.makedirs(self.output_dir, exist_ok=True)
+        self.seek_min_interval = EXTRACTION_SETTINGS["seek_min_interval"]
+        self.image_format = image_format
+        self.quality = quality
+        self.writer_threads = writer_threads
+        self.output_format = output_format or EXTRACTION_SETTINGS["output_format"]
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {self.output_format}")
+        self.frame_filter = frame_filter
+        
+        # Totals over everything this extractor has saved
+        self.bytes_written = 0
+        self.stats = {
+            "frames_decoded": 0,
+            "decode_seconds": 0.0,
+            "frames_encoded": 0,
+            "encode_seconds": 0.0,
+            "writer_wait_seconds": 0.0,
+        }
         
     def extract_frames(self, video_path, output_dir=None, frame_interval=1, 
-                      start_time=None, end_time=None, max_frames=None):
+                      start_time=None, end_time=None, max_frames=None, sample_fps=None):
         """Extract frames from a video file.
         
+        Skipped frames are only demuxed (``grab``), not converted, and the
+        capture seeks past long gaps between kept frames.
+        
         Args:
             video_path (str): Path to the video file
             output_dir (str): Directory to save frames (if None, uses video filename)
@@ -29,6 +93,8 @@ class FrameExtractor:
             start_time (float): Start time in seconds
             end_time (float): End time in seconds
             max_frames (int): Maximum number of frames to extract
+            sample_fps (float): Extract this many frames per second of video
+                instead of every Nth frame
             
         Returns:
             tuple: (num_frames, output_dir) - Number of frames extracted and output dir
@@ -58,7 +124,12 @@ class FrameExtractor:
         start_frame = 0
         if start_time is not None:
             start_frame = int(start_time * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            seek_frame(cap, start_frame)
+            
+        if sample_fps:
+            if fps <= 0:
+                raise ValueError(f"Video has no frame rate to sample by: {video_path}")
+            frame_interval = fps / sample_fps
             
         end_frame = total_frames
         if end_time is not None:
@@ -69,48 +140,34 @@ class FrameExtractor:
         print(f"FPS: {fps}")
         print(f"Duration: {duration:.2f} seconds")
         print(f"Extracting frames {start_frame} to {end_frame}")
-        print(f"Frame interval: {frame_interval}")
+        print(f"Frame interval: {frame_interval:g}")
         
-        # Extract frames
-        frame_count = 0
-        saved_count = 0
+        # Extract frames, numbered by their position in the video
+        started = time.perf_counter() if METRICS.enabled else None
+        frames_read, saved_count = self._extract_span(
+            cap, output_dir, start_frame, end_frame, start_frame, frame_interval, max_frames
+        )
         
-        while frame_count < end_frame:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            # Extract frame if it's on the interval
-            if (frame_count - start_frame) % frame_interval == 0:
-                # Save frame
-                frame_filename = os.path.join(output_dir, f"frame_{frame_count:06d}.jpg")
-                cv2.imwrite(frame_filename, frame)
-                saved_count += 1
-                
-                # Print progress
-                if saved_count % 10 == 0:
-                    print(f"Saved {saved_count} frames...")
-                    
-                # Check if we've reached max frames
-                if max_frames is not None and saved_count >= max_frames:
-                    break
-                    
-            frame_count += 1
-            
         # Release resources
         cap.release()
         
+        if started is not None:
+            self._record_extraction(started, frames_read, saved_count)
+            
         print(f"Extraction complete: {saved_count} frames saved to {output_dir}")
+        self.print_throughput()
         return saved_count, output_dir
         
-    def extract_frames_range(self, video_path, start_frame, end_frame, output_dir=None):
+    def extract_frames_range(self, video_path, start_frame, end_frame, output_dir=None,
+                             frame_interval=1):
         """Extract a specific range of frames from a video.
         
         Args:
             video_path (str): Path to video file
             start_frame (int): Start frame number
-            end_frame (int): End frame number
+            end_frame (int): End frame number (inclusive)
             output_dir (str): Directory to save frames
+            frame_interval (int): Extract every Nth frame of the range
             
         Returns:
             tuple: (num_frames, output_dir)
@@ -133,34 +190,243 @@ class FrameExtractor:
             raise ValueError(f"Could not open video: {video_path}")
             
         # Set position to start frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        seek_frame(cap, start_frame)
         
         # Extract frames
-        frame_count = start_frame
-        saved_count = 0
+        started = time.perf_counter() if METRICS.enabled else None
+        frames_read, saved_count = self._extract_span(
+            cap, output_dir, start_frame, end_frame + 1, start_frame, frame_interval
+        )
         
-        while frame_count <= end_frame:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            # Save frame
-            frame_filename = os.path.join(output_dir, f"frame_{frame_count:06d}.jpg")
-            cv2.imwrite(frame_filename, frame)
-            saved_count += 1
-            
-            # Print progress
-            if saved_count % 10 == 0:
-                print(f"Saved {saved_count} frames...")
-                
-            frame_count += 1
-            
         # Release resources
         cap.release()
         
+        if started is not None:
+            self._record_extraction(started, frames_read, saved_count)
+            
+        print(f"Extraction complete: {saved_count} frames saved to {output_dir}")
+        self.print_throughput()
+        return saved_count, output_dir
+        
+    def extract_motion_frames(self, video_path, output_dir=None, threshold=None, pre_seconds=None,
+                              post_seconds=None, frame_interval=1, sample_fps=None, max_frames=None,
+                              refresh=False, catalog=None):
+        """Extract only the frames with motion, and the windows around them.
+        
+        Frames are scored like MotionDetector.calculate_motion in a first
+        pass over the video. The scores are cached (see motion_timeline),
+        so extracting again with another threshold or window skips that
+        pass; only the selected frames are decoded the second time.
+        
+        Args:
+            video_path (str): Path to the video file
+            output_dir (str): Directory to save frames (if None, uses video filename)
+            threshold (float): Lowest motion score (default:
+                EXTRACTION_SETTINGS["motion_threshold"], or
+                MOTION_SETTINGS["frame_diff_threshold"] if that is None)
+            pre_seconds (float): Also extract this long before motion
+            post_seconds (float): Also extract this long after motion
+            frame_interval (int): Extract every Nth frame of the motion spans
+            sample_fps (float): Extract this many frames per second of video
+                instead of every Nth frame
+            max_frames (int): Maximum number of frames to extract
+            refresh (bool): Score the video again even if it is cached
+            catalog (VideoCatalog): Store the video's peak motion score
+            
+        Returns:
+            tuple: (num_frames, output_dir) - Number of frames extracted and output dir
+        """
+        if output_dir is None:
+            video_name = Path(video_path).stem
+            output_dir = os.path.join(self.output_dir, f"{video_name}_motion")
+            
+        os.makedirs(output_dir, exist_ok=True)
+        
+        timeline = motion_timeline(video_path, refresh=refresh, catalog=catalog)
+        
+        if sample_fps:
+            if timeline.fps <= 0:
+                raise ValueError(f"Video has no frame rate to sample by: {video_path}")
+            frame_interval = timeline.fps / sample_fps
+            
+        segments = timeline.segments(threshold, pre_seconds, post_seconds)
+        targets = timeline.frames(threshold, pre_seconds, post_seconds, frame_interval)
+        motion_frames = sum(end - first for first, end in segments)
+        
+        print(f"Video: {video_path}")
+        print(f"Total frames: {len(timeline)}")
+        print(f"Peak motion score: {timeline.peak:.0f}")
+        print(f"Motion in {len(segments)} spans, {motion_frames} frames")
+        print(f"Frame interval: {frame_interval:g}")
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+            
+        # Extract the selected frames, seeking between the spans
+        started = time.perf_counter() if METRICS.enabled else None
+        try:
+            frames_read, saved_count = self._extract_targets(
+                cap, output_dir, 0, targets.tolist(), max_frames
+            )
+        finally:
+            cap.release()
+            
+        if started is not None:
+            self._record_extraction(started, frames_read, saved_count)
+            
         print(f"Extraction complete: {saved_count} frames saved to {output_dir}")
+        self.print_throughput()
         return saved_count, output_dir
         
+    def print_throughput(self):
+        """Print decode and encode throughput so far."""
+        stats = self.stats
+        decode_fps = stats["frames_decoded"] / stats["decode_seconds"] if stats["decode_seconds"] else 0.0
+        encode_fps = stats["frames_encoded"] / stats["encode_seconds"] if stats["encode_seconds"] else 0.0
+        print(f"Decode: {decode_fps:.1f} frames/s, encode: {encode_fps:.1f} frames/s per thread, "
+              f"waited {stats['writer_wait_seconds']:.2f}s for the writer")
+        
+        if self.frame_filter is not None:
+            dropped = self.frame_filter.dropped
+            print(f"Filter: dropped {dropped['duplicate']} duplicates and {dropped['blurry']} "
+                  f"blurry of {self.frame_filter.checked} frames in {self.frame_filter.seconds:.2f}s")
+        
+    def _extract_span(self, cap, output_dir, first_frame, end_frame, start_frame, frame_interval,
+                      max_frames=None, progress=True):
+        """Save the frames on the interval from an open capture.
+        
+        The kept frames are ``start_frame + round(k * frame_interval)``.
+        
+        Args:
+            cap (cv2.VideoCapture): Capture positioned at first_frame
+            output_dir (str): Directory to save frames
+            first_frame (int): Index of the next frame the capture returns
+            end_frame (int): Stop before this frame
+            start_frame (int): Frame the interval counts from
+            frame_interval (float): Distance between saved frames
+            max_frames (int): Maximum number of frames to save
+            progress (bool): Print progress every 10 frames
+            
+        Returns:
+            tuple: (frames_read, frames_saved)
+        """
+        # First kept frame at or after first_frame
+        k = max(0, math.ceil((first_frame - start_frame) / frame_interval))
+        while start_frame + round(k * frame_interval) < first_frame:
+            k += 1
+            
+        def targets():
+            for i in itertools.count(k):
+                target = start_frame + round(i * frame_interval)
+                if target >= end_frame:
+                    return
+                yield target
+                
+        return self._extract_targets(cap, output_dir, first_frame, targets(), max_frames, progress)
+        
+    def _extract_targets(self, cap, output_dir, first_frame, targets, max_frames=None, progress=True):
+        """Save the given frames from an open capture.
+        
+        Frames in between are grabbed without being retrieved, which skips
+        the conversion to BGR, and gaps of at least ``seek_min_interval``
+        frames are skipped by seeking. Kept frames are encoded and saved
+        by an ImageWriter while decoding continues. With a frame filter,
+        frames it rejects are not saved and don't count towards
+        ``max_frames``.
+        
+        Shards are named after ``first_frame``, so spans extracted
+        separately into one directory sort in frame order.
+        
+        Args:
+            cap (cv2.VideoCapture): Capture positioned at first_frame
+            output_dir (str): Directory to save frames
+            first_frame (int): Index of the next frame the capture returns
+            targets (iterable): Increasing frame numbers to save, none
+                before first_frame
+            max_frames (int): Maximum number of frames to save
+            progress (bool): Print progress every 10 frames
+            
+        Returns:
+            tuple: (frames_read, frames_saved)
+        """
+        position = first_frame
+        frames_read = 0
+        saved_count = 0
+        decode_seconds = 0.0
+        
+        if self.frame_filter is not None:
+            self.frame_filter.reset()
+            
+        if self.output_format == "shards":
+            sink = ShardWriter(output_dir, prefix=f"frames-{first_frame:06d}")
+        else:
+            sink = DirectorySink(output_dir)
+        writer = ImageWriter(
+            sink,
+            image_format=self.image_format,
+            quality=self.quality,
+            threads=self.writer_threads
+        )
+        
+        try:
+            for target in targets:
+                decode_started = time.perf_counter()
+                
+                # Skip ahead to the next kept frame
+                if self.seek_min_interval and target - position >= self.seek_min_interval:
+                    seek_frame(cap, target)
+                    position = target
+                while position < target and cap.grab():
+                    position += 1
+                    frames_read += 1
+                if position < target or not cap.grab():
+                    break
+                position += 1
+                frames_read += 1
+                
+                ret, frame = cap.retrieve()
+                decode_seconds += time.perf_counter() - decode_started
+                if not ret:
+                    break
+                    
+                # Drop near-duplicates and blurry frames
+                if self.frame_filter is not None and not self.frame_filter.keep(frame):
+                    continue
+                    
+                # Save frame
+                writer.submit(f"frame_{target:06d}", frame)
+                saved_count += 1
+                
+                # Print progress
+                if progress and saved_count % 10 == 0:
+                    print(f"Saved {saved_count} frames...")
+                    
+                # Check if we've reached max frames
+                if max_frames is not None and saved_count >= max_frames:
+                    break
+        except BaseException:
+            # Report this error rather than an encode failure from close
+            writer.close(raise_errors=False)
+            raise
+            
+        writer_stats = writer.close()
+        
+        self.bytes_written += writer_stats["bytes"]
+        self.stats["frames_decoded"] += frames_read
+        self.stats["decode_seconds"] += decode_seconds
+        self.stats["frames_encoded"] += writer_stats["frames"]
+        self.stats["encode_seconds"] += writer_stats["encode_seconds"]
+        self.stats["writer_wait_seconds"] += writer_stats["wait_seconds"]
+        
+        return frames_read, saved_count
+        
+    def _record_extraction(self, started, frames_read, frames_saved):
+        """Update the extraction metrics for one video."""
+        _VIDEO_SECONDS.observe(time.perf_counter() - started)
+        _FRAMES_READ.inc(frames_read)
+        _FRAMES_SAVED.inc(frames_saved)
+        
     @staticmethod
     def create_test_frames(output_dir, num_frames=10, width=640, height=480):
         """Create test frames with various patterns and shapes.
@@ -177,22 +443,10 @@ class FrameExtractor:
         os.makedirs(output_dir, exist_ok=True)
         
         for i in range(num_frames):
-            # Create a blank frame
+            # Circle moving across, rectangle moving up and down
             frame = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            # Draw some shapes
-            # Circle moving across
-            circle_x = int(width * (i / num_frames))
-            cv2.circle(frame, (circle_x, height // 3), 50, (0, 0, 255), -1)
-            
-            # Rectangle moving up and down
-            rect_y = int(height * 0.5 * (1 + np.sin(i * np.pi / (num_frames/2))))
-            cv2.rectangle(frame, (width//2 - 60, rect_y - 30), 
-                         (width//2 + 60, rect_y + 30), (0, 255, 0), -1)
-            
-            # Text
-            cv2.putText(frame, f"Test Frame {i+1}/{num_frames}", (50, 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            draw_test_scene(frame, i, num_frames, pattern="sweep",
+                            label=f"Test Frame {i+1}/{num_frames}")
             
             # Save the frame
             frame_filename = os.path.join(output_dir, f"test_frame_{i:03d}.jpg")
@@ -0,0 +1,238 @@
+"""Per-video motion timelines for motion-gated frame extraction."""
+import cv2
+import hashlib
+import json
+import numpy as np
+import os
+from ..capture.motion_engine import MotionEngine
+from ..config.settings import EXTRACTION_SETTINGS, MOTION_SETTINGS, VIDEO_SETTINGS
+
+# Settings that change the scores; a cached timeline is only reused if they match
+_ENGINE_SETTINGS = (
+    "downscale_levels", "blur_size", "threshold_value", "backend", "backend_options",
+    "roi_polygons", "exclude_polygons",
+)
+
+def default_threshold():
+    """Motion threshold used when none is given.
+    
+    Returns:
+        float: EXTRACTION_SETTINGS["motion_threshold"], or
+            MOTION_SETTINGS["frame_diff_threshold"] if that is None
+    """
+    threshold = EXTRACTION_SETTINGS["motion_threshold"]
+    return MOTION_SETTINGS["frame_diff_threshold"] if threshold is None else threshold
+    
+class MotionTimeline:
+    """Motion score of every frame of a video.
+    
+    Scores come from the same MotionEngine as MotionDetector.calculate_motion,
+    so thresholds mean the same as ``frame_diff_threshold`` when recording.
+    Frame ``i`` has score ``scores[i]``; the first frame scores 0.
+    """
+    
+    def __init__(self, video_path, scores, fps):
+        """Initialize the timeline.
+        
+        Args:
+            video_path (str): Path to the video
+            scores (numpy.ndarray): Motion score per frame
+            fps (float): Frame rate of the video
+        """
+        self.video_path = video_path
+        self.scores = scores
+        self.fps = fps
+        
+    def __len__(self):
+        """Number of frames."""
+        return len(self.scores)
+        
+    @property
+    def peak(self):
+        """Highest motion score in the video."""
+        return float(self.scores.max()) if len(self.scores) else 0.0
+        
+    @classmethod
+    def compute(cls, video_path, progress=True):
+        """Score every frame of a video.
+        
+        Every frame has to be decoded, since each score compares a frame
+        with the one before it; scoring itself runs on the engine's
+        downscaled image.
+        
+        Args:
+            video_path (str): Path to the video
+            progress (bool): Print progress every 1000 frames
+            
+        Returns:
+            MotionTimeline: The timeline
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+            
+        engine = MotionEngine()
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        scores = []
+        
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                score, _ = engine.score(frame)
+                scores.append(score)
+                
+                if progress and len(scores) % 1000 == 0:
+                    print(f"Scored {len(scores)} frames...")
+        finally:
+            cap.release()
+            
+        return cls(video_path, np.array(scores, dtype=np.float32), fps)
+        
+    def active(self, threshold=None, pre_seconds=None, post_seconds=None):
+        """Mark the frames with motion and the windows around them.
+        
+        Args:
+            threshold (float): Lowest motion score (default:
+                EXTRACTION_SETTINGS["motion_threshold"], or
+                MOTION_SETTINGS["frame_diff_threshold"] if that is None)
+            pre_seconds (float): Also mark frames this long before motion
+            post_seconds (float): Also mark frames this long after motion
+            
+        Returns:
+            numpy.ndarray: One boolean per frame
+        """
+        if threshold is None:
+            threshold = default_threshold()
+        if pre_seconds is None:
+            pre_seconds = EXTRACTION_SETTINGS["motion_pre_seconds"]
+        if post_seconds is None:
+            post_seconds = EXTRACTION_SETTINGS["motion_post_seconds"]
+            
+        fps = self.fps if self.fps > 0 else VIDEO_SETTINGS["fps"]
+        pre = int(round(pre_seconds * fps))
+        post = int(round(post_seconds * fps))
+        
+        # +1 where a window opens and -1 after it closes; windows overlap freely
+        count = len(self.scores)
+        hits = np.flatnonzero(self.scores >= threshold)
+        edges = np.zeros(count + 1, dtype=np.int32)
+        np.add.at(edges, np.maximum(hits - pre, 0), 1)
+        np.add.at(edges, np.minimum(hits + post + 1, count), -1)
+        return np.cumsum(edges[:count]) > 0
+        
+    def segments(self, threshold=None, pre_seconds=None, post_seconds=None):
+        """Spans of frames with motion, including the windows around it.
+        
+        Args:
+            threshold (float): Lowest motion score
+            pre_seconds (float): Seconds kept before motion
+            post_seconds (float): Seconds kept after motion
+            
+        Returns:
+            list: (first_frame, end_frame) per span, end exclusive
+        """
+        active = self.active(threshold, pre_seconds, post_seconds).astype(np.int8)
+        changes = np.flatnonzero(np.diff(np.concatenate(([0], active, [0]))))
+        return [(int(first), int(end)) for first, end in zip(changes[::2], changes[1::2])]
+        
+    def frames(self, threshold=None, pre_seconds=None, post_seconds=None, frame_interval=1):
+        """Frames to extract: every Nth frame of the video that is in a motion span.
+        
+        Args:
+            threshold (float): Lowest motion score
+            pre_seconds (float): Seconds kept before motion
+            post_seconds (float): Seconds kept after motion
+            frame_interval (float): Distance between kept frames, counted
+                from the start of the video
+                
+        Returns:
+            numpy.ndarray: Frame numbers in increasing order
+        """
+        active = self.active(threshold, pre_seconds, post_seconds)
+        candidates = np.unique(np.round(np.arange(0, len(active), frame_interval)).astype(np.int64))
+        candidates = candidates[candidates < len(active)]
+        return candidates[active[candidates]]
+        
+    def save(self, path, signature):
+        """Write the timeline to a cache file atomically.
+        
+        Args:
+            path (str): Cache file (.npz)
+            signature (dict): What the scores depend on, checked on load
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, scores=self.scores, fps=self.fps, signature=json.dumps(signature))
+        os.replace(tmp_path, path)
+        
+    @classmethod
+    def load(cls, video_path, path, signature):
+        """Read a cached timeline.
+        
+        Args:
+            video_path (str): Path to the video
+            path (str): Cache file
+            signature (dict): Expected signature
+            
+        Returns:
+            MotionTimeline: The timeline, or None if there is no cache file
+                or it was made from a different video or settings
+        """
+        try:
+            with np.load(path) as data:
+                if json.loads(str(data["signature"])) != signature:
+                    return None
+                return cls(video_path, data["scores"], float(data["fps"]))
+        except (OSError, KeyError, ValueError):
+            return None
+            
+def motion_timeline(video_path, cache_dir=None, refresh=False, catalog=None, progress=True):
+    """Get the motion timeline of a video, from the cache if possible.
+    
+    The cache entry is keyed by the video's path and stores its size and
+    mtime together with the motion settings, so a changed video or
+    changed settings are scored again.
+    
+    Args:
+        video_path (str): Path to the video
+        cache_dir (str): Directory of cached timelines (default:
+            EXTRACTION_SETTINGS["motion_cache_dir"])
+        refresh (bool): Score the video even if a cached timeline exists
+        catalog (VideoCatalog): Store the peak score as the video's
+            motion_score
+        progress (bool): Print progress while scoring
+        
+    Returns:
+        MotionTimeline: The timeline
+    """
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+    cache_dir = cache_dir or EXTRACTION_SETTINGS["motion_cache_dir"]
+    path = os.path.abspath(video_path)
+    stat = os.stat(path)
+    signature = {
+        "path": path,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "settings": {key: MOTION_SETTINGS[key] for key in _ENGINE_SETTINGS},
+    }
+    # Round-trip so tuples compare equal to the lists read back
+    signature = json.loads(json.dumps(signature))
+    
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    cache_path = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{digest}.npz")
+    
+    timeline = None if refresh else MotionTimeline.load(video_path, cache_path, signature)
+    if timeline is None:
+        timeline = MotionTimeline.compute(video_path, progress)
+        timeline.save(cache_path, signature)
+        
+    if catalog is not None:
+        catalog.get(path)
+        catalog.set_motion_score(path, timeline.peak)
+        
+    return timeline
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""Tar shard output for extracted frames, WebDataset style."""
+import cv2
+import glob
+import io
+import numpy as np
+import os
+import tarfile
+import threading
+import time
+from ..config.settings import EXTRACTION_SETTINGS
+
+SHARD_EXTENSION = ".tar"
+INDEX_EXTENSION = ".idx"
+# Suffix of shards still being written
+TEMP_EXTENSION = ".tmp"
+
+class ShardWriter:
+    """Stream encoded frames into size-capped tar shards.
+    
+    Shards are named ``<prefix>-000000.tar``, ``<prefix>-000001.tar``, ...
+    and each has a ``.idx`` sidecar with one ``name<TAB>offset<TAB>size``
+    line per member, giving the position of its data in the tar. A shard
+    and its index are written under a ``.tmp`` name and renamed once the
+    shard is complete, so an interrupted run never leaves a truncated
+    ``.tar`` behind. If shards with the same prefix already exist,
+    numbering continues after them, so earlier shards are never rewritten.
+    
+    Used as an ImageWriter sink: images arrive from several threads and
+    are written in submission order.
+    """
+    
+    def __init__(self, output_dir, prefix="frames", max_shard_mb=None, max_shard_frames=None):
+        """Initialize the writer.
+        
+        Args:
+            output_dir (str): Directory for the shards
+            prefix (str): Shard name prefix
+            max_shard_mb (float): Start a new shard before a finished shard
+                would exceed this size (a single larger frame gets a shard
+                of its own)
+            max_shard_frames (int): Start a new shard after this many frames
+        """
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_shard_bytes = (max_shard_mb or EXTRACTION_SETTINGS["shard_max_mb"]) * 1024 * 1024
+        self.max_shard_frames = max_shard_frames or EXTRACTION_SETTINGS["shard_max_frames"]
+        os.makedirs(output_dir, exist_ok=True)
+        
+        existing = glob.glob(os.path.join(output_dir, f"{glob.escape(prefix)}-[0-9]*{SHARD_EXTENSION}"))
+        self._next_index = len(existing)
+        while os.path.exists(self._shard_path(self._next_index)):
+            self._next_index += 1
+            
+        self.shards = []
+        self._path = None
+        self._tar = None
+        self._index = None
+        self._shard_frames = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._next_seq = 0
+        self._mtime = time.time()
+        
+    def write(self, seq, name, data):
+        """Add an encoded image; written once all earlier sequence numbers are.
+        
+        Args:
+            seq (int): Position of the image in submission order
+            name (str): Member name, e.g. frame_000042.jpg
+            data: Encoded image bytes
+        """
+        with self._lock:
+            self._pending[seq] = (name, data)
+            while self._next_seq in self._pending:
+                self._append(*self._pending.pop(self._next_seq))
+                self._next_seq += 1
+                
+    def close(self):
+        """Write anything still buffered and finish the current shard."""
+        with self._lock:
+            # Gaps are left by frames that failed to encode
+            for seq in sorted(self._pending):
+                self._append(*self._pending[seq])
+            self._pending.clear()
+            self._close_shard()
+            
+    def _append(self, name, data):
+        """Append one member to the current shard, starting a new one if full."""
+        data = memoryview(data).cast("B")
+        # Data is padded to whole blocks and preceded by a header block
+        padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        
+        if self._tar is not None and (
+            self._closed_size(self._tar.offset + tarfile.BLOCKSIZE + padded) > self.max_shard_bytes
+            or self._shard_frames >= self.max_shard_frames
+        ):
+            self._close_shard()
+        if self._tar is None:
+            self._open_shard()
+            
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        self._tar.addfile(info, io.BytesIO(data))
+        self._index.write(f"{name}\t{self._tar.offset - padded}\t{info.size}\n")
+        self._shard_frames += 1
+        
+    @staticmethod
+    def _closed_size(offset):
+        """Size of a shard closed after ``offset`` bytes of members.
+        
+        Closing adds two zero blocks and pads the archive to a whole record.
+        """
+        end = offset + 2 * tarfile.BLOCKSIZE
+        return -(-end // tarfile.RECORDSIZE) * tarfile.RECORDSIZE
+        
+    def _open_shard(self):
+        """Start the next shard and its index under temporary names."""
+        self._path = self._shard_path(self._next_index)
+        self._next_index += 1
+        self._tar = tarfile.open(self._path + TEMP_EXTENSION, "w", format=tarfile.USTAR_FORMAT)
+        self._index = open(self._path + INDEX_EXTENSION + TEMP_EXTENSION, "w")
+        self._shard_frames = 0
+        
+    def _close_shard(self):
+        """Finish the current shard, if any, and give it its final name."""
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._index.close()
+        
+        # The index first: a shard without one is still readable by scanning it
+        index_path = self._path + INDEX_EXTENSION
+        os.replace(index_path + TEMP_EXTENSION, index_path)
+        os.replace(self._path + TEMP_EXTENSION, self._path)
+        self.shards.append(self._path)
+        
+        self._path = None
+        self._tar = None
+        self._index = None
+        
+    def _shard_path(self, index):
+        """Path of shard number ``index``."""
+        return os.path.join(self.output_dir, f"{self.prefix}-{index:06d}{SHARD_EXTENSION}")
+        
+class ShardReader:
+    """Read frames from the tar shards in a directory.
+    
+    Iterating streams every shard in name order. ``read`` jumps straight
+    to one member through the index sidecars; shards without a sidecar
+    (e.g. packed by another tool) are indexed by scanning them. Shards
+    still being written (``.tar.tmp``) are ignored.
+    """
+    
+    def __init__(self, path):
+        """Open a shard directory or a single shard.
+        
+        Args:
+            path (str): Directory of shards or path to one .tar shard
+        """
+        if os.path.isdir(path):
+            self.shards = sorted(glob.glob(os.path.join(glob.escape(path), f"*{SHARD_EXTENSION}")))
+        else:
+            self.shards = [path]
+            
+        self._index = None
+        self._files = {}
+        
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+        
+    def __iter__(self):
+        """Yield (name, data) for every member, shard by shard."""
+        for shard in self.shards:
+            with tarfile.open(shard, "r|") as tar:
+                for member in tar:
+                    if member.isfile():
+                        yield member.name, tar.extractfile(member).read()
+                        
+    def __len__(self):
+        """Number of members."""
+        return len(self.index)
+        
+    def __contains__(self, name):
+        """Check whether a member exists."""
+        return name in self.index
+        
+    @property
+    def index(self):
+        """Member name -> (shard, offset, size), loaded on first use."""
+        if self._index is None:
+            self._index = {}
+            for shard in self.shards:
+                for name, offset, size in self._read_index(shard):
+                    self._index[name] = (shard, offset, size)
+        return self._index
+        
+    def names(self):
+        """Member names in shard order.
+        
+        Returns:
+            list: Names, e.g. frame_000042.jpg
+        """
+        return list(self.index)
+        
+    def read(self, name):
+        """Read one member's bytes without scanning the shards.
+        
+        Args:
+            name (str): Member name
+            
+        Returns:
+            bytes: The encoded image
+        """
+        try:
+            shard, offset, size = self.index[name]
+        except KeyError:
+            raise KeyError(f"No frame named {name}") from None
+            
+        f = self._files.get(shard)
+        if f is None:
+            f = self._files[shard] = open(shard, "rb")
+        f.seek(offset)
+        return f.read(size)
+        
+    def read_frame(self, name):
+        """Read and decode one frame.
+        
+        Args:
+            name (str): Member name
+            
+        Returns:
+            numpy.ndarray: The decoded image
+        """
+        data = np.frombuffer(self.read(name), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+        
+    def close(self):
+        """Close the open shard files."""
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        
+    @staticmethod
+    def _read_index(shard):
+        """Entries of a shard's index sidecar, scanning the shard if there is none."""
+        index_path = shard + INDEX_EXTENSION
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    name, offset, size = line.rstrip("\n").split("\t")
+                    yield name, int(offset), int(size)
+            return
+            
+        with tarfile.open(shard, "r") as tar:
+            for member in tar:
+                if member.isfile():
+                    yield member.name, member.offset_data, member.size
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Threaded image encoding and writing for extracted frames."""
+import cv2
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import EXTRACTION_SETTINGS
+from ..utils.metrics import METRICS
+
+_WRITE_SECONDS = METRICS.histogram("extractor_write_seconds", "Time to encode and save one image")
+_BYTES = METRICS.counter("extractor_bytes_written_total", "Bytes of saved images")
+
+# Image format -> (file extension, OpenCV quality flag, settings key)
+IMAGE_FORMATS = {
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, "jpeg_quality"),
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION, "png_compression"),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, "webp_quality"),
+}
+
+def encode_options(image_format=None, quality=None):
+    """File extension and OpenCV parameters for an image format.
+    
+    Args:
+        image_format (str): "jpg", "png" or "webp" (default:
+            EXTRACTION_SETTINGS["image_format"])
+        quality (int): JPEG/WebP quality (0-100) or PNG compression (0-9)
+            (default: from EXTRACTION_SETTINGS)
+            
+    Returns:
+        tuple: (extension, params) for cv2.imencode
+    """
+    image_format = (image_format or EXTRACTION_SETTINGS["image_format"]).lower()
+    if image_format == "jpeg":
+        image_format = "jpg"
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format: {image_format}")
+        
+    extension, flag, setting = IMAGE_FORMATS[image_format]
+    if quality is None:
+        quality = EXTRACTION_SETTINGS[setting]
+        
+    return extension, [flag, int(quality)]
+    
+class DirectorySink:
+    """Save encoded images as files in a directory."""
+    
+    def __init__(self, output_dir):
+        """Initialize the sink.
+        
+        Args:
+            output_dir (str): Directory for the images
+        """
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        
+    def write(self, seq, name, data):
+        """Save one encoded image.
+        
+        Args:
+            seq (int): Position of the image in submission order
+            name (str): File name
+            data: Encoded image bytes
+        """
+        with open(os.path.join(self.output_dir, name), "wb") as f:
+            f.write(data)
+            
+    def close(self):
+        """Nothing to flush; files are complete once written."""
+        
+class ImageWriter:
+    """Encode frames and hand them to a sink on worker threads.
+    
+    OpenCV releases the GIL while encoding, so the decode loop keeps
+    running while earlier frames are compressed and written. At most
+    ``queue_size`` frames wait at a time; ``submit`` blocks beyond that.
+    Sinks receive each image with its submission sequence number, so
+    sinks that need order can restore it.
+    """
+    
+    def __init__(self, sink, image_format=None, quality=None, threads=None, queue_size=None):
+        """Initialize the writer.
+        
+        Args:
+            sink: Object with write(seq, name, data) and close(), e.g. DirectorySink
+            image_format (str): "jpg", "png" or "webp"
+            quality (int): JPEG/WebP quality or PNG compression level
+            threads (int): Encoder threads (0 to encode on the calling thread)
+            queue_size (int): Frames allowed to wait for encoding
+        """
+        self.sink = sink
+        self.extension, self.params = encode_options(image_format, quality)
+        self.threads = EXTRACTION_SETTINGS["writer_threads"] if threads is None else threads
+        self.queue_size = queue_size or EXTRACTION_SETTINGS["writer_queue_size"]
+        
+        self._pool = None
+        if self.threads > 0:
+            self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix="image-writer")
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self._error = None
+        self._seq = 0
+        
+        # Stats
+        self.frames = 0
+        self.bytes = 0
+        self.encode_seconds = 0.0
+        self.write_seconds = 0.0
+        self.wait_seconds = 0.0
+        
+    def submit(self, stem, frame):
+        """Queue a frame for encoding.
+        
+        The writer keeps a reference to the frame until it is encoded, so
+        the caller must not reuse the array.
+        
+        Args:
+            stem (str): File name without extension
+            frame (numpy.ndarray): Frame to encode
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Image writer failed: {self._error}")
+            
+        seq = self._seq
+        self._seq += 1
+        name = stem + self.extension
+        
+        if self._pool is None:
+            self._slots.acquire()
+            self._encode(seq, name, frame)
+            return
+            
+        started = time.perf_counter()
+        self._slots.acquire()
+        self.wait_seconds += time.perf_counter() - started
+        self._pool.submit(self._encode, seq, name, frame)
+        
+    def close(self, raise_errors=True):
+        """Wait for queued frames, then close the sink.
+        
+        Args:
+            raise_errors (bool): Raise if any frame failed to encode or
+                write; False when closing because of another error
+                
+        Returns:
+            dict: Final stats
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.sink.close()
+        
+        if raise_errors and self._error is not None:
+            raise RuntimeError(f"Image writer failed: {self._error}")
+            
+        return self.get_stats()
+        
+    def get_stats(self):
+        """Get writer stats.
+        
+        Returns:
+            dict: Frames, bytes, time spent encoding and writing (summed
+                over threads), time the caller waited for a free slot,
+                and encode throughput per thread
+        """
+        with self._lock:
+            return {
+                "frames": self.frames,
+                "bytes": self.bytes,
+                "threads": self.threads,
+                "encode_seconds": self.encode_seconds,
+                "write_seconds": self.write_seconds,
+                "wait_seconds": self.wait_seconds,
+                "encode_fps": self.frames / self.encode_seconds if self.encode_seconds > 0 else 0.0,
+            }
+            
+    def _encode(self, seq, name, frame):
+        """Encode one frame and pass it to the sink."""
+        try:
+            started = time.perf_counter()
+            ok, encoded = cv2.imencode(self.extension, frame, self.params)
+            if not ok:
+                raise ValueError(f"Could not encode {name}")
+            encoded_at = time.perf_counter()
+            self.sink.write(seq, name, encoded)
+            finished = time.perf_counter()
+            
+            with self._lock:
+                self.frames += 1
+                self.bytes += encoded.size
+                self.encode_seconds += encoded_at - started
+                self.write_seconds += finished - encoded_at
+                
+            if METRICS.enabled:
+                _WRITE_SECONDS.observe(finished - started)
+                _BYTES.inc(encoded.size)
+        except Exception as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._slots.release()
\ No newline at end of file
@@ -0,0 +1,360 @@
+"""SQLite catalog of recorded videos and their probed metadata."""
+import cv2
+import fnmatch
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import CATALOG_SETTINGS, PATHS
+from .files import video_start_time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    path TEXT PRIMARY KEY,
+    camera TEXT,
+    size INTEGER,
+    mtime REAL,
+    ctime REAL,
+    recorded REAL,
+    container TEXT,
+    codec TEXT,
+    fps REAL,
+    frames INTEGER,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    motion_score REAL
+);
+CREATE INDEX IF NOT EXISTS videos_recorded ON videos (recorded);
+CREATE INDEX IF NOT EXISTS videos_camera ON videos (camera, recorded);
+"""
+
+_COLUMNS = (
+    "path", "camera", "size", "mtime", "ctime", "recorded", "container", "codec",
+    "fps", "frames", "duration", "width", "height", "motion_score",
+)
+
+def probe_video(video_path):
+    """Read a video's container and stream metadata.
+    
+    Args:
+        video_path (str): Path to the video
+        
+    Returns:
+        dict: container, codec, fps, frames, duration, width and height
+            (None where the video can't be read)
+    """
+    info = {
+        "container": os.path.splitext(video_path)[1].lstrip(".").lower() or None,
+        "codec": None,
+        "fps": None,
+        "frames": None,
+        "duration": None,
+        "width": None,
+        "height": None,
+    }
+    
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return info
+            
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        info["codec"] = "".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)).strip("\0 ") or None
+        info["fps"] = fps or None
+        info["frames"] = frames if frames > 0 else None
+        info["duration"] = frames / fps if fps > 0 and frames > 0 else None
+        info["width"] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None
+        info["height"] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None
+        return info
+    finally:
+        cap.release()
+        
+class VideoCatalog:
+    """Persistent index of the videos under a directory.
+    
+    Each entry caches the file's size and mtime together with its probed
+    metadata, so a scan only probes new or changed files and queries are
+    answered from the database without touching the filesystem. The camera
+    of a video is the name of the directory it is in (the supervisor
+    records each camera into its own directory); videos directly in the
+    catalog root have no camera.
+    
+    Motion scores are not probed. They stay empty until stored with
+    ``set_motion_score``, e.g. by motion-gated frame extraction.
+    """
+    
+    def __init__(self, db_path=None, root=None, workers=None):
+        """Open or create a catalog.
+        
+        Args:
+            db_path (str): SQLite database file
+            root (str): Directory scanned by default (default: PATHS["videos_dir"])
+            workers (int): Threads probing videos during a scan
+        """
+        self.db_path = db_path or CATALOG_SETTINGS["db_path"]
+        self.root = os.path.abspath(root or PATHS["videos_dir"])
+        self.workers = workers or CATALOG_SETTINGS["scan_workers"]
+        self.patterns = CATALOG_SETTINGS["patterns"]
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        
+        # One connection shared by all threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+        
+    def __len__(self):
+        """Number of cataloged videos."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+            
+    def scan(self, directory=None, workers=None, prune=True):
+        """Bring the catalog up to date with a directory tree.
+        
+        Files whose size and mtime match their entry are skipped; new and
+        changed files are probed in parallel.
+        
+        Args:
+            directory (str): Directory to scan (default: the catalog root)
+            workers (int): Probe threads (default: the catalog's setting)
+            prune (bool): Remove entries for files that no longer exist
+            
+        Returns:
+            dict: Stats (files, probed, unchanged, removed)
+        """
+        directory = os.path.abspath(directory or self.root)
+        workers = workers or self.workers
+        
+        found = {path: stat for path, stat in self._walk(directory)}
+        known = {
+            row["path"]: (row["size"], row["mtime"])
+            for row in self._select("path, size, mtime", *self._under(directory))
+        }
+        
+        changed = [
+            (path, stat) for path, stat in found.items()
+            if known.get(path) != (stat.st_size, stat.st_mtime)
+        ]
+        
+        # OpenCV releases the GIL while opening and probing a file
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            entries = list(pool.map(lambda item: self._entry(*item), changed))
+            
+        removed = [path for path in known if path not in found] if prune else []
+        
+        with self._lock, self._db:
+            self._store(entries)
+            self._db.executemany("DELETE FROM videos WHERE path = ?", [(p,) for p in removed])
+            
+        return {
+            "files": len(found),
+            "probed": len(entries),
+            "unchanged": len(found) - len(entries),
+            "removed": len(removed),
+        }
+        
+    def get(self, video_path, refresh=True):
+        """Get the entry for one video.
+        
+        Args:
+            video_path (str): Path to the video
+            refresh (bool): Stat the file and re-probe it if it changed (or
+                add it if it isn't cataloged yet)
+                
+        Returns:
+            dict: The entry, or None if the video isn't cataloged (or no
+                longer exists, when refreshing)
+        """
+        path = os.path.abspath(video_path)
+        rows = self._select("*", "path = ?", [path])
+        entry = dict(rows[0]) if rows else None
+        
+        if not refresh:
+            return entry
+            
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if entry is not None:
+                self.remove(path)
+            return None
+            
+        if entry is None or (entry["size"], entry["mtime"]) != (stat.st_size, stat.st_mtime):
+            entry = self._entry(path, stat)
+            with self._lock, self._db:
+                self._store([entry])
+                
+        return entry
+        
+    def query(self, start=None, end=None, camera=None, min_duration=None, max_duration=None,
+              min_motion_score=None, directory=None, order="recorded"):
+        """Find cataloged videos without touching the filesystem.
+        
+        Args:
+            start (float or datetime): Recorded at or after this time
+            end (float or datetime): Recorded before this time
+            camera (str): Camera (directory) name
+            min_duration (float): Shortest duration in seconds
+            max_duration (float): Longest duration in seconds
+            min_motion_score (float): Lowest motion score; videos that
+                have not been scored never match
+            directory (str): Only videos under this directory
+            order (str): Column to sort by
+            
+        Returns:
+            list: Matching entries as dicts
+        """
+        if order not in _COLUMNS:
+            raise ValueError(f"Unknown column: {order}")
+            
+        clauses = []
+        params = []
+        for clause, value in (
+            ("recorded >= ?", _timestamp(start)),
+            ("recorded < ?", _timestamp(end)),
+            ("camera = ?", camera),
+            ("duration >= ?", min_duration),
+            ("duration <= ?", max_duration),
+            ("motion_score >= ?", min_motion_score),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+                
+        if directory is not None:
+            clause, values = self._under(os.path.abspath(directory))
+            clauses.append(clause)
+            params.extend(values)
+            
+        where = " AND ".join(clauses) or "1"
+        return [dict(row) for row in self._select("*", where, params, order=f"{order}, path")]
+        
+    def list_files(self, directory=None, pattern="*.mp4", recursive=False):
+        """List cataloged videos like utils.files.list_video_files.
+        
+        Args:
+            directory (str): Directory to list (default: the catalog root)
+            pattern (str): File name pattern
+            recursive (bool): Include subdirectories
+            
+        Returns:
+            list: Sorted video paths
+        """
+        directory = os.path.abspath(directory or self.root)
+        paths = [row["path"] for row in self._select("path", *self._under(directory))]
+        
+        return sorted(
+            path for path in paths
+            if fnmatch.fnmatch(os.path.basename(path), pattern)
+            and (recursive or os.path.dirname(path) == directory)
+        )
+        
+    def set_motion_score(self, video_path, score):
+        """Store a motion score for a cataloged video.
+        
+        The score is cleared again when the file changes.
+        
+        Args:
+            video_path (str): Path to the video
+            score (float): Motion score
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE videos SET motion_score = ? WHERE path = ?",
+                (score, os.path.abspath(video_path))
+            )
+            
+    def remove(self, video_path):
+        """Remove a video from the catalog.
+        
+        Args:
+            video_path (str): Path to the video
+        """
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM videos WHERE path = ?", (os.path.abspath(video_path),))
+            
+    def _walk(self, directory):
+        """Yield (path, stat) for the videos under a directory."""
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+            
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk(entry.path)
+                elif entry.is_file() and self._matches(entry.name):
+                    yield os.path.abspath(entry.path), entry.stat()
+            except FileNotFoundError:
+                continue
+                
+    def _matches(self, name):
+        """Check a file name against the video patterns."""
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+        
+    def _entry(self, path, stat):
+        """Build the entry for a file, probing it."""
+        parent = os.path.dirname(path)
+        entry = {
+            "path": path,
+            "camera": os.path.basename(parent) if parent != self.root else None,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "ctime": stat.st_ctime,
+            "recorded": video_start_time(path),
+            "motion_score": None,
+        }
+        entry.update(probe_video(path))
+        return entry
+        
+    def _store(self, entries):
+        """Insert or replace entries; the caller holds the lock and transaction."""
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO videos ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+            [tuple(entry[column] for column in _COLUMNS) for entry in entries]
+        )
+        
+    def _select(self, columns, where, params, order=None):
+        """Run a SELECT on the videos table."""
+        sql = f"SELECT {columns} FROM videos WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+            
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+            
+    @staticmethod
+    def _under(directory):
+        """WHERE clause and parameters for paths under a directory."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        # Escape LIKE wildcards in the directory name
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "path LIKE ? ESCAPE '\\'", [escaped + "%"]
+        
+def _timestamp(value):
+    """Seconds since the epoch for a datetime or number (None stays None)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
\ No newline at end of file
@@ -1,18 +1,43 @@
 """File utilities for managing media files."""
 import os
 import glob
+import fnmatch
+import hashlib
+import json
+import re
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from ..config.settings import PATHS
+from ..config.settings import ORGANIZE_SETTINGS, PATHS
 
-def list_video_files(directory=None, pattern="*.mp4", recursive=False):
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+    
+ORGANIZE_MODES = ("copy", "move", "hardlink", "reflink")
+
+# Timestamps in the file names written by the recorder and motion detector
+_NAME_PATTERNS = (
+    (re.compile(r"(\d{8}_\d{6})"), "%Y%m%d_%H%M%S"),
+    (re.compile(r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})"), "%Y-%m-%d_%H-%M-%S"),
+)
+
+# ioctl that clones a file's extents (btrfs, XFS), from linux/fs.h
+FICLONE = 0x40049409
+
+def list_video_files(directory=None, pattern="*.mp4", recursive=False, catalog=None):
     """List video files in a directory.
     
     Args:
         directory (str): Directory to search
         pattern (str): File pattern to match
         recursive (bool): Search subdirectories
+        catalog (VideoCatalog): Answer from this catalog instead of the
+            filesystem (returns absolute paths; call catalog.scan() to
+            pick up new files)
         
     Returns:
         list: List of video file paths
@@ -20,20 +45,51 @@ def list_video_files(directory=None, pattern="*.mp4", recursive=False):
     if directory is None:
         directory = PATHS["videos_dir"]
         
+    if catalog is not None:
+        return catalog.list_files(directory, pattern, recursive)
+        
     search_pattern = os.path.join(directory, "**" if recursive else "", pattern)
     video_files = glob.glob(search_pattern, recursive=recursive)
     
     return sorted(video_files)
     
-def get_video_info(video_path):
+def get_video_info(video_path, catalog=None):
     """Get information about a video file.
     
     Args:
         video_path (str): Path to video file
+        catalog (VideoCatalog): Use the catalog's cached entry, which adds
+            the probed metadata (codec, fps, frames, duration, width,
+            height); the video is probed only if it is new or changed
         
     Returns:
         dict: Video information
     """
+    if catalog is not None:
+        entry = catalog.get(video_path)
+        if entry is None:
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+            
+        file_path = Path(entry["path"])
+        return {
+            "filename": file_path.name,
+            "path": str(file_path),
+            "size_bytes": entry["size"],
+            "size_mb": entry["size"] / (1024 * 1024),
+            "created": datetime.fromtimestamp(entry["ctime"]),
+            "modified": datetime.fromtimestamp(entry["mtime"]),
+            "extension": file_path.suffix,
+            "recorded": datetime.fromtimestamp(entry["recorded"]),
+            "camera": entry["camera"],
+            "codec": entry["codec"],
+            "fps": entry["fps"],
+            "frames": entry["frames"],
+            "duration": entry["duration"],
+            "width": entry["width"],
+            "height": entry["height"],
+            "motion_score": entry["motion_score"],
+        }
+        
     file_stats = os.stat(video_path)
     file_path = Path(video_path)
     
@@ -47,19 +103,61 @@ def get_video_info(video_path):
         "extension": file_path.suffix,
     }
     
+def video_start_time(video_path):
+    """Guess when a video was recorded.
+    
+    Uses the timestamp in the file name if it has one, otherwise the
+    file's modification time.
+    
+    Args:
+        video_path (str): Path to the video
+        
+    Returns:
+        float: Start time in seconds since the epoch
+    """
+    name = os.path.basename(video_path)
+    
+    for pattern, fmt in _NAME_PATTERNS:
+        match = pattern.search(name)
+        if match:
+            try:
+                return datetime.strptime(match.group(1), fmt).timestamp()
+            except ValueError:
+                pass
+                
+    return os.path.getmtime(video_path)
+    
 def create_directory_structure():
     """Create standard directory structure for the project."""
     for path in PATHS.values():
         os.makedirs(path, exist_ok=True)
         print(f"Created directory: {path}")
         
-def organize_videos_by_date(source_dir=None, target_base_dir=None):
+def organize_videos_by_date(source_dir=None, target_base_dir=None, mode=None, dedupe=None,
+                            workers=None, dry_run=False, manifest_path=None):
     """Organize videos by date (YYYY-MM-DD folders).
     
+    Videos are copied, moved, hard-linked or reflinked (copy-on-write
+    clones, on filesystems that support them) into a folder per
+    modification date. A manifest in the target directory records what
+    has been organized, so later runs only look at new or changed files.
+    With dedupe, files whose content already exists in the target are
+    not organized again; only files that share a size with another file
+    are hashed, and hashes are cached in the manifest.
+    
     Args:
         source_dir (str): Source directory
         target_base_dir (str): Target base directory
+        mode (str): "copy", "move", "hardlink" or "reflink"
+        dedupe (bool): Skip files whose content is already organized
+        workers (int): Files hashed and transferred in parallel
+        dry_run (bool): Report what would happen without changing anything
+        manifest_path (str): Manifest file (default: in the target directory)
         
+    Files that fail to transfer (e.g. on a full disk) are reported and
+    counted in ``errors``; the manifest is saved either way, so it always
+    records what was actually organized.
+    
     Returns:
         dict: Statistics about the operation
     """
@@ -69,48 +167,233 @@ def organize_videos_by_date(source_dir=None, target_base_dir=None):
     if target_base_dir is None:
         target_base_dir = os.path.join(PATHS["videos_dir"], "organized")
         
+    mode = mode or ORGANIZE_SETTINGS["mode"]
+    if mode not in ORGANIZE_MODES:
+        raise ValueError(f"Unknown organize mode: {mode}")
+    dedupe = ORGANIZE_SETTINGS["dedupe"] if dedupe is None else dedupe
+    workers = workers or ORGANIZE_SETTINGS["workers"]
+    manifest_path = manifest_path or os.path.join(target_base_dir, ORGANIZE_SETTINGS["manifest_name"])
+    
     # Create target directory
-    os.makedirs(target_base_dir, exist_ok=True)
+    if not dry_run:
+        os.makedirs(target_base_dir, exist_ok=True)
+        
+    manifest = _load_manifest(manifest_path)
     
-    # Find all video files
+    # Find all video files, skipping those organized by an earlier run
     video_patterns = ["*.mp4", "*.avi", "*.mov"]
     video_files = []
+    found = set()
+    unchanged = 0
     
-    for pattern in video_patterns:
-        video_files.extend(glob.glob(os.path.join(source_dir, pattern)))
+    for entry in sorted(os.scandir(source_dir), key=lambda e: e.name):
+        if not entry.is_file() or not any(fnmatch.fnmatch(entry.name, p) for p in video_patterns):
+            continue
+        stat = entry.stat()
+        path = os.path.abspath(entry.path)
+        found.add(path)
+        known = manifest["sources"].get(path)
+        if known and (known["size"], known["mtime"]) == (stat.st_size, stat.st_mtime):
+            unchanged += 1
+            continue
+        video_files.append((path, stat))
         
+    # Forget sources that were moved or deleted since the last run
+    source_root = os.path.abspath(source_dir)
+    for path in list(manifest["sources"]):
+        if os.path.dirname(path) == source_root and path not in found:
+            del manifest["sources"][path]
+            
     # Organize statistics
     stats = {
-        "total_files": len(video_files),
+        "mode": mode,
+        "dry_run": dry_run,
+        "total_files": len(video_files) + unchanged,
         "organized_files": 0,
+        "unchanged_files": unchanged,
         "skipped_files": 0,
+        "duplicate_files": 0,
+        "errors": 0,
+        "bytes_transferred": 0,
+        "bytes_saved": 0,
         "created_folders": set(),
     }
     
-    # Process each file
-    for video_file in video_files:
-        # Get file info
-        file_info = get_video_info(video_file)
-        file_date = file_info["modified"].strftime("%Y-%m-%d")
-        
-        # Create date folder
-        date_folder = os.path.join(target_base_dir, file_date)
-        os.makedirs(date_folder, exist_ok=True)
-        stats["created_folders"].add(date_folder)
+    # Hash only files that share their size with another new or organized file
+    hashes = {}
+    if dedupe:
+        sizes = Counter(stat.st_size for _, stat in video_files)
+        sizes.update(manifest["targets"].values())
+        to_hash = [(path, stat) for path, stat in video_files if sizes[stat.st_size] > 1]
+        for path, size in list(manifest["targets"].items()):
+            if sizes[size] > 1:
+                try:
+                    to_hash.append((path, os.stat(path)))
+                except FileNotFoundError:
+                    del manifest["targets"][path]
         
-        # Copy file to date folder
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = pool.map(lambda item: _hash_file(*item, manifest["hashes"]), to_hash)
+            for (path, _), digest in zip(to_hash, digests):
+                hashes[path] = digest
+                
+    # Content already organized, by hash
+    organized = {hashes[path]: path for path in manifest["targets"] if path in hashes}
+    
+    # Decide what to do with each file, in order
+    transfers = []
+    duplicates = []
+    for video_file, stat in video_files:
+        file_date = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+        date_folder = os.path.join(os.path.abspath(target_base_dir), file_date)
         target_path = os.path.join(date_folder, os.path.basename(video_file))
+        digest = hashes.get(video_file)
         
+        if digest is not None and digest in organized:
+            original = organized[digest]
+            print(f"{'Would skip' if dry_run else 'Skipped'} duplicate: {video_file} (same as {original})")
+            stats["duplicate_files"] += 1
+            stats["bytes_saved"] += stat.st_size
+            duplicates.append((video_file, stat, original))
+            continue
+            
         if os.path.exists(target_path):
             print(f"File already exists: {target_path}")
             stats["skipped_files"] += 1
             continue
             
-        shutil.copy2(video_file, target_path)
-        stats["organized_files"] += 1
-        print(f"Copied: {video_file} -> {target_path}")
+        if digest is not None:
+            organized[digest] = target_path
+        stats["created_folders"].add(date_folder)
+        transfers.append((video_file, target_path, stat))
+        
+    # Copy, move or link in parallel
+    def transfer(item):
+        video_file, target_path, _ = item
+        if dry_run:
+            return mode, None
+        try:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            return _transfer(video_file, target_path, mode), None
+        except OSError as e:
+            return None, e
+        
+    labels = {
+        "copy": ("Copied", "Would copy"),
+        "move": ("Moved", "Would move"),
+        "hardlink": ("Linked", "Would link"),
+        "reflink": ("Reflinked", "Would reflink"),
+    }
+    failed = set()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(transfer, transfers)
+            for (video_file, target_path, stat), (used, error) in zip(transfers, results):
+                if error is not None:
+                    print(f"⚠️  Could not {mode} {video_file}: {error}")
+                    stats["errors"] += 1
+                    failed.add(target_path)
+                    continue
+                    
+                stats["organized_files"] += 1
+                if used == "copy":
+                    stats["bytes_transferred"] += stat.st_size
+                else:
+                    stats["bytes_saved"] += stat.st_size
+                    
+                print(f"{labels[used][dry_run]}: {video_file} -> {target_path}")
+                
+                manifest["targets"][target_path] = stat.st_size
+                manifest["sources"][video_file] = _manifest_entry(stat, target_path)
+                
+        # Duplicates are only removed once their original has been moved
+        if not dry_run:
+            for video_file, stat, original in duplicates:
+                if original in failed:
+                    continue
+                try:
+                    if mode == "move":
+                        os.remove(video_file)
+                except OSError as e:
+                    print(f"⚠️  Could not remove duplicate {video_file}: {e}")
+                    stats["errors"] += 1
+                    continue
+                manifest["sources"][video_file] = _manifest_entry(stat, original)
+    finally:
+        if not dry_run:
+            _save_manifest(manifest_path, manifest)
         
     # Convert set to list for easier serialization
-    stats["created_folders"] = list(stats["created_folders"])
+    stats["created_folders"] = sorted(stats["created_folders"])
+    
+    return stats
     
-    return stats
\ No newline at end of file
+def _manifest_entry(stat, target):
+    """Manifest record of an organized source file."""
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "target": target}
+    
+def _load_manifest(path):
+    """Load the organize manifest (empty if there is none yet)."""
+    manifest = {"sources": {}, "targets": {}, "hashes": {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest.update(json.load(f))
+    return manifest
+    
+def _save_manifest(path, manifest):
+    """Write the manifest atomically, dropping hashes of forgotten files."""
+    known = set(manifest["sources"]) | set(manifest["targets"])
+    manifest["hashes"] = {p: h for p, h in manifest["hashes"].items() if p in known}
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+    
+def _hash_file(path, stat, cache):
+    """Content hash of a file, reusing the cached one if it hasn't changed."""
+    cached = cache.get(path)
+    if cached and (cached["size"], cached["mtime"]) == (stat.st_size, stat.st_mtime):
+        return cached["hash"]
+        
+    digest = hashlib.blake2b(digest_size=20)
+    chunk = bytearray(ORGANIZE_SETTINGS["hash_chunk_mb"] * 1024 * 1024)
+    view = memoryview(chunk)
+    with open(path, "rb") as f:
+        while True:
+            n = f.readinto(chunk)
+            if not n:
+                break
+            digest.update(view[:n])
+            
+    cache[path] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": digest.hexdigest()}
+    return cache[path]["hash"]
+    
+def _transfer(source, target, mode):
+    """Copy, move or link one file; returns the mode actually used.
+    
+    Hard links and reflinks fall back to a copy where the filesystem
+    can't provide them (e.g. across devices).
+    """
+    if mode == "move":
+        shutil.move(source, target)
+        return mode
+        
+    if mode == "hardlink":
+        try:
+            os.link(source, target)
+            return mode
+        except OSError:
+            pass
+    elif mode == "reflink" and fcntl is not None:
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source, target)
+            return mode
+        except OSError:
+            if os.path.exists(target):
+                os.remove(target)
+                
+    shutil.copy2(source, target)
+    return "copy"
\ No newline at end of file
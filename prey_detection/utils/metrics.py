@@ -0,0 +1,423 @@
+"""Lightweight counters, gauges and latency histograms with exporters.
+
+Instrumented code keeps module-level metric objects and updates them
+unconditionally; when the registry is disabled every update returns
+after a single attribute check. Timings are only taken when
+``METRICS.enabled`` is true, so a disabled registry costs no clock reads.
+
+Metrics can be exported as Prometheus text over HTTP (MetricsServer) or
+written to a JSON file at a fixed interval (SnapshotWriter).
+"""
+import bisect
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from ..config.settings import METRICS_SETTINGS
+
+# Default histogram buckets for latencies, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Metric:
+    """Base class for a named metric with optional labels."""
+    
+    type = None
+    
+    def __init__(self, registry, name, help_text=""):
+        """Initialize the metric.
+        
+        Args:
+            registry (MetricsRegistry): Registry the metric belongs to
+            name (str): Metric name, e.g. "camera_frames_total"
+            help_text (str): One-line description
+        """
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+        
+    def samples(self):
+        """Get the current values.
+        
+        Returns:
+            list: (suffix, labels, value) tuples in Prometheus order
+        """
+        with self._lock:
+            return [("", dict(labels), value) for labels, value in self._values.items()]
+            
+    def reset(self):
+        """Discard all values."""
+        with self._lock:
+            self._values.clear()
+            
+class Counter(Metric):
+    """A value that only goes up, e.g. frames read."""
+    
+    type = "counter"
+    
+    def inc(self, amount=1, **labels):
+        """Increase the counter.
+        
+        Args:
+            amount (float): Amount to add
+            **labels: Label values, e.g. camera="0"
+        """
+        if not self.registry.enabled:
+            return
+            
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+            
+class Gauge(Metric):
+    """A value that goes up and down, e.g. queue depth."""
+    
+    type = "gauge"
+    
+    def set(self, value, **labels):
+        """Set the gauge.
+        
+        Args:
+            value (float): New value
+            **labels: Label values
+        """
+        if not self.registry.enabled:
+            return
+            
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+            
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+    
+    type = "histogram"
+    
+    def __init__(self, registry, name, help_text="", buckets=LATENCY_BUCKETS):
+        """Initialize the histogram.
+        
+        Args:
+            registry (MetricsRegistry): Registry the metric belongs to
+            name (str): Metric name, e.g. "camera_read_seconds"
+            help_text (str): One-line description
+            buckets (tuple): Sorted upper bounds of the buckets
+        """
+        super().__init__(registry, name, help_text)
+        self.buckets = tuple(buckets)
+        
+    def observe(self, value, **labels):
+        """Record a value.
+        
+        Args:
+            value (float): Observed value (seconds for latencies)
+            **labels: Label values
+        """
+        if not self.registry.enabled:
+            return
+            
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+            
+    def samples(self):
+        """Get cumulative bucket counts, sum and count per label set."""
+        samples = []
+        
+        with self._lock:
+            for labels, (counts, total, count) in self._values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    samples.append(("_bucket", dict(labels, le=le), cumulative))
+                samples.append(("_sum", dict(labels), total))
+                samples.append(("_count", dict(labels), count))
+                
+        return samples
+        
+    def summary(self):
+        """Get count, sum and mean per label set.
+        
+        Returns:
+            list: One dict per label set
+        """
+        with self._lock:
+            return [
+                {
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum": total,
+                    "mean": total / count if count else 0.0,
+                    "buckets": dict(zip([repr(b) for b in self.buckets] + ["+Inf"], counts)),
+                }
+                for labels, (counts, total, count) in self._values.items()
+            ]
+            
+class MetricsRegistry:
+    """A set of metrics that are enabled or disabled together."""
+    
+    def __init__(self, enabled=False):
+        """Initialize the registry.
+        
+        Args:
+            enabled (bool): Record updates
+        """
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+        
+    def counter(self, name, help_text=""):
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, help_text)
+        
+    def gauge(self, name, help_text=""):
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, help_text)
+        
+    def histogram(self, name, help_text="", buckets=LATENCY_BUCKETS):
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+        
+    def reset(self):
+        """Discard the values of all metrics."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+            
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+                
+        return "\n".join(lines) + "\n"
+        
+    def snapshot(self):
+        """Get all metric values as a JSON-serializable dict.
+        
+        Returns:
+            dict: Timestamp plus one entry per metric
+        """
+        metrics = {}
+        
+        for metric in self._metrics.values():
+            if isinstance(metric, Histogram):
+                values = metric.summary()
+            else:
+                values = [
+                    {"labels": labels, "value": value}
+                    for _, labels, value in metric.samples()
+                ]
+            metrics[metric.name] = {"type": metric.type, "help": metric.help, "values": values}
+            
+        return {"timestamp": time.time(), "metrics": metrics}
+        
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        """Return the metric with this name, creating it if needed."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise TypeError(f"Metric '{name}' is already registered as a {metric.type}")
+                
+            return metric
+            
+# Registry used by the instrumented modules
+METRICS = MetricsRegistry(enabled=METRICS_SETTINGS["enabled"])
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request on its own thread."""
+    
+    daemon_threads = True
+    
+class MetricsServer:
+    """Serve a registry as Prometheus text on a background thread.
+    
+    ``/metrics`` returns the Prometheus exposition format and
+    ``/metrics.json`` the same values as a JSON snapshot.
+    """
+    
+    def __init__(self, registry=None, host=None, port=None):
+        """Initialize the server.
+        
+        Args:
+            registry (MetricsRegistry): Registry to serve (default: METRICS)
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free port)
+        """
+        self.registry = registry or METRICS
+        self.host = host or METRICS_SETTINGS["http_host"]
+        self.port = METRICS_SETTINGS["http_port"] if port is None else port
+        self._server = None
+        self._thread = None
+        
+    def start(self):
+        """Start serving.
+        
+        Returns:
+            MetricsServer: This server; ``port`` holds the bound port
+        """
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/metrics":
+                    body = registry.render_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/metrics.json":
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                    
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the console
+                pass
+                
+        self._server = _ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http",
+                                        daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+            
+class SnapshotWriter:
+    """Write a registry snapshot to a JSON file at a fixed interval."""
+    
+    def __init__(self, path=None, interval=None, registry=None):
+        """Initialize the writer.
+        
+        Args:
+            path (str): JSON file to write
+            interval (float): Seconds between snapshots
+            registry (MetricsRegistry): Registry to snapshot (default: METRICS)
+        """
+        self.path = path or METRICS_SETTINGS["snapshot_path"]
+        self.interval = interval or METRICS_SETTINGS["snapshot_interval"]
+        self.registry = registry or METRICS
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        """Start writing snapshots.
+        
+        Returns:
+            SnapshotWriter: This writer
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        """Stop writing and write one final snapshot."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+            
+    def write(self):
+        """Write a snapshot now.
+        
+        The file is replaced atomically, so readers never see half a snapshot.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.registry.snapshot(), f, indent=2)
+        os.replace(tmp_path, self.path)
+        
+    def _run(self):
+        """Snapshot loop."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"⚠️  Could not write metrics snapshot: {e}")
+                
+def start_exporters(http_port=None, snapshot_path=None, registry=None):
+    """Enable metrics and start the configured exporters.
+    
+    Args:
+        http_port (int): Port for the Prometheus endpoint (None to use
+            METRICS_SETTINGS, which may disable it)
+        snapshot_path (str): JSON snapshot file (None to use METRICS_SETTINGS)
+        registry (MetricsRegistry): Registry to export (default: METRICS)
+        
+    Returns:
+        list: Started exporters; call stop() on each when done
+    """
+    registry = registry or METRICS
+    registry.enabled = True
+    
+    http_port = METRICS_SETTINGS["http_port"] if http_port is None else http_port
+    snapshot_path = snapshot_path or METRICS_SETTINGS["snapshot_path"]
+    
+    exporters = []
+    if http_port is not None:
+        server = MetricsServer(registry, port=http_port).start()
+        print(f"📊 Metrics at http://{server.host}:{server.port}/metrics")
+        exporters.append(server)
+        
+    if snapshot_path:
+        exporters.append(SnapshotWriter(snapshot_path, registry=registry).start())
+        print(f"📊 Metrics snapshots → {snapshot_path}")
+        
+    return exporters
+    
+def _format_labels(labels):
+    """Format labels as {name="value",...}."""
+    if not labels:
+        return ""
+        
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+        
+    return "{" + ",".join(parts) + "}"
+    
+def _format_value(value):
+    """Format a sample value."""
+    if isinstance(value, float) and value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
\ No newline at end of file
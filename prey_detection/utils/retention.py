@@ -0,0 +1,201 @@
+"""Age and disk-quota retention for recorded videos and extracted frames."""
+import fnmatch
+import os
+import threading
+from ..capture.clock import SYSTEM_CLOCK
+from ..config.settings import PATHS, RETENTION_SETTINGS
+
+class RetentionManager:
+    """Delete old files from the PATHS directories.
+    
+    Each policy names a PATHS key and may set ``max_age_days`` (delete files
+    older than this) and ``max_mb`` (delete the oldest files until the
+    directory fits). Subdirectories are included, except other PATHS
+    directories, which only follow their own policy. Files modified within
+    ``min_age_seconds`` are never deleted, so clips that are still being
+    written are safe.
+    """
+    
+    def __init__(self, policies=None, patterns=None, min_age_seconds=None, dry_run=False,
+                 clock=None):
+        """Initialize the manager.
+        
+        Args:
+            policies (dict): PATHS key -> {"max_age_days", "max_mb"}
+                (default: RETENTION_SETTINGS["policies"])
+            patterns (list): File name patterns that may be deleted
+            min_age_seconds (float): Never delete files modified more recently
+            dry_run (bool): Report what would be deleted without deleting it
+            clock (SystemClock or SimulatedClock): Clock to measure file ages
+        """
+        self.policies = policies or RETENTION_SETTINGS["policies"]
+        self.patterns = patterns or RETENTION_SETTINGS["patterns"]
+        if min_age_seconds is None:
+            min_age_seconds = RETENTION_SETTINGS["min_age_seconds"]
+        self.min_age_seconds = min_age_seconds
+        self.dry_run = dry_run
+        self.clock = clock or SYSTEM_CLOCK
+        
+        unknown = set(self.policies) - set(PATHS)
+        if unknown:
+            raise ValueError(f"Retention policies for unknown paths: {', '.join(sorted(unknown))}")
+            
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def enforce(self):
+        """Apply every policy once.
+        
+        Returns:
+            dict: PATHS key -> stats (files, deleted, bytes_freed, bytes_kept)
+        """
+        return {key: self.enforce_path(key) for key in self.policies}
+        
+    def enforce_path(self, key):
+        """Apply the policy for one PATHS directory.
+        
+        Args:
+            key (str): PATHS key, e.g. "motion_videos_dir"
+            
+        Returns:
+            dict: Stats (files, deleted, bytes_freed, bytes_kept)
+        """
+        policy = self.policies[key]
+        directory = PATHS[key]
+        
+        # Oldest first
+        files = sorted(self._collect(directory, self._excluded(key)))
+        
+        now = self.clock.time()
+        newest_deletable = now - self.min_age_seconds
+        max_age_days = policy.get("max_age_days")
+        max_mb = policy.get("max_mb")
+        
+        keep = []
+        deleted = []
+        for mtime, size, path in files:
+            expired = max_age_days is not None and mtime < now - max_age_days * 86400
+            if expired and mtime <= newest_deletable:
+                deleted.append((size, path))
+            else:
+                keep.append((mtime, size, path))
+                
+        # Then trim the oldest until the directory fits its quota
+        total = sum(size for _, size, _ in keep)
+        if max_mb is not None:
+            quota = max_mb * 1024 * 1024
+            remaining = []
+            for mtime, size, path in keep:
+                if total > quota and mtime <= newest_deletable:
+                    deleted.append((size, path))
+                    total -= size
+                else:
+                    remaining.append((mtime, size, path))
+            keep = remaining
+            
+        freed = 0
+        for size, path in deleted:
+            if self.dry_run:
+                freed += size
+                continue
+            try:
+                os.remove(path)
+                freed += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️  Could not delete {path}: {e}")
+                total += size
+                
+        if deleted and not self.dry_run:
+            self._remove_empty_dirs(directory)
+            
+        return {
+            "directory": directory,
+            "files": len(files),
+            "deleted": len(deleted),
+            "bytes_freed": freed,
+            "bytes_kept": total,
+        }
+        
+    def start(self, interval=None):
+        """Enforce the policies on a background thread at a fixed interval.
+        
+        Args:
+            interval (float): Seconds between sweeps
+            
+        Returns:
+            RetentionManager: This manager
+        """
+        self.interval = interval or RETENTION_SETTINGS["interval"]
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        """Stop the background thread."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            
+    def _run(self):
+        """Sweep loop; the first sweep runs right away."""
+        while True:
+            try:
+                for key, stats in self.enforce().items():
+                    if stats["deleted"]:
+                        print(
+                            f"🧹 {key}: deleted {stats['deleted']} files, "
+                            f"freed {stats['bytes_freed'] / (1024 * 1024):.1f} MB"
+                        )
+            except OSError as e:
+                print(f"⚠️  Retention sweep failed: {e}")
+                
+            if self._stop.wait(self.interval):
+                break
+                
+    def _excluded(self, key):
+        """Other PATHS directories inside PATHS[key]."""
+        root = os.path.abspath(PATHS[key])
+        excluded = set()
+        for other, path in PATHS.items():
+            path = os.path.abspath(path)
+            if other != key and path.startswith(root + os.sep):
+                excluded.add(path)
+        return excluded
+        
+    def _collect(self, directory, excluded):
+        """Yield (mtime, size, path) for matching files under a directory."""
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+            
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.abspath(entry.path) not in excluded:
+                        yield from self._collect(entry.path, excluded)
+                elif entry.is_file(follow_symlinks=False) and self._matches(entry.name):
+                    stat = entry.stat(follow_symlinks=False)
+                    yield stat.st_mtime, stat.st_size, entry.path
+            except FileNotFoundError:
+                # Deleted while scanning
+                continue
+                
+    def _matches(self, name):
+        """Check a file name against the deletable patterns."""
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+        
+    def _remove_empty_dirs(self, directory):
+        """Remove empty subdirectories, keeping the directory itself and PATHS dirs."""
+        protected = {os.path.abspath(path) for path in PATHS.values()}
+        for root, _, _ in os.walk(directory, topdown=False):
+            if os.path.abspath(root) in protected or os.listdir(root):
+                continue
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Synthetic test scenes for sources, benchmarks and test frames."""
+import cv2
+import numpy as np
+
+SCENE_PATTERNS = ("orbit", "sweep")
+
+def draw_test_scene(frame, index, period=200, pattern="orbit", label=None):
+    """Draw a test scene with a moving circle and rectangle.
+    
+    Args:
+        frame (numpy.ndarray): BGR image to draw into; it is cleared first
+        index (int): Position of the shapes along their path
+        period (int): Frames for the circle to cross the frame ("sweep")
+            or the rectangle to complete a bounce
+        pattern (str): "orbit" moves both shapes around the centre,
+            "sweep" moves the circle across and the rectangle up and down
+        label (str): Text to draw in the top left corner
+        
+    Returns:
+        numpy.ndarray: The frame
+    """
+    height, width = frame.shape[:2]
+    frame[...] = 0
+    
+    if pattern == "orbit":
+        x = int(width / 2 + width / 4 * np.sin(index / 10))
+        y = int(height / 2 + height / 4 * np.cos(index / 10))
+        cv2.circle(frame, (x, y), 30, (0, 0, 255), -1)
+        
+        x2 = int(width / 2 + width / 4 * np.cos(index / 15))
+        y2 = int(height / 2 + height / 4 * np.sin(index / 15))
+        cv2.rectangle(frame, (x2 - 30, y2 - 30), (x2 + 30, y2 + 30), (0, 255, 0), -1)
+    elif pattern == "sweep":
+        circle_x = int(width * ((index % period) / period))
+        cv2.circle(frame, (circle_x, height // 3), 50, (0, 0, 255), -1)
+        
+        rect_y = int(height * 0.5 * (1 + np.sin(index * np.pi / (period / 2))))
+        cv2.rectangle(frame, (width // 2 - 60, rect_y - 30),
+                      (width // 2 + 60, rect_y + 30), (0, 255, 0), -1)
+    else:
+        raise ValueError(f"pattern must be one of {SCENE_PATTERNS}")
+        
+    if label:
+        cv2.putText(frame, label, (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        
+    return frame
\ No newline at end of file
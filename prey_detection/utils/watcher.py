@@ -0,0 +1,368 @@
+"""Watch the video directories for finished recordings."""
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+from ..capture.clock import SYSTEM_CLOCK
+from ..config.settings import PATHS, WATCHER_SETTINGS
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+BACKENDS = ("auto", "inotify", "poll")
+
+class _Inotify:
+    """Minimal inotify binding through ctypes."""
+    
+    def __init__(self):
+        """Create an inotify instance.
+        
+        Raises:
+            OSError: If inotify isn't available
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+            
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+            
+        self.paths = {}
+        
+    def add_watch(self, path):
+        """Watch a directory (not recursively)."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        self.paths[wd] = path
+        
+    def read_events(self, timeout):
+        """Wait for events.
+        
+        Args:
+            timeout (float): Seconds to wait
+            
+        Returns:
+            list: (mask, path) per event; path is the directory for events
+                on the directory itself
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+            
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+            
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            
+            directory = self.paths.get(wd)
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+                continue
+            if directory is None and not mask & IN_Q_OVERFLOW:
+                continue
+                
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            events.append((mask, path))
+            
+        return events
+        
+    def close(self):
+        """Close the inotify instance."""
+        os.close(self.fd)
+        
+def inotify_available():
+    """Check whether the inotify backend can be used here."""
+    try:
+        _Inotify().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+        
+class FileWatcher:
+    """Notice finished videos in the PATHS directories.
+    
+    Uses inotify on Linux and falls back to polling elsewhere. A file is
+    ready once it has been closed (inotify) or stopped changing (polling),
+    and then left alone for ``settle_seconds``; recordings that are still
+    being written are never reported. Each ready file is added to the
+    catalog, if there is one, and put on ``queue`` for processing. Files
+    that exist when the watcher starts are not reported.
+    """
+    
+    def __init__(self, directories=None, catalog=None, on_ready=None, patterns=None,
+                 settle_seconds=None, poll_interval=None, backend=None, clock=None):
+        """Initialize the watcher.
+        
+        Args:
+            directories (list): Directories or PATHS keys to watch (default:
+                WATCHER_SETTINGS["directories"]); subdirectories are included
+            catalog (VideoCatalog): Catalog to keep up to date
+            on_ready (callable): Called with the path of each ready file
+            patterns (list): File name patterns to watch
+            settle_seconds (float): Quiet time before a file is ready
+            poll_interval (float): Seconds between scans when polling
+            backend (str): "auto", "inotify" or "poll"
+            clock (SystemClock or SimulatedClock): Clock for the debounce
+        """
+        directories = directories or WATCHER_SETTINGS["directories"]
+        self.directories = [os.path.abspath(PATHS.get(d, d)) for d in directories]
+        self.catalog = catalog
+        self.on_ready = on_ready
+        self.patterns = patterns or WATCHER_SETTINGS["patterns"]
+        self.settle_seconds = (
+            WATCHER_SETTINGS["settle_seconds"] if settle_seconds is None else settle_seconds
+        )
+        self.poll_interval = poll_interval or WATCHER_SETTINGS["poll_interval"]
+        self.clock = clock or SYSTEM_CLOCK
+        
+        backend = backend or WATCHER_SETTINGS["backend"]
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown watcher backend: {backend}")
+        if backend == "auto":
+            backend = "inotify" if inotify_available() else "poll"
+        self.backend = backend
+        
+        # Ready files, for a processing loop to consume
+        self.queue = queue.Queue()
+        
+        self._pending = {}   # path -> time it becomes ready
+        self._seen = {}      # path -> (size, mtime) when last reported
+        self._polled = {}    # path -> (size, mtime) at the last poll
+        self._inotify = None
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Stats
+        self.ready = 0
+        self.removed = 0
+        
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+        
+    def start(self):
+        """Start watching on a background thread.
+        
+        Returns:
+            FileWatcher: This watcher
+        """
+        if self._thread is not None:
+            raise RuntimeError("Watcher already started")
+            
+        # Files already there are the catalog scan's job
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            for path, signature in self._walk(directory):
+                self._seen[path] = signature
+                self._polled[path] = signature
+                
+        if self.backend == "inotify":
+            self._inotify = _Inotify()
+            for directory in self.directories:
+                self._watch_tree(directory)
+                
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        """Stop watching. Files still settling are not reported."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            
+    def get_stats(self):
+        """Get watcher stats.
+        
+        Returns:
+            dict: Backend, files reported, removed and still settling
+        """
+        return {
+            "backend": self.backend,
+            "ready": self.ready,
+            "removed": self.removed,
+            "pending": len(self._pending),
+            "queued": self.queue.qsize(),
+        }
+        
+    def _run(self):
+        """Watch loop."""
+        next_poll = self.clock.monotonic()
+        
+        while not self._stop.is_set():
+            now = self.clock.monotonic()
+            
+            if self._inotify is not None:
+                # Wake up for the next file to settle, or at least every second
+                timeout = 1.0
+                if self._pending:
+                    timeout = min(timeout, max(0.0, min(self._pending.values()) - now))
+                for mask, path in self._inotify.read_events(timeout):
+                    self._handle_event(mask, path)
+            else:
+                if now >= next_poll:
+                    self._poll()
+                    next_poll = now + self.poll_interval
+                timeout = next_poll - now
+                if self._pending:
+                    timeout = min(timeout, min(self._pending.values()) - now)
+                if self._stop.wait(max(0.0, timeout)):
+                    break
+                    
+            self._flush()
+            
+    def _handle_event(self, mask, path):
+        """Update the pending files for one inotify event."""
+        now = self.clock.monotonic()
+        
+        if mask & IN_Q_OVERFLOW:
+            # Events were lost; check everything that changed since the last report
+            print("⚠️  Watcher event queue overflowed, rescanning")
+            for directory in self.directories:
+                for found, signature in self._walk(directory):
+                    if self._seen.get(found) != signature:
+                        self._pending[found] = now + self.settle_seconds
+            return
+            
+        if mask & IN_ISDIR:
+            # New (or moved in) directory: watch it and pick up its files
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(path)
+                for found, _ in self._walk(path):
+                    self._pending[found] = now + self.settle_seconds
+            return
+            
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            self._pending.pop(path, None)
+            self._removed(path)
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            if self._matches(os.path.basename(path)):
+                self._pending[path] = now + self.settle_seconds
+        elif mask & IN_MODIFY and path in self._pending:
+            # Written to again; wait until it settles
+            self._pending[path] = now + self.settle_seconds
+            
+    def _poll(self):
+        """Scan the directories and track changed files."""
+        now = self.clock.monotonic()
+        current = {}
+        
+        for directory in self.directories:
+            for path, signature in self._walk(directory):
+                current[path] = signature
+                if self._polled.get(path) != signature:
+                    # New or still growing; restart its settle time
+                    self._pending[path] = now + max(self.settle_seconds, self.poll_interval)
+                    
+        for path in set(self._polled) - set(current):
+            self._pending.pop(path, None)
+            self._removed(path)
+            
+        self._polled = current
+        
+    def _flush(self):
+        """Report the pending files whose settle time has passed."""
+        now = self.clock.monotonic()
+        ready = [path for path, deadline in self._pending.items() if deadline <= now]
+        
+        for path in ready:
+            del self._pending[path]
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+                
+            # Skip files that haven't changed since they were reported
+            signature = (stat.st_size, stat.st_mtime)
+            if self._seen.get(path) == signature:
+                continue
+            self._seen[path] = signature
+            self._deliver(path)
+            
+    def _deliver(self, path):
+        """Hand a ready file to the catalog, the queue and the callback."""
+        self.ready += 1
+        try:
+            if self.catalog is not None:
+                self.catalog.get(path)
+            self.queue.put(path)
+            if self.on_ready is not None:
+                self.on_ready(path)
+        except Exception as e:
+            print(f"⚠️  Could not process {path}: {e}")
+            
+    def _removed(self, path):
+        """Forget a deleted or moved-away file."""
+        if self._seen.pop(path, None) is None:
+            return
+            
+        self.removed += 1
+        if self.catalog is not None:
+            self.catalog.remove(path)
+            
+    def _watch_tree(self, directory):
+        """Add inotify watches for a directory and its subdirectories."""
+        for root, _, _ in os.walk(directory):
+            try:
+                self._inotify.add_watch(root)
+            except OSError as e:
+                print(f"⚠️  Cannot watch {root}: {e}")
+                
+    def _walk(self, directory):
+        """Yield (path, (size, mtime)) for the matching files under a directory."""
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not self._matches(name):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, (stat.st_size, stat.st_mtime)
+                
+    def _matches(self, name):
+        """Check a file name against the watched patterns."""
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
\ No newline at end of file
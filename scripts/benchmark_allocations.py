@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Check that the monitoring loop allocates (almost) nothing per frame.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.benchmarks.allocations import measure_frame_allocations
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Measure per-frame allocations")
+    parser.add_argument("video_path", nargs="?", help="Video to use as the camera (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=200, help="Number of frames (default: 200)")
+    parser.add_argument("--no-record", action="store_true", help="Only score motion, don't record")
+    parser.add_argument("--budget", type=int, default=4096,
+                       help="Maximum mean bytes allocated per frame (default: 4096)")
+    args = parser.parse_args()
+    
+    try:
+        result = measure_frame_allocations(args.video_path, args.frames, record=not args.no_record)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+        
+    print(f"Frames measured: {result['frames']}")
+    print(f"Mean bytes allocated per frame: {result['mean_bytes_per_frame']:.0f}")
+    print(f"Max bytes allocated per frame: {result['max_bytes_per_frame']}")
+    print(f"Net memory growth: {result['net_growth_bytes']} bytes")
+    print(f"Frame pool: {result['pool']}")
+    
+    if result["mean_bytes_per_frame"] > args.budget:
+        print(f"FAIL: above budget of {args.budget} bytes per frame")
+        return 1
+        
+    print("OK")
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
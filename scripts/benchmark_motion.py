@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark motion scoring cost at different downscale levels, or compare
+motion backends on stored clips.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.benchmarks.motion import (
+    load_frames, benchmark_scales, print_results,
+    benchmark_backends, print_backend_results
+)
+from prey_detection.capture.motion_backends import BACKENDS
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark motion scoring")
+    parser.add_argument("video_paths", nargs="*", help="Videos to replay (default: synthetic frames)")
+    parser.add_argument("--compare", choices=["scales", "backends"], default="scales",
+                       help="Compare downscale levels or motion backends (default: scales)")
+    parser.add_argument("--frames", type=int, default=200, help="Frames per video (default: 200)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2, 3],
+                       help="Downscale levels to compare (default: 0 1 2 3)")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS),
+                       help="Backends to compare (default: all)")
+    parser.add_argument("--threshold", type=int, help="Motion threshold for counting triggers")
+    args = parser.parse_args()
+    
+    try:
+        if args.compare == "backends":
+            if not args.video_paths:
+                print("Error: Backend comparison needs at least one video")
+                return 1
+                
+            print(f"Replaying {len(args.video_paths)} clip(s) through each backend")
+            results = benchmark_backends(args.video_paths, args.backends, args.frames, args.threshold)
+            print_backend_results(results)
+            return 0
+            
+        video_path = args.video_paths[0] if args.video_paths else None
+        frames = load_frames(video_path, args.frames)
+        if not frames:
+            print("Error: No frames to benchmark")
+            return 1
+            
+        print(f"Benchmarking {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+        results = benchmark_scales(frames, args.levels, args.threshold)
+        print_results(results)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+        
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the capture → motion → record → extract pipeline and check it
+against a stored baseline.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.benchmarks.pipeline import (
+    run_pipeline_benchmark, print_pipeline_results, compare_to_baseline,
+    print_regressions, load_baseline, save_baseline
+)
+from prey_detection.config.settings import BENCHMARK_SETTINGS
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the capture pipeline")
+    parser.add_argument("video_path", nargs="?", help="Video to replay (default: synthetic scene)")
+    parser.add_argument("--frames", type=int, default=BENCHMARK_SETTINGS["frames"],
+                       help="Frames to process (default: %(default)s)")
+    parser.add_argument("--no-record", action="store_true", help="Skip the recording stage")
+    parser.add_argument("--no-extract", action="store_true", help="Skip the frame extraction stage")
+    parser.add_argument("--async-encoding", action="store_true", help="Encode on a separate thread")
+    parser.add_argument("--baseline", default=BENCHMARK_SETTINGS["baseline_path"],
+                       help="Baseline JSON file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                       help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_SETTINGS["regression_threshold"],
+                       help="Allowed regression, e.g. 0.15 for 15%% (default: %(default)s)")
+    args = parser.parse_args()
+    
+    results = run_pipeline_benchmark(
+        video_path=args.video_path,
+        num_frames=args.frames,
+        record=not args.no_record,
+        extract=not args.no_extract,
+        async_encoding=args.async_encoding
+    )
+    print_pipeline_results(results)
+    print()
+    
+    if args.save_baseline:
+        path = save_baseline(results, args.baseline)
+        print(f"💾 Baseline saved to {path}")
+        return 0
+        
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+        
+    if baseline.get("config") != results["config"]:
+        print("⚠️  Baseline was recorded with different settings; comparison may not be meaningful")
+    if baseline.get("machine", {}).get("machine") != results["machine"]["machine"]:
+        print("⚠️  Baseline was recorded on a different kind of machine")
+        
+    regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+    print_regressions(regressions, threshold=args.threshold)
+    
+    return 1 if regressions else 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
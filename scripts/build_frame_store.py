@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Build a memory-mapped frame store for model training.
+"""
+import argparse
+import glob
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import FRAME_STORE_SETTINGS, MODEL_SETTINGS, PATHS
+from prey_detection.processing.frame_store import RESIZE_MODES, FrameStore, FrameStoreBuilder
+
+def parse_size(value):
+    """Parse WIDTHxHEIGHT."""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+        return width, height
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value} (expected e.g. 416x416)")
+        
+def benchmark(store, batches, batch_size):
+    """Time random batches read from the store."""
+    started = time.perf_counter()
+    frames = 0
+    for done, (indices, _) in enumerate(store.batches(batch_size, shuffle=True), 1):
+        frames += len(indices)
+        if done >= batches:
+            break
+    elapsed = time.perf_counter() - started
+    
+    rate = frames / elapsed if elapsed > 0 else 0.0
+    print(f"⏱️  {frames} random frames in {elapsed:.2f}s ({rate:.0f} frames/s)")
+    
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Build a frame store for training")
+    parser.add_argument("sources", nargs="+",
+                       help="Videos or frame folders (image files or shards), or glob patterns")
+    parser.add_argument("--output", default=os.path.join(PATHS["frames_dir"], "store"),
+                       help="Store directory; frames are appended if it exists (default: %(default)s)")
+    parser.add_argument("--size", type=parse_size,
+                       help="Frame size as WIDTHxHEIGHT (default: %dx%d)" % (
+                           FRAME_STORE_SETTINGS["size"] or MODEL_SETTINGS["input_size"]))
+    parser.add_argument("--resize", choices=RESIZE_MODES,
+                       help=f"Resize mode (default: {FRAME_STORE_SETTINGS['resize']})")
+    parser.add_argument("--label", help="Class label for the added frames, e.g. cat")
+    parser.add_argument("--interval", type=int, default=1,
+                       help="Add every Nth frame of a video (default: 1)")
+    parser.add_argument("--sample-fps", type=float,
+                       help="Add this many frames per second of video (instead of --interval)")
+    parser.add_argument("--max-frames", type=int, help="Maximum number of frames per video")
+    parser.add_argument("--workers", type=int,
+                       help=f"Decoding threads (default: {FRAME_STORE_SETTINGS['workers']})")
+    parser.add_argument("--benchmark", type=int, metavar="BATCHES",
+                       help="Afterwards, time this many random batches read from the store")
+    args = parser.parse_args()
+    
+    sources = []
+    for source in args.sources:
+        is_pattern = any(char in source for char in "*?[")
+        sources.extend(sorted(glob.glob(source)) if is_pattern else [source])
+        
+    started = time.perf_counter()
+    try:
+        with FrameStoreBuilder(args.output, args.size, args.resize, args.workers) as builder:
+            for source in sources:
+                if os.path.isdir(source):
+                    added = builder.add_images(source, label=args.label)
+                else:
+                    added = builder.add_video(source, args.interval, args.sample_fps,
+                                              args.max_frames, label=args.label)
+                print(f"✅ {source}: {added} frames")
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+        
+    height, width = builder.shape[:2]
+    print(f"\n📦 Added {builder.added} frames in {time.perf_counter() - started:.1f}s; "
+          f"{args.output} now holds {len(builder)} {width}x{height} frames")
+    if builder.skipped:
+        print(f"⚠️  {builder.skipped} images could not be decoded")
+        
+    if args.benchmark:
+        benchmark(FrameStore(args.output), args.benchmark, FRAME_STORE_SETTINGS["batch_size"])
+        
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Scan videos into the catalog and query it.
+"""
+import argparse
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import CATALOG_SETTINGS
+from prey_detection.utils.catalog import VideoCatalog
+
+def parse_date(value):
+    """Parse YYYY-MM-DD or YYYY-MM-DD HH:MM:SS."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Invalid date: {value}")
+    
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Video catalog")
+    parser.add_argument("--db", default=CATALOG_SETTINGS["db_path"],
+                       help="Catalog database (default: %(default)s)")
+    parser.add_argument("--scan", nargs="?", const="", metavar="DIR",
+                       help="Scan a directory first (default: the videos directory)")
+    parser.add_argument("--workers", type=int, help="Threads probing videos during a scan")
+    parser.add_argument("--since", type=parse_date, help="Recorded at or after this date")
+    parser.add_argument("--until", type=parse_date, help="Recorded before this date")
+    parser.add_argument("--camera", help="Camera (directory) name")
+    parser.add_argument("--min-duration", type=float, help="Shortest duration in seconds")
+    parser.add_argument("--max-duration", type=float, help="Longest duration in seconds")
+    parser.add_argument("--min-motion-score", type=float,
+                       help="Lowest motion score (set by extract_frames.py --motion --catalog)")
+    args = parser.parse_args()
+    
+    with VideoCatalog(args.db, workers=args.workers) as catalog:
+        if args.scan is not None:
+            started = time.perf_counter()
+            stats = catalog.scan(args.scan or None)
+            print(f"🔍 Scanned {stats['files']} videos in {time.perf_counter() - started:.1f}s: "
+                  f"{stats['probed']} probed, {stats['unchanged']} unchanged, "
+                  f"{stats['removed']} removed")
+                  
+        videos = catalog.query(
+            start=args.since,
+            end=args.until,
+            camera=args.camera,
+            min_duration=args.min_duration,
+            max_duration=args.max_duration,
+            min_motion_score=args.min_motion_score
+        )
+        
+    for video in videos:
+        recorded = datetime.fromtimestamp(video["recorded"])
+        duration = f"{video['duration']:.1f}s" if video["duration"] else "?"
+        resolution = f"{video['width']}x{video['height']}" if video["width"] else "?"
+        print(f"{recorded:%Y-%m-%d %H:%M:%S} {video['camera'] or '-':>12} {duration:>8} "
+              f"{resolution:>9} {video['size'] / (1024 * 1024):>8.1f} MB  {video['path']}")
+              
+    print(f"{len(videos)} video(s)")
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Delete old recordings and frames according to the retention policies.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import PATHS, RETENTION_SETTINGS
+from prey_detection.utils.retention import RetentionManager
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Enforce retention policies")
+    parser.add_argument("paths", nargs="*", metavar="path",
+                       help=f"PATHS keys to clean: {', '.join(sorted(PATHS))} (default: all with a policy)")
+    parser.add_argument("--max-age-days", type=float, help="Override the age limit")
+    parser.add_argument("--max-mb", type=float, help="Override the size quota")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Show what would be deleted without deleting anything")
+    args = parser.parse_args()
+    
+    keys = args.paths or list(RETENTION_SETTINGS["policies"])
+    unknown = [key for key in keys if key not in PATHS]
+    if unknown:
+        print(f"Error: unknown path(s): {', '.join(unknown)}")
+        return 1
+        
+    policies = {}
+    for key in keys:
+        policy = dict(RETENTION_SETTINGS["policies"].get(key, {}))
+        if args.max_age_days is not None:
+            policy["max_age_days"] = args.max_age_days
+        if args.max_mb is not None:
+            policy["max_mb"] = args.max_mb
+        policies[key] = policy
+        
+    manager = RetentionManager(policies=policies, dry_run=args.dry_run)
+    verb = "would delete" if args.dry_run else "deleted"
+    
+    for key, stats in manager.enforce().items():
+        freed = stats["bytes_freed"] / (1024 * 1024)
+        kept = stats["bytes_kept"] / (1024 * 1024)
+        print(f"🧹 {key}: {verb} {stats['deleted']}/{stats['files']} files "
+              f"({freed:.1f} MB), {kept:.1f} MB kept")
+              
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
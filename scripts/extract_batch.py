@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Extract frames from many videos in parallel.
+"""
+import argparse
+import sys
+import os
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import CATALOG_SETTINGS, EXTRACTION_SETTINGS, FILTER_SETTINGS
+from prey_detection.processing.batch import collect_videos, extract_batch, print_batch_summary
+from prey_detection.processing.filters import FrameFilter
+from prey_detection.processing.frames import OUTPUT_FORMATS
+from prey_detection.processing.writers import IMAGE_FORMATS
+from prey_detection.utils.catalog import VideoCatalog
+
+def parse_date(value):
+    """Parse YYYY-MM-DD or YYYY-MM-DD HH:MM:SS."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Invalid date: {value}")
+    
+def make_filter(args):
+    """Frame filter for the --dedupe and --blur-threshold options (None if neither is set)."""
+    if not args.dedupe and args.blur_threshold is None:
+        return None
+    return FrameFilter(
+        dedupe=args.dedupe, max_distance=args.max_distance, blur_threshold=args.blur_threshold
+    )
+    
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Extract frames from many videos")
+    parser.add_argument("videos", nargs="*", help="Video files or glob patterns")
+    parser.add_argument("--output-dir", help="Base directory for the frame folders")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU core)")
+    parser.add_argument("--interval", type=int, default=1,
+                       help="Extract every Nth frame (default: 1)")
+    parser.add_argument("--start-time", type=float, help="Start time in seconds")
+    parser.add_argument("--end-time", type=float, help="End time in seconds")
+    parser.add_argument("--max-frames", type=int, help="Maximum number of frames per video")
+    parser.add_argument("--sample-fps", type=float,
+                       help="Extract this many frames per second of video (instead of --interval)")
+    parser.add_argument("--format", choices=sorted(IMAGE_FORMATS),
+                       help=f"Image format (default: {EXTRACTION_SETTINGS['image_format']})")
+    parser.add_argument("--quality", type=int,
+                       help="JPEG/WebP quality (0-100) or PNG compression (0-9)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS,
+                       help="Save one image per frame or pack them into tar shards "
+                            f"(default: {EXTRACTION_SETTINGS['output_format']})")
+    parser.add_argument("--dedupe", action="store_true",
+                       help="Drop frames that look almost the same as the last saved one")
+    parser.add_argument("--max-distance", type=int,
+                       help=f"dHash bits that may differ for a duplicate (default: {FILTER_SETTINGS['max_distance']})")
+    parser.add_argument("--blur-threshold", type=float,
+                       help="Drop frames with a lower Laplacian variance, e.g. 100")
+    
+    query = parser.add_argument_group("catalog query", "Add videos from the video catalog")
+    query.add_argument("--catalog", action="store_true", help="Select videos from the catalog")
+    query.add_argument("--db", default=CATALOG_SETTINGS["db_path"],
+                      help="Catalog database (default: %(default)s)")
+    query.add_argument("--camera", help="Camera (directory) name")
+    query.add_argument("--since", type=parse_date, help="Recorded at or after this date")
+    query.add_argument("--until", type=parse_date, help="Recorded before this date")
+    query.add_argument("--min-duration", type=float, help="Shortest duration in seconds")
+    query.add_argument("--min-motion-score", type=float, help="Lowest motion score")
+    args = parser.parse_args()
+    
+    catalog = VideoCatalog(args.db) if args.catalog else None
+    try:
+        videos = collect_videos(
+            args.videos,
+            catalog=catalog,
+            camera=args.camera,
+            start=args.since,
+            end=args.until,
+            min_duration=args.min_duration,
+            min_motion_score=args.min_motion_score
+        )
+    finally:
+        if catalog is not None:
+            catalog.close()
+            
+    if not videos:
+        print("Error: no videos to extract")
+        return 1
+        
+    print(f"🎞️  Extracting frames from {len(videos)} videos...")
+    summary = extract_batch(
+        videos,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        frame_interval=args.interval,
+        start_time=args.start_time,
+        end_time=args.end_time,
+        max_frames=args.max_frames,
+        sample_fps=args.sample_fps,
+        image_format=args.format,
+        quality=args.quality,
+        output_format=args.output_format,
+        frame_filter=make_filter(args)
+    )
+    print_batch_summary(summary)
+    
+    return 1 if summary["failed"] else 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
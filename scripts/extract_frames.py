@@ -3,15 +3,79 @@
 Extract frames from videos for model training.
 """
 import argparse
+import contextlib
+import io
+import shutil
 import sys
 import os
+import tempfile
+import time
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from prey_detection.processing.frames import FrameExtractor
-from prey_detection.config.settings import PATHS
+from prey_detection.processing.batch import compare_frame_dirs, extract_video_parallel
+from prey_detection.processing.filters import FrameFilter
+from prey_detection.processing.frames import OUTPUT_FORMATS, FrameExtractor
+from prey_detection.processing.motion_timeline import default_threshold
+from prey_detection.processing.writers import IMAGE_FORMATS
+from prey_detection.config.settings import (
+    CATALOG_SETTINGS, EXTRACTION_SETTINGS, FILTER_SETTINGS, PATHS
+)
+from prey_detection.utils.catalog import VideoCatalog
 
+def make_filter(args):
+    """Frame filter for the --dedupe and --blur-threshold options (None if neither is set)."""
+    if not args.dedupe and args.blur_threshold is None:
+        return None
+    return FrameFilter(
+        dedupe=args.dedupe, max_distance=args.max_distance, blur_threshold=args.blur_threshold
+    )
+    
+def verify_parallel(args):
+    """Check that parallel extraction saves the same frames as a serial run."""
+    work_dir = tempfile.mkdtemp(prefix="prey_verify_")
+    options = (args.interval, args.start_time, args.end_time, args.max_frames, args.sample_fps,
+               args.format, args.quality, args.output_format)
+    
+    # With a filter, segments start afresh and may keep a few more frames
+    if make_filter(args) is not None:
+        print("⚠️  Verifying without --dedupe/--blur-threshold")
+    
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            extractor = FrameExtractor(
+                work_dir, args.format, args.quality, output_format=args.output_format
+            )
+            serial, _ = extractor.extract_frames(
+                args.video_path, os.path.join(work_dir, "serial"), *options[:5]
+            )
+            serial_seconds = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            parallel, _ = extract_video_parallel(
+                args.video_path, os.path.join(work_dir, "parallel"), args.workers or None, *options
+            )
+            parallel_seconds = time.perf_counter() - started
+            
+        print(f"Serial:   {serial} frames in {serial_seconds:.2f}s")
+        print(f"Parallel: {parallel} frames in {parallel_seconds:.2f}s")
+        
+        diff = compare_frame_dirs(os.path.join(work_dir, "serial"), os.path.join(work_dir, "parallel"))
+        if not any(diff.values()):
+            print("✅ Parallel extraction matches the serial run")
+            return 0
+            
+        print("❌ Parallel extraction differs from the serial run:")
+        for kind, names in diff.items():
+            if names:
+                print(f"   {kind}: {', '.join(names[:10])}{' ...' if len(names) > 10 else ''}")
+        return 1
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        
+        
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description="Extract frames from videos")
@@ -24,22 +88,104 @@ def main():
     parser.add_argument("--start-frame", type=int, help="Start frame number")
     parser.add_argument("--end-frame", type=int, help="End frame number")
     parser.add_argument("--max-frames", type=int, help="Maximum number of frames to extract")
+    parser.add_argument("--sample-fps", type=float,
+                       help="Extract this many frames per second of video (instead of --interval)")
+    parser.add_argument("--format", choices=sorted(IMAGE_FORMATS),
+                       help=f"Image format (default: {EXTRACTION_SETTINGS['image_format']})")
+    parser.add_argument("--quality", type=int,
+                       help="JPEG/WebP quality (0-100) or PNG compression (0-9)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS,
+                       help="Save one image per frame or pack them into tar shards "
+                            f"(default: {EXTRACTION_SETTINGS['output_format']})")
+    parser.add_argument("--writer-threads", type=int,
+                       help=f"Threads encoding images (default: {EXTRACTION_SETTINGS['writer_threads']})")
+    parser.add_argument("--dedupe", action="store_true",
+                       help="Drop frames that look almost the same as the last saved one")
+    parser.add_argument("--max-distance", type=int,
+                       help=f"dHash bits that may differ for a duplicate (default: {FILTER_SETTINGS['max_distance']})")
+    parser.add_argument("--blur-threshold", type=float,
+                       help="Drop frames with a lower Laplacian variance, e.g. 100")
+    parser.add_argument("--workers", type=int,
+                       help="Split the video across this many processes (0 = one per CPU core)")
+    parser.add_argument("--verify", action="store_true",
+                       help="Check that parallel extraction matches a serial run, then exit")
+    
+    motion = parser.add_argument_group("motion", "Extract only where something moves")
+    motion.add_argument("--motion", action="store_true",
+                       help="Extract only frames with motion and the seconds around them")
+    motion.add_argument("--motion-threshold", type=float,
+                       help=f"Lowest motion score (default: {default_threshold()})")
+    motion.add_argument("--pre-seconds", type=float,
+                       help=f"Seconds kept before motion (default: {EXTRACTION_SETTINGS['motion_pre_seconds']})")
+    motion.add_argument("--post-seconds", type=float,
+                       help=f"Seconds kept after motion (default: {EXTRACTION_SETTINGS['motion_post_seconds']})")
+    motion.add_argument("--rescore", action="store_true",
+                       help="Score the video again instead of using its cached motion timeline")
+    motion.add_argument("--catalog", action="store_true",
+                       help=f"Store the peak motion score in the video catalog ({CATALOG_SETTINGS['db_path']})")
     args = parser.parse_args()
     
+    if args.verify:
+        return verify_parallel(args)
+    if args.motion and args.workers is not None:
+        parser.error("--motion can't be combined with --workers")
+    
     # Determine output directory
     output_dir = args.output_dir
     
     # Setup frame extractor
-    extractor = FrameExtractor()
+    extractor = FrameExtractor(
+        image_format=args.format,
+        quality=args.quality,
+        writer_threads=args.writer_threads,
+        output_format=args.output_format,
+        frame_filter=make_filter(args)
+    )
     
     try:
-        if args.start_frame is not None and args.end_frame is not None:
+        if args.motion:
+            # Extract where the motion timeline passes the threshold
+            catalog = VideoCatalog() if args.catalog else None
+            try:
+                extractor.extract_motion_frames(
+                    args.video_path,
+                    output_dir,
+                    args.motion_threshold,
+                    args.pre_seconds,
+                    args.post_seconds,
+                    args.interval,
+                    args.sample_fps,
+                    args.max_frames,
+                    refresh=args.rescore,
+                    catalog=catalog
+                )
+            finally:
+                if catalog is not None:
+                    catalog.close()
+        elif args.start_frame is not None and args.end_frame is not None:
             # Extract frame range
             extractor.extract_frames_range(
                 args.video_path,
                 args.start_frame,
                 args.end_frame,
-                output_dir
+                output_dir,
+                args.interval
+            )
+        elif args.workers is not None:
+            # Extract by interval, one segment per worker
+            extract_video_parallel(
+                args.video_path,
+                output_dir,
+                args.workers,
+                args.interval,
+                args.start_time,
+                args.end_time,
+                args.max_frames,
+                args.sample_fps,
+                args.format,
+                args.quality,
+                args.output_format,
+                extractor.frame_filter
             )
         else:
             # Extract by interval
@@ -49,13 +195,14 @@ def main():
                 args.interval,
                 args.start_time,
                 args.end_time,
-                args.max_frames
+                args.max_frames,
+                args.sample_fps
             )
     except Exception as e:
         print(f"Error: {e}")
         return 1
     
     return 0
-
+    
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -11,7 +11,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from prey_detection.capture.camera import Camera
 from prey_detection.capture.motion import MotionDetector
+from prey_detection.capture.motion_backends import BACKENDS
+from prey_detection.capture.motion_engine import MotionEngine
 from prey_detection.config.settings import PATHS, MOTION_SETTINGS
+from prey_detection.utils.metrics import start_exporters
+from prey_detection.utils.retention import RetentionManager
 
 def main():
     """Main function."""
@@ -22,16 +26,26 @@ def main():
                        help=f"Motion threshold (default: {MOTION_SETTINGS['frame_diff_threshold']})")
     parser.add_argument("--duration", type=int, 
                        help=f"Recording duration in seconds (default: {MOTION_SETTINGS['record_seconds']})")
+    parser.add_argument("--max-duration", type=int,
+                       help=f"Maximum clip length in seconds (default: {MOTION_SETTINGS['max_record_seconds']})")
     parser.add_argument("--interval", type=float, 
                        help=f"Motion check interval in seconds (default: {MOTION_SETTINGS['motion_check_interval']})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                       help=f"Motion backend (default: {MOTION_SETTINGS['backend']})")
     parser.add_argument("--no-preview", action="store_true", help="Disable preview window")
+    parser.add_argument("--threaded", action="store_true",
+                       help="Grab frames on a background thread")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", help="Write metric snapshots to this JSON file")
+    parser.add_argument("--retention", action="store_true",
+                       help="Delete old recordings in the background (see RETENTION_SETTINGS)")
     args = parser.parse_args()
     
     # Determine output directory
     output_dir = args.output_dir or PATHS["motion_videos_dir"]
     
     # Setup camera and detector
-    camera = Camera(camera_index=args.camera)
+    camera = Camera(camera_index=args.camera, threaded=args.threaded or None)
     detector = MotionDetector(output_dir=output_dir, camera=camera)
     
     # Override settings if provided
@@ -41,9 +55,21 @@ def main():
     if args.duration is not None:
         detector.record_seconds = args.duration
         
+    if args.max_duration is not None:
+        detector.max_record_seconds = args.max_duration
+        
     if args.interval is not None:
         detector.motion_check_interval = args.interval
+        
+    if args.backend is not None:
+        detector.engine = MotionEngine(backend=args.backend)
     
+    exporters = []
+    if args.metrics_port is not None or args.metrics_file:
+        exporters = start_exporters(http_port=args.metrics_port, snapshot_path=args.metrics_file)
+    if args.retention:
+        exporters.append(RetentionManager().start())
+        
     try:
         detector.start_monitoring(show_preview=not args.no_preview)
     except KeyboardInterrupt:
@@ -51,8 +77,11 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        for exporter in exporters:
+            exporter.stop()
     
     return 0
-
+    
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Organize videos into date folders, skipping duplicates.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import ORGANIZE_SETTINGS
+from prey_detection.utils.files import ORGANIZE_MODES, organize_videos_by_date
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Organize videos by date")
+    parser.add_argument("--source-dir", help="Directory with the videos (default: videos/)")
+    parser.add_argument("--target-dir", help="Target base directory (default: videos/organized)")
+    parser.add_argument("--mode", choices=ORGANIZE_MODES,
+                       help=f"How to organize files (default: {ORGANIZE_SETTINGS['mode']})")
+    parser.add_argument("--no-dedupe", action="store_true", help="Organize duplicate files too")
+    parser.add_argument("--workers", type=int,
+                       help=f"Files processed in parallel (default: {ORGANIZE_SETTINGS['workers']})")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Show what would happen without changing anything")
+    args = parser.parse_args()
+    
+    try:
+        stats = organize_videos_by_date(
+            source_dir=args.source_dir,
+            target_base_dir=args.target_dir,
+            mode=args.mode,
+            dedupe=not args.no_dedupe,
+            workers=args.workers,
+            dry_run=args.dry_run
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+        
+    prefix = "Would organize" if args.dry_run else "Organized"
+    print(f"\n📁 {prefix} {stats['organized_files']} of {stats['total_files']} files "
+          f"({stats['unchanged_files']} already organized, {stats['duplicate_files']} duplicates, "
+          f"{stats['skipped_files']} skipped)")
+    if stats["errors"]:
+        print(f"⚠️  {stats['errors']} files could not be organized")
+    copied = "to copy" if args.dry_run else "copied"
+    print(f"💾 {stats['bytes_transferred'] / (1024 * 1024):.1f} MB {copied}, "
+          f"{stats['bytes_saved'] / (1024 * 1024):.1f} MB saved")
+          
+    return 1 if stats["errors"] else 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
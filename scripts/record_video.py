@@ -21,6 +21,10 @@ def main():
     parser.add_argument("--duration", type=int, help="Record for specified duration (seconds)")
     parser.add_argument("--mode", choices=["interactive", "duration"], default="interactive",
                        help="Recording mode")
+    parser.add_argument("--segment-seconds", type=float,
+                       help="Start a new file every N seconds of video")
+    parser.add_argument("--segment-max-mb", type=float,
+                       help="Start a new file once the current one reaches N MB")
     args = parser.parse_args()
     
     # Determine output directory
@@ -28,7 +32,12 @@ def main():
     
     # Setup camera and recorder
     camera = Camera(camera_index=args.camera)
-    recorder = VideoRecorder(output_dir=output_dir, camera=camera)
+    recorder = VideoRecorder(
+        output_dir=output_dir,
+        camera=camera,
+        segment_seconds=args.segment_seconds,
+        segment_max_mb=args.segment_max_mb
+    )
     
     try:
         if args.mode == "duration" or args.duration:
@@ -48,6 +57,6 @@ def main():
         return 1
     
     return 0
-
+    
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Replay recorded videos through motion detection on a simulated clock.
+
+A day of footage replays in minutes and yields the same events every time.
+"""
+import argparse
+import glob
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.capture.replay import replay_videos, print_timeline
+from prey_detection.config.settings import MOTION_SETTINGS
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Replay videos through motion detection")
+    parser.add_argument("videos", nargs="+", help="Video files or glob patterns")
+    parser.add_argument("--output-dir", required=True, help="Directory for the replayed clips")
+    parser.add_argument("--threshold", type=int,
+                       help=f"Motion threshold (default: {MOTION_SETTINGS['frame_diff_threshold']})")
+    parser.add_argument("--duration", type=int,
+                       help=f"Recording duration in seconds (default: {MOTION_SETTINGS['record_seconds']})")
+    parser.add_argument("--max-duration", type=int,
+                       help=f"Maximum clip length in seconds (default: {MOTION_SETTINGS['max_record_seconds']})")
+    args = parser.parse_args()
+    
+    video_paths = []
+    for pattern in args.videos:
+        video_paths.extend(glob.glob(pattern) or [pattern])
+        
+    def configure(detector):
+        if args.threshold is not None:
+            detector.frame_diff_threshold = args.threshold
+        if args.duration is not None:
+            detector.record_seconds = args.duration
+        if args.max_duration is not None:
+            detector.max_record_seconds = args.max_duration
+            
+    started = time.perf_counter()
+    try:
+        events, frames = replay_videos(video_paths, args.output_dir, configure=configure)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    
+    print()
+    print_timeline(events)
+    print(f"\nReplayed {frames} frames in {elapsed:.1f}s ({frames / elapsed:.0f} fps), "
+          f"{len(events)} event(s)")
+    
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
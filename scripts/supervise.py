@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Run motion detection on several cameras from one config file.
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.capture.supervisor import CameraSupervisor, load_config
+from prey_detection.config.settings import SUPERVISOR_SETTINGS
+from prey_detection.utils.metrics import start_exporters
+from prey_detection.utils.retention import RetentionManager
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Multi-camera motion detection")
+    parser.add_argument("--config", default=SUPERVISOR_SETTINGS["config_path"],
+                       help="Camera config file, JSON or YAML (default: %(default)s)")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--status-interval", type=float, default=10.0,
+                       help="Seconds between status lines (default: %(default)s)")
+    parser.add_argument("--encoder-workers", type=int,
+                       help=f"Shared encoder threads (default: {SUPERVISOR_SETTINGS['encoder_workers']})")
+    parser.add_argument("--max-motion-fps", type=float,
+                       help="Motion checks per second across all cameras (0 = no limit)")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", help="Write metric snapshots to this JSON file")
+    parser.add_argument("--retention", action="store_true",
+                       help="Delete old recordings in the background (see RETENTION_SETTINGS)")
+    args = parser.parse_args()
+    
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+        
+    if args.encoder_workers is not None:
+        config["encoder_workers"] = args.encoder_workers
+    if args.max_motion_fps is not None:
+        config["max_motion_fps"] = args.max_motion_fps
+        
+    exporters = []
+    if args.metrics_port is not None or args.metrics_file:
+        exporters = start_exporters(http_port=args.metrics_port, snapshot_path=args.metrics_file)
+    if args.retention:
+        exporters.append(RetentionManager().start())
+        
+    supervisor = CameraSupervisor(config)
+    print(f"📹 Supervising {len(supervisor.pipelines)} camera(s). Press Ctrl+C to stop.")
+    try:
+        supervisor.run(duration=args.duration, status_interval=args.status_interval)
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+    
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Watch for finished recordings, catalog them and optionally extract frames.
+"""
+import argparse
+import queue
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prey_detection.config.settings import CATALOG_SETTINGS, WATCHER_SETTINGS
+from prey_detection.processing.frames import FrameExtractor
+from prey_detection.utils.catalog import VideoCatalog
+from prey_detection.utils.watcher import BACKENDS, FileWatcher
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Watch for new videos")
+    parser.add_argument("directories", nargs="*",
+                       help=f"Directories or PATHS keys (default: {', '.join(WATCHER_SETTINGS['directories'])})")
+    parser.add_argument("--db", default=CATALOG_SETTINGS["db_path"],
+                       help="Catalog database (default: %(default)s)")
+    parser.add_argument("--backend", choices=BACKENDS,
+                       help=f"Watcher backend (default: {WATCHER_SETTINGS['backend']})")
+    parser.add_argument("--settle", type=float,
+                       help=f"Seconds a file must stay closed (default: {WATCHER_SETTINGS['settle_seconds']})")
+    parser.add_argument("--scan", action="store_true",
+                       help="Bring the catalog up to date before watching")
+    parser.add_argument("--extract", action="store_true", help="Extract frames from each new video")
+    parser.add_argument("--frame-interval", type=int, default=1,
+                       help="Extract every Nth frame (default: %(default)s)")
+    parser.add_argument("--output-dir", help="Directory for extracted frames")
+    args = parser.parse_args()
+    
+    catalog = VideoCatalog(args.db)
+    if args.scan:
+        stats = catalog.scan()
+        print(f"🔍 Catalog: {stats['files']} videos, {stats['probed']} probed")
+        
+    watcher = FileWatcher(
+        directories=args.directories or None,
+        catalog=catalog,
+        settle_seconds=args.settle,
+        backend=args.backend
+    )
+    extractor = FrameExtractor(output_dir=args.output_dir) if args.extract else None
+    
+    print(f"👀 Watching {', '.join(watcher.directories)} ({watcher.backend}). Press Ctrl+C to stop.")
+    try:
+        with watcher:
+            while True:
+                try:
+                    path = watcher.queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                    
+                info = catalog.get(path, refresh=False) or {}
+                duration = f"{info['duration']:.1f}s" if info.get("duration") else "?"
+                print(f"🎬 {path} ({duration})")
+                
+                if extractor is not None:
+                    try:
+                        extractor.extract_frames(path, frame_interval=args.frame_interval)
+                    except (OSError, ValueError) as e:
+                        print(f"Error: {e}")
+    except KeyboardInterrupt:
+        print("\nWatcher stopped by user")
+    finally:
+        catalog.close()
+        
+    return 0
+    
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
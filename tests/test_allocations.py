@@ -0,0 +1,22 @@
+"""The monitoring loop must not allocate per frame."""
+import sys
+import pytest
+from prey_detection.benchmarks.allocations import measure_frame_allocations
+
+# Same budget as scripts/benchmark_allocations.py
+BUDGET_BYTES = 4096
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 9),
+                                reason="tracemalloc.reset_peak needs Python 3.9")
+                                
+@pytest.mark.parametrize("record", [False, True], ids=["scoring", "recording"])
+def test_synthetic_source_allocations_are_bounded(record):
+    result = measure_frame_allocations(num_frames=120, warmup=20, record=record)
+    
+    assert result["frames"] == 100
+    assert result["mean_bytes_per_frame"] <= BUDGET_BYTES
+    # Nothing frame-sized (640x480x3) is allocated on any frame
+    assert result["max_bytes_per_frame"] < 64 * 1024
+    assert result["net_growth_bytes"] < 64 * 1024
+    # The pool never had to allocate past its preallocated buffers
+    assert result["pool"]["allocated"] == result["pool"]["size"]
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Frame ring and threaded camera read and overflow policies."""
+import threading
+import time
+import cv2
+import numpy as np
+import pytest
+from prey_detection.capture.buffers import FrameRing
+from prey_detection.capture.camera import Camera
+
+NUM_FRAMES = 60
+SHAPE = (48, 64, 3)
+
+def _frame(index):
+    """A flat frame whose brightness encodes its index."""
+    return np.full(SHAPE, index * 4, dtype=np.uint8)
+    
+def _index(frame):
+    return int(round(frame.mean() / 4))
+    
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+        
+def _ring(capacity, overflow):
+    ring = FrameRing(capacity, overflow=overflow)
+    ring.allocate(SHAPE)
+    return ring
+    
+def test_drop_oldest_overwrites_unread_frames():
+    ring = _ring(4, "drop_oldest")
+    for i in range(10):
+        assert ring.push(_frame(i))
+        
+    # next() returns the oldest frame still buffered
+    assert _index(ring.next(timeout=0)) == 6
+    assert ring.get_stats() == {
+        "grabbed": 10, "delivered": 1, "dropped": 6, "buffered": 3, "capacity": 4,
+    }
+    
+    # latest() skips the rest
+    assert _index(ring.latest(timeout=0)) == 9
+    assert ring.get_stats() == {
+        "grabbed": 10, "delivered": 2, "dropped": 8, "buffered": 0, "capacity": 4,
+    }
+    assert ring.latest(timeout=0.01) is None
+    
+def test_block_waits_for_the_consumer():
+    ring = _ring(3, "block")
+    producer = threading.Thread(target=lambda: [ring.push(_frame(i)) for i in range(10)])
+    producer.start()
+    
+    try:
+        _wait_until(lambda: ring.get_stats()["grabbed"] == 3)
+        time.sleep(0.05)
+        # The producer is stuck on the full ring
+        assert ring.get_stats()["grabbed"] == 3
+        
+        frames = [_index(ring.next(timeout=5)) for _ in range(10)]
+        assert frames == list(range(10))
+    finally:
+        ring.close()
+        producer.join(timeout=5)
+        
+    assert not producer.is_alive()
+    assert ring.get_stats() == {
+        "grabbed": 10, "delivered": 10, "dropped": 0, "buffered": 0, "capacity": 3,
+    }
+    
+def test_close_wakes_a_blocked_producer():
+    ring = _ring(2, "block")
+    ring.push(_frame(0))
+    ring.push(_frame(1))
+    
+    result = []
+    producer = threading.Thread(target=lambda: result.append(ring.push(_frame(2))))
+    producer.start()
+    time.sleep(0.05)
+    ring.close()
+    producer.join(timeout=5)
+    
+    assert result == [False]
+    # Frames already buffered can still be read after close
+    assert _index(ring.next()) == 0
+    assert _index(ring.next()) == 1
+    assert ring.next() is None
+    
+def test_ring_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        FrameRing(1)
+    with pytest.raises(ValueError):
+        FrameRing(4, overflow="newest")
+        
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """A short file that a Camera can open in place of a device."""
+    path = str(tmp_path_factory.mktemp("video") / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20, (SHAPE[1], SHAPE[0]))
+    for i in range(NUM_FRAMES):
+        writer.write(_frame(i))
+    writer.release()
+    return path
+    
+def _grabbed_all(camera, buffered):
+    """Wait until the grabber has read the whole clip and stopped."""
+    _wait_until(lambda: camera.get_stats()["grabbed"] == NUM_FRAMES and
+                camera.get_stats()["buffered"] == buffered)
+    
+def test_camera_block_next_delivers_every_frame(clip):
+    camera = Camera(clip, threaded=True, buffer_size=4, overflow="block", read_policy="next")
+    with camera:
+        frames = [_index(camera.read()) for _ in range(NUM_FRAMES)]
+        with pytest.raises(RuntimeError, match="grab failed"):
+            camera.read()
+        stats = camera.get_stats()
+        
+    assert frames == list(range(NUM_FRAMES))
+    assert stats == {
+        "grabbed": NUM_FRAMES, "delivered": NUM_FRAMES, "dropped": 0, "buffered": 0,
+        "capacity": 4,
+    }
+    
+def test_camera_drop_oldest_latest_skips_to_newest(clip):
+    camera = Camera(clip, threaded=True, buffer_size=4, overflow="drop_oldest", read_policy="latest")
+    with camera:
+        _grabbed_all(camera, 3)
+        assert _index(camera.read()) == NUM_FRAMES - 1
+        stats = camera.get_stats()
+        
+    assert stats == {
+        "grabbed": NUM_FRAMES, "delivered": 1, "dropped": NUM_FRAMES - 1, "buffered": 0,
+        "capacity": 4,
+    }
+    
+def test_camera_drop_oldest_next_reads_the_oldest_kept(clip):
+    camera = Camera(clip, threaded=True, buffer_size=4, overflow="drop_oldest", read_policy="next")
+    with camera:
+        # The slot the grabber reserves is never readable, so one fewer
+        # frame than the buffer size is kept
+        _grabbed_all(camera, 3)
+        frames = [_index(camera.read()) for _ in range(3)]
+        stats = camera.get_stats()
+        
+    assert frames == list(range(NUM_FRAMES - 3, NUM_FRAMES))
+    assert stats["delivered"] == 3
+    assert stats["dropped"] == NUM_FRAMES - 3
+    
+def test_camera_read_into_buffer(clip):
+    out = np.empty(SHAPE, dtype=np.uint8)
+    camera = Camera(clip, threaded=True, buffer_size=4, overflow="block", read_policy="next")
+    with camera:
+        assert camera.read(out=out) is out
+        assert _index(out) == 0
+        assert _index(camera.read_next(timeout=5)) == 1
+        _wait_until(lambda: camera.get_stats()["buffered"] == 4)
+        # read_latest ignores the read policy
+        assert _index(camera.read_latest(timeout=5)) == 5
+        
+def test_unthreaded_camera_counts_reads(clip):
+    with Camera(clip, threaded=False) as camera:
+        for _ in range(5):
+            camera.read()
+        assert camera.get_stats()["grabbed"] == camera.get_stats()["delivered"] == 5
+        with pytest.raises(RuntimeError, match="threaded"):
+            camera.read_latest()
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Frame filter defaults keep a moving animal and drop a still scene."""
+import cv2
+import numpy as np
+from prey_detection.processing.filters import FrameFilter
+
+def _scene():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (9, 9), 0)
+    
+def test_still_scene_is_deduplicated():
+    background = _scene()
+    frame_filter = FrameFilter()
+    kept = sum(frame_filter.keep(background.copy()) for _ in range(50))
+    assert kept == 1
+    assert frame_filter.dropped["duplicate"] == 49
+    
+def test_moving_object_is_kept():
+    background = _scene()
+    frame_filter = FrameFilter()
+    assert frame_filter.keep(background)
+    
+    kept = 0
+    for x in range(0, 260, 4):
+        frame = background.copy()
+        cv2.rectangle(frame, (x, 90), (x + 60, 150), (40, 60, 200), -1)
+        kept += frame_filter.keep(frame)
+        
+    # Single 4 pixel steps may still count as duplicates, but the path is sampled
+    assert kept >= 10
+    
+def test_reset_keeps_next_frame():
+    background = _scene()
+    frame_filter = FrameFilter()
+    assert frame_filter.keep(background)
+    assert not frame_filter.keep(background)
+    frame_filter.reset()
+    assert frame_filter.keep(background)
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""A failed transfer must not lose the record of files already moved."""
+import json
+import os
+from prey_detection.config.settings import ORGANIZE_SETTINGS
+from prey_detection.utils import files
+
+def _make_videos(directory, contents):
+    os.makedirs(directory)
+    for name, data in contents.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(data)
+            
+def test_failed_move_still_saves_manifest(tmp_path, monkeypatch):
+    source = str(tmp_path / "source")
+    target = str(tmp_path / "organized")
+    _make_videos(source, {
+        "a.mp4": b"a" * 100,
+        "b.mp4": b"b" * 200,
+        "c.mp4": b"c" * 300,
+        # Same content as c.mp4, whose move fails
+        "d.mp4": b"c" * 300,
+    })
+    
+    real_transfer = files._transfer
+    
+    def transfer(path, target_path, mode):
+        if os.path.basename(path) == "c.mp4":
+            raise OSError(28, "No space left on device")
+        return real_transfer(path, target_path, mode)
+        
+    monkeypatch.setattr(files, "_transfer", transfer)
+    stats = files.organize_videos_by_date(source, target, mode="move", dedupe=True, workers=2)
+    
+    assert stats["errors"] == 1
+    assert stats["organized_files"] == 2
+    # The failed file and its duplicate stay where they were
+    assert sorted(os.listdir(source)) == ["c.mp4", "d.mp4"]
+    
+    with open(os.path.join(target, ORGANIZE_SETTINGS["manifest_name"])) as f:
+        manifest = json.load(f)
+    moved = {os.path.basename(path) for path in manifest["sources"]}
+    assert moved == {"a.mp4", "b.mp4"}
+    assert all(os.path.exists(path) for path in manifest["targets"])
+    
+    # A later run picks up the files that failed
+    monkeypatch.setattr(files, "_transfer", real_transfer)
+    stats = files.organize_videos_by_date(source, target, mode="move", dedupe=True, workers=2)
+    assert stats["errors"] == 0
+    assert stats["organized_files"] == 1
+    assert stats["duplicate_files"] == 1
+    assert os.listdir(source) == []
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Parallel extraction must save exactly the frames of a serial run."""
+import cv2
+import numpy as np
+import pytest
+from prey_detection.config.settings import EXTRACTION_SETTINGS
+from prey_detection.processing.batch import _segments, compare_frame_dirs, extract_video_parallel
+from prey_detection.processing.frames import FrameExtractor
+
+FPS = 20
+NUM_FRAMES = 120
+WORKERS = 3
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """A short clip whose frames all differ."""
+    path = str(tmp_path_factory.mktemp("video") / "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, (160, 120))
+    rng = np.random.default_rng(0)
+    for i in range(NUM_FRAMES):
+        frame = rng.integers(0, 40, (120, 160, 3), dtype=np.uint8)
+        x = (i * 3) % 130
+        cv2.rectangle(frame, (x, 40), (x + 30, 70), (0, 200, 255), -1)
+        cv2.putText(frame, str(i), (5, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        writer.write(frame)
+    writer.release()
+    return path
+    
+@pytest.fixture(autouse=True)
+def short_segments(monkeypatch):
+    """Split the short clip into several segments."""
+    monkeypatch.setitem(EXTRACTION_SETTINGS, "min_segment_frames", 20)
+    
+@pytest.mark.parametrize("options", [
+    {"frame_interval": 1},
+    {"frame_interval": 7},
+    {"sample_fps": 6},
+    {"frame_interval": 2, "start_time": 1.0, "end_time": 4.5},
+    {"frame_interval": 3, "max_frames": 17},
+    {"sample_fps": 3, "start_time": 0.5, "max_frames": 14},
+], ids=["every-frame", "interval", "sample-fps", "time-range", "max-frames", "combined"])
+@pytest.mark.parametrize("output_format", ["files", "shards"])
+def test_parallel_matches_serial(clip, tmp_path, options, output_format):
+    serial_dir = str(tmp_path / "serial")
+    parallel_dir = str(tmp_path / "parallel")
+    
+    extractor = FrameExtractor(str(tmp_path), output_format=output_format)
+    serial_count, _ = extractor.extract_frames(clip, serial_dir, **options)
+    parallel_count, _ = extract_video_parallel(clip, parallel_dir, workers=WORKERS,
+                                               output_format=output_format, **options)
+                                               
+    assert serial_count > 0
+    assert parallel_count == serial_count
+    assert compare_frame_dirs(serial_dir, parallel_dir) == {
+        "missing": [], "extra": [], "different": [],
+    }
+    
+def test_clip_is_split_into_segments():
+    segments = _segments(0, NUM_FRAMES, 1, WORKERS)
+    assert len(segments) == WORKERS
+    assert segments[0][0] == 0 and segments[-1][1] == NUM_FRAMES
\ No newline at end of file
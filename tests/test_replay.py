@@ -0,0 +1,133 @@
+"""Event timelines on a simulated clock are exact and reproducible."""
+import os
+import cv2
+import pytest
+from datetime import datetime
+from prey_detection.capture.clock import SimulatedClock
+from prey_detection.capture.motion import MotionDetector
+from prey_detection.capture.replay import replay_videos
+from prey_detection.capture.sources import SyntheticSource
+from prey_detection.config.settings import MOTION_SETTINGS, VIDEO_SETTINGS
+
+# A power of two, so frame timestamps are exact floats
+FPS = 16
+PRE_TRIGGER_FRAMES = 2 * FPS
+RECORD_FRAMES = FPS             # record_seconds = 1
+POST_ROLL_FRAMES = FPS // 2     # post_roll_seconds = 0.5
+START = datetime(2024, 6, 1, 12, 0, 0)
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    """Small frames and short events."""
+    monkeypatch.setitem(VIDEO_SETTINGS, "fps", FPS)
+    monkeypatch.setitem(VIDEO_SETTINGS, "resolution", (320, 240))
+    monkeypatch.setitem(VIDEO_SETTINGS, "async_encoding", False)
+    monkeypatch.setitem(VIDEO_SETTINGS, "segment_seconds", None)
+    monkeypatch.setitem(VIDEO_SETTINGS, "segment_max_mb", None)
+    monkeypatch.setitem(MOTION_SETTINGS, "pre_trigger_seconds", 2)
+    
+def _configure(detector):
+    detector.record_seconds = 1
+    detector.post_roll_seconds = 0.5
+    detector.max_record_seconds = 120
+    detector.frame_diff_threshold = 500
+    detector.motion_check_interval = 0
+    
+def _source(clock=None, noise=10):
+    return SyntheticSource(width=320, height=240, fps=FPS, num_frames=400,
+                           motion_periods=[(100, 140), (300, 310)], noise=noise,
+                           realtime=clock is not None, clock=clock)
+                           
+def _replay_synthetic(output_dir):
+    clock = SimulatedClock(START)
+    source = _source(clock)
+    detector = MotionDetector(output_dir=output_dir, camera=source, clock=clock)
+    detector.event_log = []
+    _configure(detector)
+    
+    with source:
+        while True:
+            try:
+                frame = source.read_pooled(detector.frame_pool)
+            except RuntimeError:
+                break
+            try:
+                detector.process_frame(frame)
+            finally:
+                frame.release()
+    detector.finish_event()
+    
+    return detector.event_log
+    
+def _frame_time(index, start=START):
+    return start.timestamp() + index / FPS
+    
+def _expected(first_motion, last_motion, pre_trigger):
+    """Start, end and frame count of an event."""
+    # Recording runs until record_seconds after the last motion, then post-roll
+    last_frame = last_motion + RECORD_FRAMES + POST_ROLL_FRAMES
+    return first_motion, last_frame, pre_trigger + last_frame - first_motion
+    
+def _timeline(events, start=START):
+    return [
+        ((event["start"] - start.timestamp()) * FPS, (event["end"] - start.timestamp()) * FPS,
+         event["frames"])
+        for event in events
+    ]
+    
+def test_synthetic_timeline_is_exact(tmp_path):
+    events = _replay_synthetic(str(tmp_path / "run1"))
+    
+    # The trigger frame itself is the newest pre-trigger frame
+    assert _timeline(events) == [
+        _expected(100, 139, PRE_TRIGGER_FRAMES),
+        _expected(300, 309, PRE_TRIGGER_FRAMES),
+    ]
+    assert events[0]["start"] == _frame_time(100)
+    assert events[0]["end"] == _frame_time(163)
+    assert events[0]["frames"] == 32 + 63
+    
+    # Every clip holds exactly the frames that were counted
+    for event in events:
+        cap = cv2.VideoCapture(event["file"])
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == event["frames"]
+        cap.release()
+        
+def test_synthetic_timeline_is_reproducible(tmp_path):
+    first = _replay_synthetic(str(tmp_path / "run1"))
+    second = _replay_synthetic(str(tmp_path / "run2"))
+    
+    assert _timeline(first) == _timeline(second)
+    assert [os.path.basename(event["file"]) for event in first] == \
+        [os.path.basename(event["file"]) for event in second]
+        
+def _write_clip(path, source):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, (320, 240))
+    with source:
+        while True:
+            try:
+                writer.write(source.read())
+            except RuntimeError:
+                break
+    writer.release()
+    
+def test_replay_videos_follows_file_times(tmp_path):
+    # Two recordings with a gap between them
+    second_start = datetime(2024, 6, 1, 12, 1, 0)
+    first = str(tmp_path / f"cam_{START:%Y%m%d_%H%M%S}.mp4")
+    second = str(tmp_path / f"cam_{second_start:%Y%m%d_%H%M%S}.mp4")
+    _write_clip(first, _source(noise=0))
+    _write_clip(second, _source(noise=0))
+    
+    events, frames = replay_videos([second, first], str(tmp_path / "clips"), configure=_configure)
+    
+    assert frames == 800
+    assert _timeline(events[:2]) == [
+        _expected(100, 139, PRE_TRIGGER_FRAMES),
+        _expected(300, 309, PRE_TRIGGER_FRAMES),
+    ]
+    # The clock jumps over the gap to the second file's start time
+    assert _timeline(events[2:], second_start) == [
+        _expected(100, 139, PRE_TRIGGER_FRAMES),
+        _expected(300, 309, PRE_TRIGGER_FRAMES),
+    ]
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""seek_frame lands on the exact frame and stops at the end."""
+import cv2
+import numpy as np
+import pytest
+from prey_detection.processing.frames import seek_frame
+
+NUM_FRAMES = 90
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """A short clip with the frame number drawn into each frame."""
+    path = str(tmp_path_factory.mktemp("video") / "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 20, (160, 120))
+    for i in range(NUM_FRAMES):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        cv2.putText(frame, str(i), (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
+    
+def _decode_all(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+    
+def test_seek_is_exact(clip):
+    frames = _decode_all(clip)
+    cap = cv2.VideoCapture(clip)
+    try:
+        for index in (0, 1, 13, 45, 46, 77, NUM_FRAMES - 1, 5):
+            seek_frame(cap, index)
+            ret, frame = cap.read()
+            assert ret
+            assert np.array_equal(frame, frames[index]), index
+    finally:
+        cap.release()
+        
+def test_seek_past_end_is_clamped(clip):
+    cap = cv2.VideoCapture(clip)
+    try:
+        seek_frame(cap, NUM_FRAMES * 10)
+        assert cap.get(cv2.CAP_PROP_POS_FRAMES) == NUM_FRAMES
+        assert not cap.read()[0]
+    finally:
+        cap.release()
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Finished shards stay under their size cap and can be read back."""
+import os
+import numpy as np
+from prey_detection.processing.shards import ShardReader, ShardWriter
+
+MAX_SHARD_MB = 0.1
+
+def test_shards_never_exceed_the_cap(tmp_path):
+    rng = np.random.default_rng(0)
+    frames = {
+        f"frame_{i:06d}.jpg": rng.integers(0, 256, int(rng.integers(500, 9000)), dtype=np.uint8).tobytes()
+        for i in range(200)
+    }
+    
+    writer = ShardWriter(str(tmp_path), max_shard_mb=MAX_SHARD_MB, max_shard_frames=1000)
+    for seq, (name, data) in enumerate(frames.items()):
+        writer.write(seq, name, data)
+    writer.close()
+    
+    assert len(writer.shards) > 1
+    for shard in writer.shards:
+        assert os.path.getsize(shard) <= MAX_SHARD_MB * 1024 * 1024
+        
+    with ShardReader(str(tmp_path)) as reader:
+        assert sorted(reader.names()) == sorted(frames)
+        for name, data in frames.items():
+            assert reader.read(name) == data
\ No newline at end of file
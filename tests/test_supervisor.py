@@ -0,0 +1,111 @@
+"""Supervisor restarts, backoff and the shared motion check budget."""
+import threading
+import time
+import pytest
+from prey_detection.capture.clock import SimulatedClock
+from prey_detection.capture.supervisor import CameraPipeline, CameraSupervisor, FrameBudget
+from prey_detection.config.settings import VIDEO_SETTINGS
+
+@pytest.fixture(autouse=True)
+def small_frames(monkeypatch):
+    """Keep the detectors' buffers small."""
+    monkeypatch.setitem(VIDEO_SETTINGS, "resolution", (160, 120))
+    monkeypatch.setitem(VIDEO_SETTINGS, "async_encoding", False)
+    
+def _synthetic(num_frames, realtime=False):
+    return {"type": "synthetic", "width": 160, "height": 120, "fps": 20,
+            "num_frames": num_frames, "realtime": realtime}
+            
+class _RecordingStop(threading.Event):
+    """Stop event that records restart delays instead of waiting."""
+    
+    def __init__(self, restarts):
+        super().__init__()
+        self.restarts = restarts
+        self.delays = []
+        
+    def wait(self, timeout=None):
+        self.delays.append(timeout)
+        if len(self.delays) >= self.restarts:
+            self.set()
+        return self.is_set()
+        
+def _run_pipeline(tmp_path, source, restarts):
+    pipeline = CameraPipeline(
+        "test",
+        {"source": source, "output_dir": str(tmp_path)},
+        initial_backoff=0.25,
+        max_backoff=1.0,
+        clock=SimulatedClock()
+    )
+    pipeline._stop = _RecordingStop(restarts)
+    pipeline._run()
+    return pipeline
+    
+def test_backoff_doubles_up_to_the_maximum(tmp_path):
+    # The source runs dry at once, without moving the clock
+    pipeline = _run_pipeline(tmp_path, _synthetic(5), restarts=6)
+    
+    assert pipeline._stop.delays == [0.25, 0.5, 1.0, 1.0, 1.0, 1.0]
+    assert pipeline.restarts == 6
+    assert pipeline.frames == 6 * 5
+    assert pipeline.last_error == "No more frames in source"
+    assert pipeline.status == "stopped"
+    
+def test_backoff_resets_after_a_long_run(tmp_path):
+    # 40 frames at 20 fps take two seconds on the simulated clock
+    pipeline = _run_pipeline(tmp_path, _synthetic(40, realtime=True), restarts=4)
+    
+    assert pipeline._stop.delays == [0.25, 0.25, 0.25, 0.25]
+    assert pipeline.frames == 4 * 40
+    
+def test_frame_budget_refills_at_max_fps():
+    clock = SimulatedClock()
+    budget = FrameBudget(10, clock=clock)
+    
+    # Starts full
+    assert sum(budget.try_acquire() for _ in range(20)) == 10
+    
+    clock.advance(0.25)
+    assert sum(budget.try_acquire() for _ in range(20)) == 2
+    
+    # Never holds more than one second of tokens
+    clock.advance(60)
+    assert sum(budget.try_acquire() for _ in range(20)) == 10
+    
+def test_frame_budget_without_limit():
+    budget = FrameBudget(0, clock=SimulatedClock())
+    assert all(budget.try_acquire() for _ in range(1000))
+    
+def _wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+        
+def test_supervisor_shares_the_budget(tmp_path):
+    config = {
+        "encoder_workers": 1,
+        "max_motion_fps": 15,
+        "restart_backoff": {"initial": 0.01, "max": 0.02},
+        "cameras": [
+            {"name": "one", "source": _synthetic(30), "output_dir": str(tmp_path / "one")},
+            {"name": "two", "source": _synthetic(30), "output_dir": str(tmp_path / "two")},
+        ],
+    }
+    # Sources that are not paced never move the clock, so the budget never refills
+    supervisor = CameraSupervisor(config, clock=SimulatedClock())
+    
+    with supervisor:
+        _wait_until(lambda: all(pipeline.restarts >= 2 for pipeline in supervisor.pipelines))
+        
+    assert not any(pipeline.is_alive() for pipeline in supervisor.pipelines)
+    assert supervisor.encoder_pool.closed
+    
+    statuses = supervisor.get_status()
+    checks = sum(status["frames"] - status["skipped_checks"] for status in statuses)
+    assert checks == 15
+    for status in statuses:
+        assert status["status"] == "stopped"
+        assert status["frames"] >= 60
+        assert status["last_error"] == "No more frames in source"
\ No newline at end of file